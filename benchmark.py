@@ -0,0 +1,348 @@
+"""Medições de desempenho da Corrida Estatística.
+
+Uso:
+    python benchmark.py [MEDICAO ...] [--saida ARQ.json] [--comparar BASE.json]
+
+Medições: inicializacao, motor, estatisticas, graficos, quadros, servidor (padrão: todas).
+Tudo roda com ``SDL_VIDEODRIVER=dummy``. O resultado é um JSON plano
+(nome da métrica -> valor); métricas terminadas em ``_por_s`` são vazões
+(maior é melhor), as demais são tempos (menor é melhor). Com ``--comparar``,
+cada métrica é confrontada com a linha de base e o código de saída é 1 se
+alguma piorar além de ``--tolerancia``.
+
+A inicialização é medida em processos novos (partida a frio do interpretador)
+até o primeiro quadro do menu.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+TAMANHOS_JANELA = [(800, 600), (1150, 720), (1920, 1080)]
+TAMANHOS_HISTORICO = [10, 100, 1_000, 10_000, 100_000]
+
+# Executado no processo filho: cria o jogo e desenha o primeiro quadro do menu.
+# "ansioso" reproduz o caminho antigo, importando matplotlib.pyplot antes do menu.
+_SCRIPT_INICIALIZACAO = """
+import sys, time
+if {ansioso!r}:
+    import numpy
+    import matplotlib.pyplot as plt
+    plt.switch_backend('Agg')
+import pygame
+import jogo
+g = jogo.CorridaEstatistica(aquecer_graficos={aquecer!r})
+g.desenhar_quadro()
+pygame.display.flip()
+print("primeiro_quadro", flush=True)
+"""
+
+
+def _ambiente_sem_video():
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    return env
+
+
+def medir_inicializacao(repeticoes=5, ansioso=False, aquecer=True):
+    """Tempo (s) do início do processo até o primeiro quadro do menu, por repetição"""
+    script = _SCRIPT_INICIALIZACAO.format(ansioso=ansioso, aquecer=aquecer)
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "-c", script], cwd=DIRETORIO, env=_ambiente_sem_video(),
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        for linha in proc.stdout:
+            if linha.startswith("primeiro_quadro"):
+                tempos.append(time.perf_counter() - inicio)
+                break
+        proc.wait()
+    return tempos
+
+
+def _resumo(tempos):
+    ordenados = sorted(tempos)
+    return {"mediana_s": ordenados[len(ordenados) // 2], "min_s": ordenados[0], "max_s": ordenados[-1],
+            "amostras": len(tempos)}
+
+
+def _cronometrar(funcao, repeticoes=50, aquecimento=3):
+    """Mediana do tempo (s) de uma chamada"""
+    for _ in range(aquecimento):
+        funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    return tempos[len(tempos) // 2]
+
+
+def _novo_jogo():
+    import jogo
+    return jogo.CorridaEstatistica(modo_grafico="pygame", aquecer_graficos=False, semente=0)
+
+
+def _preencher_historico(g, n, rng):
+    """Simula n lançamentos por jogador direto nas estruturas de estatística"""
+    motor = g.motor
+    for pid in motor.jogadores:
+        stats = motor.estatisticas[pid]
+        for _ in range(n):
+            soma = rng.randint(1, 6) + rng.randint(1, 6)
+            motor.jogadores[pid].dados.append(soma)
+            stats.adicionar(soma)
+            motor.historico_medias[pid].adicionar(stats.media)
+
+
+def bench_inicializacao(repeticoes=5):
+    preguicoso = _resumo(medir_inicializacao(repeticoes))
+    ansioso = _resumo(medir_inicializacao(repeticoes, ansioso=True))
+    return {
+        "inicializacao.primeiro_quadro_s": preguicoso["mediana_s"],
+        "inicializacao.primeiro_quadro_ansioso_s": ansioso["mediana_s"],
+    }
+
+
+def bench_motor(n=200_000):
+    from motor import MotorJogo, simular_partidas
+    from simulacao import simular_lote
+
+    resultado = {}
+    for registrar in (True, False):
+        motor = MotorJogo(rng=random.Random(1), registrar=registrar)
+        inicio = time.perf_counter()
+        for _ in range(n):
+            if motor.jogar_dados() is None:
+                motor.reiniciar()
+        nome = "com_registro" if registrar else "sem_registro"
+        resultado[f"motor.jogar_dados_{nome}_por_s"] = n / (time.perf_counter() - inicio)
+
+    g = _novo_jogo()
+    g.estado = "jogando"
+    inicio = time.perf_counter()
+    for _ in range(n // 10):
+        if g.motor.vencedor:
+            g.motor.reiniciar()
+            g.estado = "jogando"
+        g.jogar_dados()
+    resultado["jogo.jogar_dados_por_s"] = (n // 10) / (time.perf_counter() - inicio)
+
+    motor = MotorJogo(rng=random.Random(1))
+    inicio = time.perf_counter()
+    for _ in range(n // 500):
+        motor.lancar_lote(5_000)
+    resultado["motor.lancar_lote_por_s"] = n * 10 / (time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    simular_partidas(n // 4, (0, 1), rng=random.Random(2))
+    resultado["motor.partidas_por_s"] = (n // 4) / (time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    simular_lote(n * 10, (0, 1), rng=3)
+    resultado["simulacao.partidas_por_s"] = n * 10 / (time.perf_counter() - inicio)
+
+    import dados
+    import numpy as np
+
+    def pmf_sem_cache():
+        dados._pmf.cache_clear()
+        return dados.ConfigDados(5, 10).pmf
+    resultado["dados.pmf_5d10_s"] = _cronometrar(pmf_sem_cache, 50)
+    config, gerador = dados.ConfigDados(3, 6, (1, 1, 1, 1, 2, 3)), np.random.default_rng(8)
+    inicio = time.perf_counter()
+    config.sortear_somas(gerador, n * 10)
+    resultado["dados.sortear_somas_viciados_por_s"] = n * 10 / (time.perf_counter() - inicio)
+
+    import ia
+    from motor import CASAS_ESPECIAIS, META
+    resultado["ia.resolver_politica_s"] = _cronometrar(
+        lambda: ia.resolver_politica(META, CASAS_ESPECIAIS, ia.TROCAR, ia.RETROCEDER), 10, 1)
+    politica = ia.resolver_politica(META, CASAS_ESPECIAIS, ia.TROCAR, ia.RETROCEDER)
+    motor = MotorJogo(rng=random.Random(7), registrar=False)
+    motor.selecionar_poder(1, ia.RETROCEDER)
+    motor.selecionar_poder(2, ia.TROCAR)
+    inicio = time.perf_counter()
+    for _ in range(n):
+        politica(motor, 2)
+    resultado["ia.decisoes_por_s"] = n / (time.perf_counter() - inicio)
+    return resultado
+
+
+def bench_estatisticas():
+    rng = random.Random(4)
+    resultado = {}
+    for n in TAMANHOS_HISTORICO:
+        g = _novo_jogo()
+        _preencher_historico(g, n, rng)
+        resultado[f"estatisticas.calcular_stats_texto_n{n}_s"] = _cronometrar(lambda: g._calcular_stats_texto(1), 200)
+        resultado[f"estatisticas.texto_aderencia_n{n}_s"] = _cronometrar(lambda: g._texto_aderencia(1), 200)
+    return resultado
+
+
+def bench_graficos(n=100):
+    import graficos
+    from jogo import MATPLOTLIB_DISPONIVEL
+
+    g = _novo_jogo()
+    _preencher_historico(g, n, random.Random(5))
+    dados = graficos.dados_grafico(g.motor, g.cores_jogadores)
+    tamanho = (480, 360)
+
+    resultado = {}
+    pygame_rend = graficos.GraficoPygame(g.cache_texto)
+    resultado["graficos.pygame_s"] = _cronometrar(lambda: pygame_rend.renderizar(dados, tamanho), 50)
+    if MATPLOTLIB_DISPONIVEL:
+        persistente = graficos.GraficoMatplotlib()
+        resultado["graficos.persistente_s"] = _cronometrar(lambda: persistente.renderizar(dados, tamanho), 10, 2)
+        png = graficos.GraficoPng()
+        resultado["graficos.png_s"] = _cronometrar(lambda: png.renderizar(dados, tamanho), 5, 1)
+    return resultado
+
+
+def bench_quadros():
+    import pygame
+
+    resultado = {}
+    for largura, altura in TAMANHOS_JANELA:
+        g = _novo_jogo()
+        g.largura_tela, g.altura_tela = largura, altura
+        g.tela = pygame.display.set_mode((largura, altura), pygame.RESIZABLE)
+        g._gerar_layout_tabuleiro()
+        g._gerar_camadas_estaticas()
+        sufixo = f"{largura}x{altura}"
+
+        def quadro():
+            g.atualizar_tela(g.desenhar_quadro())
+
+        for estado in ("menu", "selecao_poder"):
+            g.estado = estado
+            resultado[f"quadros.{estado}_{sufixo}_s"] = _cronometrar(quadro, 30)
+
+        g.estado = "jogando"
+        g.motor.reiniciar(0)
+        _preencher_historico(g, 50, random.Random(6))
+        g.dados_para_grafico_atualizados = True
+        quadro()
+        resultado[f"quadros.jogando_{sufixo}_s"] = _cronometrar(quadro, 60)
+
+        def quadro_com_lance():
+            if g.motor.vencedor:
+                g.motor.reiniciar()
+                g.estado = "jogando"
+            g.jogar_dados()
+            quadro()
+        resultado[f"quadros.jogando_com_lance_{sufixo}_s"] = _cronometrar(quadro_com_lance, 60)
+
+    # Tabuleiro grande: só as casas visíveis são dispostas e desenhadas
+    from tabuleiro import gerar_casas_especiais
+    import jogo
+    g = jogo.CorridaEstatistica(modo_grafico="pygame", aquecer_graficos=False, semente=0,
+                                tabuleiro={"meta": 2000, "colunas": 10, "casas_especiais": gerar_casas_especiais(2000, 0.3, 1)})
+    g.estado = "jogando"
+
+    def quadro_tabuleiro_grande():
+        if g.motor.vencedor:
+            g.motor.reiniciar()
+            g.estado = "jogando"
+        g.jogar_dados()
+        g.atualizar_tela(g.desenhar_quadro())
+    resultado["quadros.tabuleiro_2000_com_lance_s"] = _cronometrar(quadro_tabuleiro_grande, 60)
+
+    # Painel com o máximo de dados desenhados, todos já parados (um blit do atlas por dado)
+    tamanho = 300 // jogo.MAX_DADOS_DESENHADOS - 6
+
+    def dez_dados():
+        for i in range(jogo.MAX_DADOS_DESENHADOS):
+            g.atlas_dados.desenhar(g.tela, 20 + i * (tamanho + 10), 200, tamanho, i % 6 + 1)
+    resultado["quadros.desenhar_10_dados_s"] = _cronometrar(dez_dados, 500)
+    return resultado
+
+
+def bench_servidor(salas=200, rodadas=20):
+    """Comandos do servidor sem a rede: salas todas ativas e salas reconstruídas do log a cada comando"""
+    from servidor import ServidorPartidas
+    resultado = {}
+    for nome, max_ativas in (("ativas", salas), ("compactadas", salas // 10)):
+        servidor = ServidorPartidas(max_ativas=max_ativas, rng=random.Random(6))
+        linhas = [f"rolar {servidor.executar('nova').split()[1]}" for _ in range(salas)]
+        n = 0
+        inicio = time.perf_counter()
+        for _ in range(rodadas):
+            for linha in linhas:
+                if not servidor.executar(linha).endswith(" 0"):
+                    servidor.executar(linha.replace("rolar", "reiniciar"))
+                n += 1
+        resultado[f"servidor.rolar_{nome}_por_s"] = n / (time.perf_counter() - inicio)
+    return resultado
+
+
+MEDICOES = {
+    "inicializacao": bench_inicializacao,
+    "motor": bench_motor,
+    "estatisticas": bench_estatisticas,
+    "graficos": bench_graficos,
+    "quadros": bench_quadros,
+    "servidor": bench_servidor,
+}
+
+
+def comparar(atual, base, tolerancia):
+    """Lista (métrica, base, atual, variação relativa, piorou?) das métricas em comum"""
+    linhas = []
+    for nome in sorted(set(atual) & set(base)):
+        if not base[nome]:
+            continue
+        variacao = atual[nome] / base[nome] - 1
+        # Vazão: cair é piorar; tempo: subir é piorar
+        piorou = -variacao > tolerancia if nome.endswith("_por_s") else variacao > tolerancia
+        linhas.append((nome, base[nome], atual[nome], variacao, piorou))
+    return linhas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("medicoes", nargs="*", metavar="MEDICAO", help=", ".join(MEDICOES))
+    parser.add_argument("--saida", help="grava o resultado JSON neste arquivo")
+    parser.add_argument("--comparar", help="JSON de linha de base para comparação")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="piora relativa aceita (padrão 0.10)")
+    args = parser.parse_args(argv)
+    desconhecidas = set(args.medicoes) - set(MEDICOES)
+    if desconhecidas:
+        parser.error(f"medição desconhecida: {', '.join(sorted(desconhecidas))}")
+
+    resultado = {}
+    for nome in args.medicoes or list(MEDICOES):
+        resultado.update(MEDICOES[nome]())
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False, sort_keys=True)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        regressoes = 0
+        for nome, valor_base, valor, variacao, piorou in comparar(resultado, base, args.tolerancia):
+            marca = "PIOROU" if piorou else "ok"
+            print(f"{marca:>6}  {nome:<55} {valor_base:.6g} -> {valor:.6g} ({variacao:+.1%})", file=sys.stderr)
+            regressoes += piorou
+        if regressoes:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
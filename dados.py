@@ -0,0 +1,140 @@
+"""Dados configuráveis: k dados de f faces, honestos ou viciados.
+
+A distribuição exata da soma sai da convolução da distribuição de uma face
+consigo mesma (por quadrados sucessivos, com NumPy) e fica em cache por
+configuração. Os sorteadores usam essa mesma configuração, um lance por vez
+(``random.Random``) ou em lote (``np.random.Generator``).
+"""
+import re
+from functools import lru_cache
+
+# Limites do log binário: um registro guarda quantidade << 7 | faces em 12 bits (ver registro.py)
+MAX_QUANTIDADE = 31
+MAX_FACES = 127
+
+
+@lru_cache(maxsize=64)
+def _pmf(quantidade, faces, pesos):
+    import numpy as np
+    face = np.zeros(faces + 1)
+    face[1:] = pesos if pesos is not None else 1.0
+    face /= face.sum()
+    pmf = np.ones(1)
+    # k convoluções viram log2(k): soma de 2^i dados = convolução da soma de 2^(i-1) consigo mesma
+    k = quantidade
+    while k:
+        if k & 1:
+            pmf = np.convolve(pmf, face)
+        k >>= 1
+        if k:
+            face = np.convolve(face, face)
+    return tuple(np.clip(pmf, 0.0, None).tolist())
+
+
+class ConfigDados:
+    """``quantidade`` dados de ``faces`` faces; ``pesos`` (um por face) vicia os dados"""
+
+    def __init__(self, quantidade=2, faces=6, pesos=None):
+        if not 1 <= quantidade <= MAX_QUANTIDADE:
+            raise ValueError(f"quantidade de dados deve estar entre 1 e {MAX_QUANTIDADE}")
+        if not 2 <= faces <= MAX_FACES:
+            raise ValueError(f"número de faces deve estar entre 2 e {MAX_FACES}")
+        if pesos is not None:
+            pesos = tuple(float(p) for p in pesos)
+            if len(pesos) != faces or min(pesos) < 0 or not sum(pesos) > 0:
+                raise ValueError(f"pesos: {faces} valores não negativos, com soma positiva")
+            if len(set(pesos)) == 1:
+                pesos = None
+        self.quantidade = quantidade
+        self.faces = faces
+        self.pesos = pesos
+        if pesos is None:
+            self._acumulados = None
+            face_min, face_max = 1, faces
+            media_face = (faces + 1) / 2
+            var_face = (faces * faces - 1) / 12
+        else:
+            total = sum(pesos)
+            acumulado, self._acumulados = 0.0, []
+            for p in pesos:
+                acumulado += p
+                self._acumulados.append(acumulado)
+            face_min = next(f for f, p in enumerate(pesos, 1) if p > 0)
+            face_max = max(f for f, p in enumerate(pesos, 1) if p > 0)
+            media_face = sum(f * p for f, p in enumerate(pesos, 1)) / total
+            var_face = sum(f * f * p for f, p in enumerate(pesos, 1)) / total - media_face ** 2
+        self.soma_minima = quantidade * face_min
+        self.soma_maxima = quantidade * face_max
+        self.media = quantidade * media_face
+        self.variancia = quantidade * var_face
+        self._faces = range(1, faces + 1)
+        self._repeticoes = range(quantidade)
+
+    def _chave(self):
+        return self.quantidade, self.faces, self.pesos
+
+    def __eq__(self, outro):
+        return isinstance(outro, ConfigDados) and self._chave() == outro._chave()
+
+    def __hash__(self):
+        return hash(self._chave())
+
+    def __repr__(self):
+        return f"ConfigDados({self.quantidade}, {self.faces}, {self.pesos!r})"
+
+    @property
+    def rotulo(self):
+        return f"{self.quantidade}d{self.faces}" + (" viciado" if self.pesos else "")
+
+    @property
+    def pmf(self):
+        """pmf[s] = P(soma = s), para s de 0 a quantidade * faces"""
+        return _pmf(self.quantidade, self.faces, self.pesos)
+
+    @property
+    def soma_maxima_dobrada(self):
+        """Maior movimento possível, com "Dobrar Dados" ativo"""
+        return 2 * self.quantidade * self.faces
+
+    def sortear(self, rng):
+        """Um lance (tupla de faces) com um ``random.Random``"""
+        if self.pesos is None:
+            f, aleatorio = self.faces, rng.random
+            if self.quantidade == 2:
+                # Caso mais comum (2d6), sem laço: este é o caminho quente do motor
+                return int(aleatorio() * f) + 1, int(aleatorio() * f) + 1
+            return tuple([int(aleatorio() * f) + 1 for _ in self._repeticoes])
+        return tuple(rng.choices(self._faces, cum_weights=self._acumulados, k=self.quantidade))
+
+    def sortear_lote(self, gerador, n):
+        """n lances de uma vez: array int16 (n, quantidade) com as faces"""
+        import numpy as np
+        forma = (n, self.quantidade)
+        if self.pesos is None:
+            return gerador.integers(1, self.faces + 1, size=forma, dtype=np.int16)
+        probs = np.array(self.pesos) / sum(self.pesos)
+        return (gerador.choice(self.faces, size=forma, p=probs) + 1).astype(np.int16)
+
+    def sortear_somas(self, gerador, n):
+        """Só as somas de n lances (array int16), sorteadas da distribuição exata"""
+        import numpy as np
+        if self.pesos is None:
+            # Formato (k, n): somar ao longo do primeiro eixo é contíguo e mais rápido
+            return gerador.integers(1, self.faces + 1, size=(self.quantidade, n), dtype=np.int16).sum(
+                axis=0, dtype=np.int16)
+        acumulada = np.cumsum(self.pmf)
+        return np.minimum(np.searchsorted(acumulada, gerador.random(n) * acumulada[-1], side='right'),
+                          len(acumulada) - 1).astype(np.int16)
+
+
+DADOS_PADRAO = ConfigDados()
+
+
+def interpretar_dados(texto, pesos=None):
+    """ConfigDados a partir de "KdF" (ex.: "3d6", "5d10"); ``pesos`` como "1,1,1,1,1,3" """
+    m = re.fullmatch(r"\s*(\d*)\s*[dD]\s*(\d+)\s*", texto)
+    if not m:
+        raise ValueError(f"dados no formato KdF (ex.: 3d6), não {texto!r}")
+    if pesos is not None and isinstance(pesos, str):
+        pesos = [float(p) for p in pesos.split(",")]
+    return ConfigDados(int(m.group(1) or 1), int(m.group(2)), pesos)
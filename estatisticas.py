@@ -0,0 +1,298 @@
+"""Estatísticas incrementais dos lançamentos, atualizadas em O(1) por lançamento."""
+import math
+from functools import lru_cache
+
+# Maior soma registrável: 2d6 com "Dobrar Dados" ativo
+SOMA_MAXIMA = 24
+Z_95 = 1.959963984540054
+
+
+def _gama_superior_regularizada(a, x):
+    """Q(a, x) = Γ(a, x) / Γ(a): série para x < a + 1, fração continuada (Lentz) acima"""
+    if x <= 0:
+        return 1.0
+    log_prefixo = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        termo = soma = 1.0 / a
+        ap = a
+        for _ in range(10_000):
+            ap += 1
+            termo *= x / ap
+            soma += termo
+            if abs(termo) < abs(soma) * 1e-15:
+                break
+        return max(0.0, 1.0 - soma * math.exp(log_prefixo))
+    minimo = 1e-300
+    b = x + 1 - a
+    c = 1 / minimo
+    d = 1 / b
+    h = d
+    for i in range(1, 10_000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = 1 / (d if abs(d) > minimo else minimo)
+        c = b + an / c
+        c = c if abs(c) > minimo else minimo
+        h *= d * c
+        if abs(d * c - 1) < 1e-15:
+            break
+    return math.exp(log_prefixo) * h
+
+
+def prob_qui_quadrado(x, graus_liberdade):
+    """P(X >= x) para X com distribuição qui-quadrado (o p-valor do teste)"""
+    return _gama_superior_regularizada(graus_liberdade / 2, x / 2)
+
+
+@lru_cache(maxsize=32)
+def _agrupar(config_dados, prob_minima):
+    """(grupo de cada soma, probabilidade de cada grupo); -1 marca as somas impossíveis"""
+    pmf = config_dados.pmf
+    grupos = [[s] for s, p in enumerate(pmf) if p > 0]
+    # Funde as caudas em direção ao centro enquanto a probabilidade da ponta for pequena
+    while len(grupos) > 2 and sum(pmf[s] for s in grupos[0]) < prob_minima:
+        primeiro = grupos.pop(0)
+        grupos[0] = primeiro + grupos[0]
+    while len(grupos) > 2 and sum(pmf[s] for s in grupos[-1]) < prob_minima:
+        ultimo = grupos.pop()
+        grupos[-1] += ultimo
+    grupo = [-1] * len(pmf)
+    for g, somas in enumerate(grupos):
+        for s in somas:
+            grupo[s] = g
+    return tuple(grupo), tuple(sum(pmf[s] for s in somas) for somas in grupos)
+
+
+class TesteAderencia:
+    """Qui-quadrado de aderência das somas observadas à distribuição exata dos dados.
+
+    Com O_g as contagens e p_g as probabilidades de cada grupo de somas,
+    X² = Σ O_g² / (n p_g) - n; basta manter S = Σ O_g² / p_g, que muda em
+    (2 O_g + 1) / p_g a cada lançamento. As somas raras das caudas são
+    agrupadas até cada grupo ter probabilidade ``prob_minima``, para que a
+    aproximação qui-quadrado valha com poucos lançamentos.
+    """
+
+    def __init__(self, config_dados, prob_minima=0.02):
+        self.config_dados = config_dados
+        self.prob_minima = prob_minima
+        self.n = 0
+        self.impossiveis = 0
+        self._s = 0.0
+        self._grupo = None
+
+    def _preparar(self):
+        self._grupo, self.probs = _agrupar(self.config_dados, self.prob_minima)
+        self.contagens = [0] * len(self.probs)
+
+    def adicionar(self, soma):
+        if self._grupo is None:
+            self._preparar()
+        g = self._grupo[soma] if soma < len(self._grupo) else -1
+        if g < 0:
+            self.impossiveis += 1
+            return
+        o = self.contagens[g]
+        self.contagens[g] = o + 1
+        self._s += (2 * o + 1) / self.probs[g]
+        self.n += 1
+
+    def adicionar_lote(self, somas):
+        """Vários lançamentos de uma vez (array NumPy de inteiros não negativos)"""
+        if not len(somas):
+            return
+        import numpy as np
+        if self._grupo is None:
+            self._preparar()
+        tamanho = len(self._grupo)
+        por_soma = np.bincount(somas, minlength=tamanho)
+        self.impossiveis += int(por_soma[tamanho:].sum())
+        for soma, c in enumerate(por_soma[:tamanho].tolist()):
+            if not c:
+                continue
+            g = self._grupo[soma]
+            if g < 0:
+                self.impossiveis += c
+                continue
+            o = self.contagens[g]
+            self.contagens[g] = o + c
+            self._s += ((o + c) ** 2 - o * o) / self.probs[g]
+            self.n += c
+
+    @property
+    def graus_liberdade(self):
+        return len(self.probs) - 1 if self._grupo is not None else 0
+
+    @property
+    def qui_quadrado(self):
+        if not self.n:
+            return 0.0
+        if self.impossiveis:
+            return math.inf
+        return max(0.0, self._s / self.n - self.n)
+
+    @property
+    def p_valor(self):
+        if not self.n or not self.graus_liberdade:
+            return 1.0
+        if self.impossiveis:
+            return 0.0
+        return prob_qui_quadrado(self.qui_quadrado, self.graus_liberdade)
+
+    @property
+    def confiavel(self):
+        """A aproximação qui-quadrado pede ao menos 5 esperados em cada grupo"""
+        return self.n > 0 and self.n * min(self.probs) >= 5
+
+
+class EstatisticasIncrementais:
+    """Média, variância, mediana e moda de um jogador a partir de um histograma fixo das somas.
+
+    Com ``config_dados``, mantém também o teste de aderência das somas não
+    dobradas à distribuição exata (``aderencia``).
+    """
+
+    def __init__(self, soma_maxima=SOMA_MAXIMA, config_dados=None):
+        self.contagens = [0] * (soma_maxima + 1)
+        self.n = 0
+        self.total = 0
+        # Inteiros exatos: a variância sai sem o cancelamento numérico de Σx² - n·média²
+        self.total_quadrados = 0
+        self.moda = None
+        self.aderencia = TesteAderencia(config_dados) if config_dados is not None else None
+
+    def adicionar(self, soma, dobrado=False):
+        contagens = self.contagens
+        contagens[soma] += 1
+        self.n += 1
+        self.total += soma
+        self.total_quadrados += soma * soma
+        if self.aderencia is not None and not dobrado:
+            self.aderencia.adicionar(soma)
+        # Empate fica com o menor valor, como np.unique + argmax
+        moda = self.moda
+        if moda is None or contagens[soma] > contagens[moda] or (contagens[soma] == contagens[moda] and soma < moda):
+            self.moda = soma
+
+    def adicionar_lote(self, somas):
+        """Vários lançamentos de uma vez (array NumPy de inteiros não negativos)"""
+        if not len(somas):
+            return
+        import numpy as np
+        contagens = self.contagens
+        for valor, c in enumerate(np.bincount(somas, minlength=len(contagens)).tolist()):
+            if c:
+                contagens[valor] += c
+        self.n += len(somas)
+        self.total += int(somas.sum())
+        self.total_quadrados += int(np.dot(somas.astype(np.int64), somas))
+        if self.aderencia is not None:
+            self.aderencia.adicionar_lote(somas)
+        # max devolve o primeiro empate, ou seja, o menor valor
+        self.moda = max(range(len(contagens)), key=contagens.__getitem__)
+
+    @property
+    def media(self):
+        return self.total / self.n if self.n else 0.0
+
+    @property
+    def variancia(self):
+        """Variância amostral (divisor n - 1)"""
+        if self.n < 2:
+            return 0.0
+        return (self.total_quadrados * self.n - self.total * self.total) / (self.n * (self.n - 1))
+
+    def intervalo_media(self, z=Z_95):
+        """Intervalo de confiança (normal) para a média dos lançamentos"""
+        if self.n < 2:
+            return None
+        meia = z * math.sqrt(self.variancia / self.n)
+        return self.media - meia, self.media + meia
+
+    def _k_esimo(self, k):
+        """k-ésimo menor valor (base 0) percorrendo o histograma"""
+        acumulado = 0
+        for valor, c in enumerate(self.contagens):
+            acumulado += c
+            if acumulado > k:
+                return valor
+        return None
+
+    @property
+    def mediana(self):
+        if not self.n:
+            return 0.0
+        meio = self.n // 2
+        if self.n % 2:
+            return float(self._k_esimo(meio))
+        return (self._k_esimo(meio - 1) + self._k_esimo(meio)) / 2
+
+
+class SerieReduzida:
+    """Série y(1), y(2), ... guardada em no máximo ``capacidade`` baldes de mínimo/máximo.
+
+    Cada balde cobre ``largura`` pontos consecutivos e guarda onde ficaram o
+    menor e o maior valor. Quando os baldes enchem, vizinhos são fundidos aos
+    pares e a largura dobra: a memória e o número de pontos desenhados ficam
+    fixos, e picos e vales continuam visíveis.
+    """
+
+    def __init__(self, capacidade=512):
+        if capacidade < 2 or capacidade % 2:
+            raise ValueError("capacidade deve ser par e >= 2")
+        self.capacidade = capacidade
+        self.largura = 1
+        self.baldes = []  # [i_min, v_min, i_max, v_max]
+        self.n = 0
+        self.ultimo = None
+
+    def __len__(self):
+        return self.n
+
+    def adicionar(self, valor):
+        self.n += 1
+        i = self.n
+        self.ultimo = valor
+        baldes = self.baldes
+        if (i - 1) % self.largura:
+            balde = baldes[-1]
+            if valor < balde[1]:
+                balde[0], balde[1] = i, valor
+            if valor > balde[3]:
+                balde[2], balde[3] = i, valor
+            return
+        if len(baldes) == self.capacidade:
+            self._fundir()
+        baldes.append([i, valor, i, valor])
+
+    def estender(self, valores):
+        for valor in valores:
+            self.adicionar(valor)
+
+    def _fundir(self):
+        fundidos = []
+        for a, b in zip(self.baldes[0::2], self.baldes[1::2]):
+            i_min, v_min = (a[0], a[1]) if a[1] <= b[1] else (b[0], b[1])
+            i_max, v_max = (a[2], a[3]) if a[3] >= b[3] else (b[2], b[3])
+            fundidos.append([i_min, v_min, i_max, v_max])
+        self.baldes = fundidos
+        self.largura *= 2
+
+    def pontos(self):
+        """(xs, ys) em ordem de x: mínimo e máximo de cada balde, mais o último ponto"""
+        xs, ys = [], []
+        for i_min, v_min, i_max, v_max in self.baldes:
+            if i_min == i_max:
+                xs.append(i_min)
+                ys.append(v_min)
+            elif i_min < i_max:
+                xs += (i_min, i_max)
+                ys += (v_min, v_max)
+            else:
+                xs += (i_max, i_min)
+                ys += (v_max, v_min)
+        if self.n and xs[-1] != self.n:
+            xs.append(self.n)
+            ys.append(self.ultimo)
+        return xs, ys
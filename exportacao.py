@@ -0,0 +1,353 @@
+"""Exportação colunar das partidas, para análise em massa com NumPy.
+
+Cada sessão é um diretório com uma tabela por subdiretório e uma coluna de
+largura fixa por arquivo ``.npy``:
+
+    SESSAO/lances/    partida jogador dados soma dobrado avulso pos_antes pos_depois casa
+    SESSAO/faces/     face
+    SESSAO/poderes/   lance partida jogador poder
+    SESSAO/partidas/  semente meta jogadores vencedor primeiro_lance
+    SESSAO/dados/     quantidade faces primeiro_peso
+    SESSAO/pesos/     peso
+
+``dados`` de um lance é a linha da tabela ``dados`` da sessão, uma por
+configuração usada; ``primeiro_peso`` aponta para os ``faces`` pesos dela
+em ``pesos`` (-1 nos dados honestos). As faces de cada lance ficam em
+``faces``, na ordem dos lances. ``casa`` é a casa especial
+atingida (-1 se nenhuma), ``pos_antes``/``pos_depois`` são as casas de quem
+lançou e ``avulso`` marca os lançamentos do modo turbo, que não movem os
+peões e não pertencem a partida nenhuma: seu ``partida`` é -1 (ao juntar
+``lances`` e ``partidas`` por esse índice, filtre-os antes). Em
+``poderes``, ``lance`` é a linha de ``lances`` do lançamento seguinte ao
+uso; em ``partidas``, ``vencedor`` é 0 numa partida interrompida.
+
+Os arquivos só crescem: as linhas se acumulam em buffers ``array`` e são
+anexadas em blocos, e o cabeçalho .npy é reescrito com o novo total depois
+de cada bloco. Uma sessão interrompida continua legível até o último bloco
+gravado. ``carregar_sessoes`` abre quantas sessões houver com
+``np.load(..., mmap_mode='r')``, sem ler nem interpretar os dados.
+
+Uso:
+    python jogo.py exportacao RAIZ      (resumo de todas as sessões em RAIZ)
+"""
+import argparse
+import ast
+import os
+import struct
+import sys
+import time
+from array import array
+
+from dados import ConfigDados
+
+TABELAS = {
+    "lances": (("partida", "i", "<i4"), ("jogador", "B", "|u1"), ("dados", "H", "<u2"), ("soma", "h", "<i2"),
+               ("dobrado", "B", "|b1"), ("avulso", "B", "|b1"), ("pos_antes", "H", "<u2"),
+               ("pos_depois", "H", "<u2"), ("casa", "h", "<i2")),
+    "faces": (("face", "B", "|u1"),),
+    "poderes": (("lance", "Q", "<u8"), ("partida", "I", "<u4"), ("jogador", "B", "|u1"), ("poder", "B", "|u1")),
+    "partidas": (("semente", "Q", "<u8"), ("meta", "H", "<u2"), ("jogadores", "B", "|u1"), ("vencedor", "B", "|u1"),
+                 ("primeiro_lance", "Q", "<u8")),
+    "dados": (("quantidade", "B", "|u1"), ("faces", "B", "|u1"), ("primeiro_peso", "q", "<i8")),
+    "pesos": (("peso", "d", "<f8"),),
+}
+# ``partida`` dos lançamentos avulsos (modo turbo)
+SEM_PARTIDA = -1
+# Cabeçalho .npy de tamanho fixo, para ser reescrito no lugar a cada bloco
+_TAMANHO_CABECALHO = 128
+_MAGICO = b"\x93NUMPY\x01\x00"
+
+
+def _cabecalho_npy(descr, linhas):
+    texto = repr({"descr": descr, "fortran_order": False, "shape": (linhas,)}).encode("latin1")
+    corpo = texto.ljust(_TAMANHO_CABECALHO - len(_MAGICO) - 3) + b"\n"
+    return _MAGICO + struct.pack("<H", len(corpo)) + corpo
+
+
+def _configs(quantidades, faces, primeiros, pesos):
+    """As ConfigDados da tabela ``dados``, na ordem das linhas"""
+    configs = []
+    for k, f, p in zip(quantidades.tolist(), faces.tolist(), primeiros.tolist()):
+        configs.append(ConfigDados(k, f, None if p < 0 else pesos[p:p + f].tolist()))
+    return configs
+
+
+class _Coluna:
+    """Um arquivo .npy aberto para anexar, com o buffer das linhas ainda não gravadas"""
+
+    def __init__(self, caminho, tipo, descr):
+        self.descr = descr
+        self.buffer = array(tipo)
+        if os.path.exists(caminho):
+            # Continua uma sessão: vale o total do cabeçalho (um bloco pela metade é descartado)
+            self.arquivo = open(caminho, "r+b")
+            cabecalho = self.arquivo.read(_TAMANHO_CABECALHO)
+            self.linhas = ast.literal_eval(cabecalho[10:].decode("latin1"))["shape"][0]
+            self.arquivo.truncate(_TAMANHO_CABECALHO + self.linhas * self.buffer.itemsize)
+        else:
+            self.arquivo = open(caminho, "w+b")
+            self.linhas = 0
+            self.arquivo.write(_cabecalho_npy(descr, 0))
+
+    def gravadas(self):
+        """As linhas já gravadas no arquivo, num ``array``"""
+        valores = array(self.buffer.typecode)
+        self.arquivo.seek(_TAMANHO_CABECALHO)
+        valores.fromfile(self.arquivo, self.linhas)
+        if sys.byteorder != "little":
+            valores.byteswap()
+        return valores
+
+    def descarregar(self):
+        if not self.buffer:
+            return
+        self.arquivo.seek(0, os.SEEK_END)
+        if sys.byteorder != "little":
+            self.buffer.byteswap()
+        self.buffer.tofile(self.arquivo)
+        self.linhas += len(self.buffer)
+        del self.buffer[:]
+        # Dados antes do cabeçalho: se o processo cair no meio, o total antigo continua valendo
+        self.arquivo.flush()
+        self.arquivo.seek(0)
+        self.arquivo.write(_cabecalho_npy(self.descr, self.linhas))
+        self.arquivo.flush()
+
+    def fechar(self):
+        self.descarregar()
+        self.arquivo.close()
+
+
+def nova_sessao(raiz):
+    """Cria e retorna um diretório de sessão novo dentro de ``raiz``"""
+    base = os.path.join(raiz, time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}")
+    caminho, n = base, 1
+    while True:
+        try:
+            os.makedirs(caminho)
+            return caminho
+        except FileExistsError:
+            n += 1
+            caminho = f"{base}-{n}"
+
+
+class ExportadorColunar:
+    """Recebe os eventos do motor (``MotorJogo(exportador=...)``) e os grava em colunas.
+
+    ``fechar`` grava o que ainda estiver no buffer; sem ele, a sessão fica
+    com os blocos já gravados.
+    """
+
+    def __init__(self, diretorio, linhas_por_bloco=1 << 16):
+        self.diretorio = diretorio
+        self.linhas_por_bloco = linhas_por_bloco
+        self.colunas = {}
+        for tabela, colunas in TABELAS.items():
+            os.makedirs(os.path.join(diretorio, tabela), exist_ok=True)
+            self.colunas[tabela] = [_Coluna(os.path.join(diretorio, tabela, f"{nome}.npy"), tipo, descr)
+                                    for nome, tipo, descr in colunas]
+        # append de cada coluna de lances, na ordem de TABELAS (o buffer é sempre o mesmo array)
+        self._anexar_lance = tuple(c.buffer.append for c in self.colunas["lances"])
+        self._faces = self.colunas["faces"][0].buffer
+        self._pendentes = self.colunas["lances"][0].buffer
+        self.lances = self.colunas["lances"][0].linhas
+        self.partida = self.colunas["partidas"][0].linhas
+        self._aberta = None
+        # Lançamentos e usos de poder da partida aberta (os avulsos não contam)
+        self._eventos = 0
+        # Linha de cada ConfigDados na tabela ``dados`` (numa sessão continuada, as já gravadas)
+        self._indices = {config: i for i, config in enumerate(
+            _configs(*(c.gravadas() for c in self.colunas["dados"]), self.colunas["pesos"][0].gravadas()))}
+        self._ultima_config = self._ultimo_indice = None
+
+    def _indice_dados(self, config_dados):
+        if config_dados is self._ultima_config:
+            return self._ultimo_indice
+        indice = self._indices.get(config_dados)
+        if indice is None:
+            indice = self._indices[config_dados] = len(self._indices)
+            pesos = self.colunas["pesos"][0]
+            primeiro = -1
+            if config_dados.pesos is not None:
+                primeiro = pesos.linhas + len(pesos.buffer)
+                pesos.buffer.extend(config_dados.pesos)
+            for coluna, valor in zip(self.colunas["dados"], (config_dados.quantidade, config_dados.faces, primeiro)):
+                coluna.buffer.append(valor)
+        self._ultima_config, self._ultimo_indice = config_dados, indice
+        return indice
+
+    def iniciar_partida(self, semente, meta, num_jogadores):
+        self._encerrar_aberta()
+        self._aberta = (semente or 0, meta, num_jogadores, self.lances)
+        self._eventos = 0
+
+    def _encerrar_aberta(self):
+        # Partida interrompida; sem lançamentos nem poderes (ex.: reiniciada logo ao começar), nem vira linha
+        if self._aberta is None:
+            return
+        if not self._eventos:
+            self._aberta = None
+            return
+        self.fim(0)
+
+    def fim(self, vencedor):
+        if self._aberta is None:
+            return
+        semente, meta, num_jogadores, primeiro = self._aberta
+        for coluna, valor in zip(self.colunas["partidas"], (semente, meta, num_jogadores, vencedor, primeiro)):
+            coluna.buffer.append(valor)
+        self._aberta = None
+        self.partida += 1
+
+    def uso_poder(self, jogador_id, poder_index):
+        self._eventos += 1
+        for coluna, valor in zip(self.colunas["poderes"], (self.lances, self.partida, jogador_id, poder_index)):
+            coluna.buffer.append(valor)
+
+    def lance(self, jogador_id, config_dados, faces, soma, dobrado, pos_antes, pos_depois, casa):
+        partida, jogador, dados, s, d, avulso, antes, depois, c = self._anexar_lance
+        partida(self.partida)
+        jogador(jogador_id)
+        dados(self._indice_dados(config_dados))
+        s(soma)
+        d(dobrado)
+        avulso(False)
+        antes(pos_antes)
+        depois(pos_depois)
+        c(-1 if casa is None else casa)
+        self._faces.extend(faces)
+        self.lances += 1
+        self._eventos += 1
+        if len(self._pendentes) >= self.linhas_por_bloco:
+            self.descarregar()
+
+    def lote(self, jogadores, config_dados, faces, somas, posicoes):
+        """Lançamentos avulsos do modo turbo, já em arrays NumPy (uma linha por lançamento, sem partida)"""
+        import numpy as np
+        n = len(somas)
+        valores = (np.full(n, SEM_PARTIDA), jogadores, np.full(n, self._indice_dados(config_dados)), somas,
+                   np.zeros(n), np.ones(n), posicoes, posicoes, np.full(n, -1))
+        for coluna, valor in zip(self.colunas["lances"], valores):
+            coluna.buffer.frombytes(np.asarray(valor, dtype=coluna.buffer.typecode).tobytes())
+        self._faces.frombytes(np.asarray(faces, dtype="|u1").tobytes())
+        self.lances += n
+        if len(self._pendentes) >= self.linhas_por_bloco:
+            self.descarregar()
+
+    def descarregar(self):
+        """Anexa todos os buffers aos arquivos"""
+        for colunas in self.colunas.values():
+            for coluna in colunas:
+                coluna.descarregar()
+
+    def fechar(self):
+        self._encerrar_aberta()
+        for colunas in self.colunas.values():
+            for coluna in colunas:
+                coluna.fechar()
+
+
+def _mapear(caminho):
+    import numpy as np
+    try:
+        return np.load(caminho, mmap_mode="r")
+    except ValueError:
+        # Arquivos sem linhas não podem ser mapeados
+        return np.load(caminho)
+
+
+class Sessao:
+    """Uma sessão exportada; ``sessao["lances"]["soma"]`` é um array mapeado em memória, só leitura"""
+
+    def __init__(self, diretorio):
+        self.diretorio = diretorio
+        self.nome = os.path.basename(os.path.normpath(diretorio))
+        self.tabelas = {tabela: {nome: _mapear(os.path.join(diretorio, tabela, f"{nome}.npy"))
+                                 for nome, _, _ in colunas}
+                        for tabela, colunas in TABELAS.items()}
+
+    def __getitem__(self, tabela):
+        return self.tabelas[tabela]
+
+    def configs(self):
+        """As ConfigDados da sessão; ``configs()[i]`` é a dos lances com ``dados == i``"""
+        tabela = self["dados"]
+        return _configs(tabela["quantidade"], tabela["faces"], tabela["primeiro_peso"], self["pesos"]["peso"])
+
+    def inicio_faces(self):
+        """Índice em ``faces`` da primeira face de cada lance (mais um final com o total)"""
+        import numpy as np
+        inicio = np.zeros(len(self["lances"]["dados"]) + 1, dtype=np.int64)
+        np.cumsum(self["dados"]["quantidade"][self["lances"]["dados"]], out=inicio[1:])
+        return inicio
+
+
+def carregar_sessoes(raiz):
+    """Todas as sessões exportadas em ``raiz`` (ou ``raiz`` mesma, se for uma sessão), por nome"""
+    if os.path.isdir(os.path.join(raiz, "lances")):
+        return [Sessao(raiz)]
+    nomes = sorted(n for n in os.listdir(raiz) if os.path.isdir(os.path.join(raiz, n, "lances")))
+    return [Sessao(os.path.join(raiz, n)) for n in nomes]
+
+
+def concatenar(sessoes, tabela, coluna):
+    """Uma coluna de todas as sessões num único array (esta sim é uma cópia em memória)"""
+    import numpy as np
+    return np.concatenate([s[tabela][coluna] for s in sessoes])
+
+
+def resumo(sessoes):
+    """Texto com os totais e, por configuração de dados, média e teste qui-quadrado das somas"""
+    import numpy as np
+
+    from estatisticas import EstatisticasIncrementais
+    from motor import PODERES
+
+    linhas = []
+    total = sum(len(s["lances"]["soma"]) for s in sessoes)
+    avulsos = sum(int(np.count_nonzero(s["lances"]["avulso"])) for s in sessoes)
+    partidas = sum(len(s["partidas"]["vencedor"]) for s in sessoes)
+    linhas.append(f"{len(sessoes)} sessões, {total} lançamentos ({avulsos} do modo turbo), {partidas} partidas")
+    if not total:
+        return "\n".join(linhas)
+
+    # Cada sessão numera as próprias configurações: agrupa pela ConfigDados (com os pesos)
+    grupos = {}
+    for sessao in sessoes:
+        lances = sessao["lances"]
+        # Lances dobrados não seguem a distribuição dos dados: ficam de fora do teste
+        simples = ~lances["dobrado"]
+        for indice, config in enumerate(sessao.configs()):
+            grupos.setdefault(config, []).append(lances["soma"][(lances["dados"] == indice) & simples])
+    for config, partes in grupos.items():
+        # Dados viciados são testados contra a própria distribuição (a dos pesos)
+        stats = EstatisticasIncrementais(config.soma_maxima_dobrada, config)
+        stats.adicionar_lote(np.concatenate(partes))
+        teste = stats.aderencia
+        rotulo = config.rotulo
+        if config.pesos is not None:
+            rotulo += " (pesos " + " ".join(f"{p:g}" for p in config.pesos) + ")"
+        linhas.append(f"  {rotulo}: n = {stats.n}, média = {stats.media:.4f} (teórica {config.media:g}), "
+                      f"χ² = {teste.qui_quadrado:.1f} ({teste.graus_liberdade} gl), p = {teste.p_valor:.3f}")
+
+    poderes = concatenar(sessoes, "poderes", "poder")
+    if len(poderes):
+        usos = np.bincount(poderes, minlength=len(PODERES))
+        linhas.append("poderes usados: " + ", ".join(f"{p['nome']} {n}" for p, n in zip(PODERES, usos.tolist())))
+    casas = concatenar(sessoes, "lances", "casa")
+    linhas.append(f"casas especiais atingidas: {int(np.count_nonzero(casas >= 0))}")
+    return "\n".join(linhas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="jogo.py exportacao", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("raiz", help="diretório com as sessões exportadas (ou uma sessão)")
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.raiz):
+        parser.error(f"{args.raiz} não é um diretório")
+    print(resumo(carregar_sessoes(args.raiz)))
+
+
+if __name__ == "__main__":
+    main()
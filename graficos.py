@@ -0,0 +1,580 @@
+"""Renderizadores dos gráficos estatísticos do painel esquerdo.
+
+``GraficoMatplotlib`` cria a figura e os artistas uma única vez e, a cada
+lançamento, só atualiza as alturas das barras e os dados das linhas. O buffer
+RGBA do canvas Agg é entregue ao pygame sem cópia e sem codec de imagem.
+
+``GraficoPng`` é o caminho antigo e lento: figura nova a cada gráfico,
+salva em PNG e decodificada pelo pygame (útil para comparar).
+
+``GraficoPygame`` desenha os mesmos dois painéis direto numa Surface, sem
+matplotlib, reaproveitando uma camada estática por tamanho.
+
+``TrabalhadorGrafico`` roda um renderizador numa thread em segundo plano,
+para que um gráfico lento nunca trave o quadro seguinte a um lançamento.
+"""
+import io
+import math
+import threading
+import time
+
+import numpy as np
+import pygame
+
+from estatisticas import Z_95
+from renderizacao import CacheTexto
+
+COR_FUNDO = '#141923'
+COR_EIXOS = '#232337'
+DPI = 100
+
+RGB_FUNDO = (20, 25, 35)
+RGB_EIXOS = (35, 35, 55)
+RGB_GRADE = (70, 70, 85)
+RGB_BRANCO = (255, 255, 255)
+RGB_TODOS = (170, 170, 200)
+
+# Acima disso, barras por jogador ficam ilegíveis: a distribuição junta todos
+MAX_SERIES_BARRAS = 4
+
+
+def aquecer():
+    """Importa antecipadamente as partes pesadas de matplotlib (usada numa thread)"""
+    try:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+    except ImportError:
+        return
+    # Um gráfico minúsculo carrega (ou cria) o cache de fontes, a parte mais lenta do primeiro gráfico
+    fig = Figure(figsize=(1, 1), dpi=DPI)
+    fig.text(0.5, 0.5, "0")
+    FigureCanvasAgg(fig).draw()
+
+
+def dados_grafico(motor, cores):
+    """Retrato dos dados necessários para desenhar os gráficos.
+
+    A média acumulada vem reduzida (``SerieReduzida.pontos``), então o tamanho
+    do retrato não depende de quantos lançamentos a sessão já teve. Com mais
+    de ``MAX_SERIES_BARRAS`` jogadores, a distribuição vira uma série única
+    com todos os lançamentos somados. A curva teórica vem da distribuição
+    exata dos dados em uso (``dados.ConfigDados``).
+    """
+    jogadores = []
+    for pid in motor.jogadores:
+        stats = motor.estatisticas[pid]
+        jogadores.append((pid, cores[pid], list(stats.contagens), stats.n, motor.historico_medias[pid].pontos()))
+    if len(jogadores) <= MAX_SERIES_BARRAS:
+        barras = [(f"J{pid}", cor, contagens, n) for pid, cor, contagens, n, _ in jogadores]
+    else:
+        contagens = [sum(c) for c in zip(*(j[2] for j in jogadores))]
+        barras = [(f"Todos ({len(jogadores)})", RGB_TODOS, contagens, sum(j[3] for j in jogadores))]
+    return {'jogadores': jogadores, 'barras': barras, 'dados': motor.config_dados}
+
+
+def _deslocamento_barra(i, k):
+    """(deslocamento, largura) da i-ésima de k séries de barras agrupadas em cada valor"""
+    passo = 0.8 / k
+    return (i - (k - 1) / 2) * passo, passo * 0.875
+
+
+def prob_teorica(config_dados, valores):
+    """P(soma = v) para cada v, pela distribuição exata dos dados"""
+    pmf = config_dados.pmf
+    return np.array([pmf[v] if 0 <= v < len(pmf) else 0.0 for v in valores])
+
+
+def intervalo_x(barras, config_dados):
+    """Intervalo dinâmico do eixo X: ao menos as somas possíveis, expandido pelos valores observados"""
+    max_valor = config_dados.soma_maxima
+    for _, _, contagens, n in barras:
+        if n:
+            max_valor = max(max_valor, max(v for v, c in enumerate(contagens) if c))
+    return config_dados.soma_minima, max_valor + 1
+
+
+def _ticks_x(valores):
+    """Marcas do eixo das somas: todas até 20 valores, depois de 2 em 2 ou de 5 em 5"""
+    passo = 1 if len(valores) <= 20 else 2 if len(valores) <= 40 else 5
+    return [x for x in valores if x % passo == 0]
+
+
+def faixa_confianca(config_dados, maior_n, pontos=64, z=Z_95):
+    """(n, inferior, superior): faixa de 95% da média acumulada de dados honestos, μ ± z·σ/√n"""
+    ns = np.geomspace(1, max(2, maior_n), pontos)
+    meia = z * math.sqrt(config_dados.variancia) / np.sqrt(ns)
+    return ns, config_dados.media - meia, config_dados.media + meia
+
+
+def _chave_series(tamanho, dados):
+    """O que obriga a recriar a figura: tamanho, quais séries existem e os dados em uso"""
+    return tamanho, tuple(b[0] for b in dados['barras']), tuple(j[0] for j in dados['jogadores']), dados['dados']
+
+
+class GraficoMatplotlib:
+    """Figura persistente: recriada apenas quando o tamanho do painel muda"""
+
+    def __init__(self, cache_texto=None):
+        self.tamanho = None
+        self.chave = None
+        self.superficie = None
+
+    def _criar_figura(self, tamanho, dados):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        largura, altura = tamanho
+        self.fig = Figure(figsize=(largura / DPI, altura / DPI), dpi=DPI, facecolor=COR_FUNDO)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.ax1, self.ax2 = self.fig.subplots(1, 2)
+        ax1, ax2 = self.ax1, self.ax2
+
+        config = dados['dados']
+        valores = np.arange(config.soma_minima, config.soma_maxima_dobrada + 1)
+        self.barras = []
+        for i, (rotulo, cor, _, _) in enumerate(dados['barras']):
+            offset, largura_barra = _deslocamento_barra(i, len(dados['barras']))
+            self.barras.append(ax1.bar(valores + offset, np.zeros(len(valores)), width=largura_barra,
+                                       color=np.array(cor) / 255, alpha=0.7, label=rotulo))
+        self.prob_teo = prob_teorica(config, valores)
+        ax1.plot(valores, self.prob_teo, 'w-', linewidth=2, alpha=0.8, label="Teórico")
+        ax1.fill_between(valores, self.prob_teo, alpha=0.2, color='white')
+        ax1.set_title("Distribuição de Probabilidade", color='white', fontsize=10, pad=10)
+        ax1.set_xlabel('Soma dos Dados', color='white', fontsize=9)
+        ax1.set_ylabel('Frequência Relativa', color='white', fontsize=9)
+        ax1.legend(fontsize=7, facecolor=COR_EIXOS, loc='upper right')
+
+        self.linhas = {}
+        poucos = len(dados['jogadores']) <= MAX_SERIES_BARRAS
+        for pid, cor, _, _, _ in dados['jogadores']:
+            self.linhas[pid], = ax2.plot([], [], color=np.array(cor) / 255, linewidth=2 if poucos else 1,
+                                         label=f"J{pid}" if poucos else "_nolegend_")
+        ax2.axhline(config.media, color='white', linestyle='--', linewidth=2, alpha=0.7,
+                    label=f"Média Teórica = {config.media:.1f}")
+        # Recriada a cada gráfico; esta primeira serve também de amostra na legenda
+        self.faixa = ax2.fill_between(*faixa_confianca(config, 2), color='white', alpha=0.12, linewidth=0,
+                                      zorder=0, label="IC 95%")
+        ax2.set_title("Lei dos Grandes Números", color='white', fontsize=10, pad=10)
+        ax2.set_xlabel('Número de Lançamentos', color='white', fontsize=9)
+        ax2.set_ylabel('Média Acumulada', color='white', fontsize=9)
+        ax2.legend(fontsize=7, facecolor=COR_EIXOS, loc='lower right')
+
+        for ax in (ax1, ax2):
+            ax.grid(True, alpha=0.3, color='gray')
+            ax.tick_params(colors='white', labelsize=8)
+            ax.set_facecolor(COR_EIXOS)
+            for spine in ax.spines.values():
+                spine.set_color('white')
+
+        self.fig.tight_layout(pad=1.0)
+        self.x_atual = None
+        self.soma_minima = config.soma_minima
+        self.config_dados = config
+        self.media_teorica = config.media
+        self.tamanho = tamanho
+        self.chave = _chave_series(tamanho, dados)
+
+    def _atualizar_eixo_x(self, min_valor, max_valor):
+        if self.x_atual == (min_valor, max_valor):
+            return
+        self.x_atual = (min_valor, max_valor)
+        self.ax1.set_xlim(min_valor - 0.6, max_valor - 0.4)
+        self.ax1.set_xticks(_ticks_x(range(min_valor, max_valor)))
+
+    def renderizar(self, dados, tamanho):
+        """Atualiza os artistas e retorna uma Surface sobre o buffer do canvas"""
+        jogadores = dados['jogadores']
+        if self.chave != _chave_series(tamanho, dados):
+            self._criar_figura(tamanho, dados)
+
+        self._atualizar_eixo_x(*intervalo_x(dados['barras'], dados['dados']))
+
+        maior_freq = float(self.prob_teo.max())
+        for barras, (_, _, contagens, n) in zip(self.barras, dados['barras']):
+            freqs = np.asarray(contagens[self.soma_minima:], dtype=float) / n if n else np.zeros(len(contagens) - self.soma_minima)
+            for barra, freq in zip(barras, freqs):
+                barra.set_height(freq)
+            if n:
+                maior_freq = max(maior_freq, float(freqs.max()))
+
+        maior_n = 1
+        media_min = media_max = self.media_teorica
+        for pid, _, _, _, (xs, medias) in jogadores:
+            self.linhas[pid].set_data(xs, medias)
+            if medias:
+                maior_n = max(maior_n, xs[-1])
+                media_min = min(media_min, min(medias))
+                media_max = max(media_max, max(medias))
+
+        self.ax1.set_ylim(0, maior_freq * 1.05)
+        margem = max(0.5, (media_max - media_min) * 0.05)
+        self.ax2.set_xlim(1, max(2, maior_n))
+        self.ax2.set_ylim(media_min - margem, media_max + margem)
+        # A faixa acompanha o eixo X; fica fora do cálculo do eixo Y (é larga demais no começo)
+        if self.faixa is not None:
+            self.faixa.remove()
+        self.faixa = self.ax2.fill_between(*faixa_confianca(self.config_dados, maior_n), color='white',
+                                           alpha=0.12, linewidth=0, zorder=0)
+
+        self.canvas.draw()
+        # A Surface aponta direto para a memória do renderizador Agg (sem cópia)
+        self._buffer = self.canvas.buffer_rgba()
+        self.superficie = pygame.image.frombuffer(self._buffer, self.canvas.get_width_height(), "RGBA")
+        return self.superficie
+
+
+class GraficoPng:
+    """Figura nova a cada gráfico, salva em PNG e carregada pelo pygame.
+
+    Usa a API orientada a objetos (sem pyplot), para poder rodar no
+    ``TrabalhadorGrafico``.
+    """
+
+    def __init__(self, cache_texto=None):
+        pass
+
+    def renderizar(self, dados, tamanho):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        config = dados['dados']
+        largura, altura = tamanho
+        fig = Figure(figsize=(largura / DPI, altura / DPI), dpi=DPI, facecolor=COR_FUNDO)
+        FigureCanvasAgg(fig)
+        ax1, ax2 = fig.subplots(1, 2)
+
+        min_valor, max_valor = intervalo_x(dados['barras'], config)
+        valores = np.arange(min_valor, max_valor)
+        for i, (rotulo, cor, contagens, n) in enumerate(dados['barras']):
+            if not n:
+                continue
+            freqs = [contagens[v] / n if v < len(contagens) else 0.0 for v in valores]
+            offset, largura_barra = _deslocamento_barra(i, len(dados['barras']))
+            ax1.bar(valores + offset, freqs, width=largura_barra, color=np.array(cor) / 255, alpha=0.7, label=rotulo)
+        prob_teo = prob_teorica(config, valores)
+        ax1.plot(valores, prob_teo, 'w-', linewidth=2, alpha=0.8, label="Teórico")
+        ax1.fill_between(valores, prob_teo, alpha=0.2, color='white')
+        ax1.set_xticks(_ticks_x(range(min_valor, max_valor)))
+        ax1.set_title("Distribuição de Probabilidade", color='white', fontsize=10, pad=10)
+        ax1.set_xlabel('Soma dos Dados', color='white', fontsize=9)
+        ax1.set_ylabel('Frequência Relativa', color='white', fontsize=9)
+        ax1.legend(fontsize=7, facecolor=COR_EIXOS, loc='upper right')
+
+        poucos = len(dados['jogadores']) <= MAX_SERIES_BARRAS
+        maior_n = 1
+        for pid, cor, _, _, (xs, medias) in dados['jogadores']:
+            if medias:
+                ax2.plot(xs, medias, color=np.array(cor) / 255, linewidth=2 if poucos else 1,
+                         label=f"J{pid}" if poucos else "_nolegend_")
+                maior_n = max(maior_n, xs[-1])
+        ax2.axhline(config.media, color='white', linestyle='--', linewidth=2, alpha=0.7,
+                    label=f"Média Teórica = {config.media:.1f}")
+        # Faixa de 95% sem mexer nos limites do eixo Y (ela é larga no começo)
+        limites_y = ax2.get_ylim()
+        ax2.fill_between(*faixa_confianca(config, maior_n), color='white', alpha=0.12, linewidth=0, zorder=0,
+                         label="IC 95%")
+        ax2.set_ylim(limites_y)
+        ax2.set_title("Lei dos Grandes Números", color='white', fontsize=10, pad=10)
+        ax2.set_xlabel('Número de Lançamentos', color='white', fontsize=9)
+        ax2.set_ylabel('Média Acumulada', color='white', fontsize=9)
+        ax2.legend(fontsize=7, facecolor=COR_EIXOS)
+
+        for ax in (ax1, ax2):
+            ax.grid(True, alpha=0.3, color='gray')
+            ax.tick_params(colors='white', labelsize=8)
+            ax.set_facecolor(COR_EIXOS)
+            for spine in ax.spines.values():
+                spine.set_color('white')
+        fig.tight_layout(pad=1.0)
+
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', facecolor=COR_FUNDO, dpi=DPI)
+        buf.seek(0)
+        return pygame.image.load(buf, "grafico.png")
+
+
+def _ticks(vmin, vmax, alvo=5):
+    """Marcas "redondas" (1, 2 ou 5 x 10^k) cobrindo [vmin, vmax]"""
+    bruto = (vmax - vmin) / max(1, alvo)
+    if bruto <= 0:
+        return [vmin]
+    potencia = 10 ** math.floor(math.log10(bruto))
+    passo = next(m * potencia for m in (1, 2, 5, 10) if m * potencia >= bruto)
+    inicio = math.ceil(vmin / passo) * passo
+    marcas = []
+    v = inicio
+    while v <= vmax + passo * 1e-9:
+        marcas.append(v)
+        v += passo
+    return marcas
+
+
+def _rotulo(valor):
+    return f"{valor:g}" if abs(valor) >= 1 or valor == 0 else f"{valor:.2f}"
+
+
+class _Eixo:
+    """Mapeia coordenadas de dados para pixels dentro de um retângulo"""
+
+    def __init__(self, rect, xlim, ylim):
+        self.rect = rect
+        self.xlim = xlim
+        self.ylim = ylim
+
+    def px(self, x, y):
+        (x0, x1), (y0, y1) = self.xlim, self.ylim
+        r = self.rect
+        return (r.left + (x - x0) / (x1 - x0) * r.width,
+                r.bottom - (y - y0) / (y1 - y0) * r.height)
+
+
+class GraficoPygame:
+    """Histograma + curva teórica e convergência da média, desenhados com pygame"""
+
+    def __init__(self, cache_texto=None):
+        self.tamanho = None
+        self.superficie = None
+        self.cache_texto = cache_texto if cache_texto is not None else CacheTexto()
+        self.fonte_titulo = pygame.font.SysFont('Arial', 13)
+        self.fonte_eixo = pygame.font.SysFont('Arial', 11)
+
+    def _criar_camada_estatica(self, tamanho):
+        """Fundo, títulos e rótulos dos eixos: só mudam com o tamanho"""
+        largura, altura = tamanho
+        self.estatica = pygame.Surface(tamanho)
+        self.estatica.fill(RGB_FUNDO)
+        self.superficie = pygame.Surface(tamanho)
+
+        meia = largura // 2
+        self.areas = []
+        for i, (titulo, rot_x, rot_y) in enumerate((
+                ("Distribuição de Probabilidade", "Soma dos Dados", "Frequência Relativa"),
+                ("Lei dos Grandes Números", "Número de Lançamentos", "Média Acumulada"))):
+            x0 = i * meia
+            area = pygame.Rect(x0 + 52, 30, meia - 64, altura - 70)
+            self.areas.append(area)
+            pygame.draw.rect(self.estatica, RGB_EIXOS, area)
+
+            t = self.cache_texto.render(self.fonte_titulo, titulo, True, RGB_BRANCO)
+            self.estatica.blit(t, (area.centerx - t.get_width() // 2, 8))
+            t = self.cache_texto.render(self.fonte_eixo, rot_x, True, RGB_BRANCO)
+            self.estatica.blit(t, (area.centerx - t.get_width() // 2, altura - 20))
+            t = pygame.transform.rotate(self.cache_texto.render(self.fonte_eixo, rot_y, True, RGB_BRANCO), 90)
+            self.estatica.blit(t, (x0 + 4, area.centery - t.get_height() // 2))
+        self.tamanho = tamanho
+
+    def _desenhar_eixos(self, eixo, xticks, yticks):
+        sup, r = self.superficie, eixo.rect
+        for y in yticks:
+            _, py = eixo.px(eixo.xlim[0], y)
+            pygame.draw.line(sup, RGB_GRADE, (r.left, py), (r.right, py))
+            t = self.cache_texto.render(self.fonte_eixo, _rotulo(y), True, RGB_BRANCO)
+            sup.blit(t, (r.left - t.get_width() - 4, py - t.get_height() // 2))
+        for x in xticks:
+            px, _ = eixo.px(x, eixo.ylim[0])
+            pygame.draw.line(sup, RGB_GRADE, (px, r.top), (px, r.bottom))
+            t = self.cache_texto.render(self.fonte_eixo, _rotulo(x), True, RGB_BRANCO)
+            sup.blit(t, (px - t.get_width() // 2, r.bottom + 3))
+        pygame.draw.rect(sup, RGB_BRANCO, r, 1)
+
+    def _legenda(self, rect, itens, canto):
+        """Legenda com amostras de cor; canto é 'topright' ou 'bottomright'"""
+        linha_h = 13
+        larg = 14 + max(self.fonte_eixo.size(nome)[0] for nome, _ in itens) + 22
+        alt = linha_h * len(itens) + 6
+        caixa = pygame.Rect(0, 0, larg, alt)
+        setattr(caixa, canto, (rect.right - 4, rect.top + 4) if canto == 'topright' else (rect.right - 4, rect.bottom - 4))
+        pygame.draw.rect(self.superficie, RGB_EIXOS, caixa)
+        pygame.draw.rect(self.superficie, RGB_GRADE, caixa, 1)
+        for i, (nome, cor) in enumerate(itens):
+            y = caixa.top + 3 + i * linha_h + linha_h // 2
+            pygame.draw.line(self.superficie, cor, (caixa.left + 5, y), (caixa.left + 22, y), 3)
+            t = self.cache_texto.render(self.fonte_eixo, nome, True, RGB_BRANCO)
+            self.superficie.blit(t, (caixa.left + 27, y - t.get_height() // 2))
+
+    def _desenhar_distribuicao(self, barras, config_dados):
+        min_valor, max_valor = intervalo_x(barras, config_dados)
+        valores = list(range(min_valor, max_valor))
+        prob_teo = prob_teorica(config_dados, valores)
+        freqs = {}
+        maior = float(prob_teo.max())
+        for i, (_, _, contagens, n) in enumerate(barras):
+            if n:
+                freqs[i] = [contagens[v] / n if v < len(contagens) else 0.0 for v in valores]
+                maior = max(maior, max(freqs[i]))
+
+        ylim = (0.0, maior * 1.05)
+        eixo = _Eixo(self.areas[0], (min_valor - 0.6, max_valor - 0.4), ylim)
+        self._desenhar_eixos(eixo, _ticks_x(valores), _ticks(*ylim))
+
+        # Área sob a curva teórica, translúcida
+        pontos = [eixo.px(v, p) for v, p in zip(valores, prob_teo)]
+        base = eixo.rect.bottom
+        camada = pygame.Surface(self.tamanho, pygame.SRCALPHA)
+        pygame.draw.polygon(camada, (255, 255, 255, 50), [(pontos[0][0], base)] + pontos + [(pontos[-1][0], base)])
+
+        legenda = []
+        for i, (rotulo, cor, _, _) in enumerate(barras):
+            if i not in freqs:
+                continue
+            offset, largura_barra = _deslocamento_barra(i, len(barras))
+            for v, f in zip(valores, freqs[i]):
+                if f <= 0:
+                    continue
+                x0, y0 = eixo.px(v + offset - largura_barra / 2, f)
+                x1, _ = eixo.px(v + offset + largura_barra / 2, 0)
+                pygame.draw.rect(camada, (*cor, 180), pygame.Rect(round(x0), round(y0), max(1, round(x1 - x0)), round(base - y0)))
+            legenda.append((rotulo, cor))
+        self.superficie.blit(camada, (0, 0))
+        pygame.draw.lines(self.superficie, RGB_BRANCO, False, pontos, 2)
+        self._legenda(eixo.rect, [("Teórico", RGB_BRANCO)] + legenda, 'topright')
+
+    def _desenhar_convergencia(self, jogadores, config_dados):
+        media_teorica = config_dados.media
+        maior_n = 2
+        media_min = media_max = media_teorica
+        for _, _, _, _, (xs, medias) in jogadores:
+            if medias:
+                maior_n = max(maior_n, xs[-1])
+                media_min = min(media_min, min(medias))
+                media_max = max(media_max, max(medias))
+        margem = max(0.5, (media_max - media_min) * 0.05)
+        ylim = (media_min - margem, media_max + margem)
+        eixo = _Eixo(self.areas[1], (1, maior_n), ylim)
+        self._desenhar_eixos(eixo, [x for x in _ticks(1, maior_n, 4) if x >= 1], _ticks(*ylim))
+
+        sup = self.superficie
+        # Faixa de 95% da média teórica, translúcida e recortada pela área do eixo
+        ns, inferior, superior = faixa_confianca(config_dados, maior_n)
+        contorno = ([eixo.px(n, v) for n, v in zip(ns, superior)]
+                    + [eixo.px(n, v) for n, v in zip(ns[::-1], inferior[::-1])])
+        camada = pygame.Surface(eixo.rect.size, pygame.SRCALPHA)
+        topo = eixo.rect.topleft
+        pygame.draw.polygon(camada, (255, 255, 255, 30), [(x - topo[0], y - topo[1]) for x, y in contorno])
+        sup.blit(camada, topo)
+        sup.set_clip(eixo.rect)
+        # Linha tracejada da média teórica
+        _, y_teo = eixo.px(1, media_teorica)
+        for x in range(eixo.rect.left, eixo.rect.right, 10):
+            pygame.draw.line(sup, (200, 200, 200), (x, y_teo), (min(x + 6, eixo.rect.right), y_teo), 2)
+        legenda = []
+        poucos = len(jogadores) <= MAX_SERIES_BARRAS
+        for pid, cor, _, _, (xs, medias) in jogadores:
+            if len(medias) > 1:
+                pygame.draw.lines(sup, cor, False, [eixo.px(x, m) for x, m in zip(xs, medias)], 2 if poucos else 1)
+            elif medias:
+                pygame.draw.circle(sup, cor, eixo.px(xs[0], medias[0]), 2)
+            if medias and poucos:
+                legenda.append((f"J{pid}", cor))
+        sup.set_clip(None)
+        self._legenda(eixo.rect, legenda + [(f"Média Teórica = {media_teorica:.1f}", (200, 200, 200)),
+                                            ("IC 95%", (90, 90, 110))], 'bottomright')
+
+    def renderizar(self, dados, tamanho):
+        """Redesenha os dois painéis e retorna a Surface em cache"""
+        if self.tamanho != tamanho:
+            self._criar_camada_estatica(tamanho)
+        self.superficie.blit(self.estatica, (0, 0))
+        self._desenhar_distribuicao(dados['barras'], dados['dados'])
+        self._desenhar_convergencia(dados['jogadores'], dados['dados'])
+        return self.superficie
+
+
+class TrabalhadorGrafico:
+    """Gera gráficos numa thread em segundo plano, guardando só o pedido mais recente.
+
+    ``pedir`` recebe um retrato dos dados (ver ``dados_grafico``); quando um
+    gráfico fica pronto, ``coletar`` devolve uma Surface própria (a mais nova
+    já pronta, mesmo com um pedido mais recente em produção) e, se
+    ``evento_pronto`` for dado, um evento pygame desse tipo é postado para
+    acordar o laço principal. Se a renderização falhar, a exceção é levantada
+    por ``coletar`` na thread de quem coleta.
+    """
+
+    def __init__(self, renderizador, evento_pronto=None):
+        self.renderizador = renderizador
+        self.evento_pronto = evento_pronto
+        self._cond = threading.Condition()
+        self._pedido = None
+        self._resultado = None
+        self._ultimo_id = 0
+        # Pedidos até _descartado são ignorados; _entregue é o último devolvido por coletar
+        self._descartado = 0
+        self._entregue = 0
+        # Duração da última renderização, para quem quiser espaçar os pedidos
+        self.duracao = 0.0
+        self._encerrar = False
+        self._thread = threading.Thread(target=self._laco, daemon=True)
+        self._thread.start()
+
+    def pedir(self, dados, tamanho, renderizador=None):
+        """Substitui qualquer pedido ainda não atendido; ``renderizador`` troca o usado daqui em diante"""
+        with self._cond:
+            if renderizador is not None:
+                self.renderizador = renderizador
+            self._ultimo_id += 1
+            self._pedido = (self._ultimo_id, self.renderizador, dados, tamanho)
+            self._cond.notify()
+
+    def coletar(self):
+        """Surface mais recente já pronta e ainda não coletada (senão None).
+
+        Não espera o pedido mais novo: com lançamentos mais rápidos que a
+        renderização, o gráfico na tela segue atualizando com um pouco de atraso.
+        Levanta a exceção do renderizador, se o gráfico mais recente falhou.
+        """
+        with self._cond:
+            resultado, self._resultado = self._resultado, None
+        if resultado is None or resultado[0] <= self._descartado:
+            return None
+        id_pedido, superficie, erro = resultado
+        self._entregue = id_pedido
+        if erro is not None:
+            raise erro
+        return superficie
+
+    @property
+    def pendente(self):
+        """O pedido mais recente ainda não foi coletado?"""
+        return self._ultimo_id > max(self._entregue, self._descartado)
+
+    def descartar(self):
+        """Ignora o pedido pendente e qualquer gráfico ainda em produção"""
+        with self._cond:
+            self._descartado = self._ultimo_id
+            self._pedido = None
+            self._resultado = None
+
+    def encerrar(self):
+        with self._cond:
+            self._encerrar = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _laco(self):
+        while True:
+            with self._cond:
+                while self._pedido is None and not self._encerrar:
+                    self._cond.wait()
+                if self._encerrar:
+                    return
+                id_pedido, renderizador, dados, tamanho = self._pedido
+                self._pedido = None
+
+            inicio = time.perf_counter()
+            superficie = erro = None
+            try:
+                # Cópia: a Surface do renderizador aponta para um buffer reutilizado
+                superficie = renderizador.renderizar(dados, tamanho).copy()
+            except Exception as e:
+                # Sem isso a thread morreria calada e o pedido ficaria pendente para sempre
+                erro = e
+            self.duracao = time.perf_counter() - inicio
+
+            with self._cond:
+                self._resultado = (id_pedido, superficie, erro)
+            if self.evento_pronto is not None and pygame.display.get_init():
+                try:
+                    pygame.event.post(pygame.event.Event(self.evento_pronto))
+                except pygame.error:
+                    pass
@@ -0,0 +1,196 @@
+"""Oponente computador com jogo ótimo pré-calculado (partidas de 2 jogadores).
+
+A única decisão de um jogador é quando usar o poder. Para um tabuleiro e um
+par de poderes, a probabilidade de vitória de cada estado
+
+    (vez, poder do computador livre?, poder do oponente livre?, casa do computador, casa do oponente)
+
+é resolvida por iteração de valores com NumPy, supondo que o oponente também
+joga da melhor forma (minimax). As camadas de poderes livres são resolvidas da
+mais gasta para a mais livre, já que usar um poder só leva a camadas já
+resolvidas. O resultado vira uma tabela "usar o poder agora?" por estado,
+gravada em disco (bits compactados + probabilidades em float16); durante o
+jogo, cada decisão é uma consulta à tabela, sem busca.
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from markov import PMF_2D6
+from motor import PODERES, tabela_saltos
+
+DOBRAR, RETROCEDER, TROCAR, JOGAR_NOVAMENTE = range(len(PODERES))
+# Acima disso a tabela (meta² estados por camada) fica cara demais para resolver na hora
+MAX_META_IA = 200
+DIRETORIO_CACHE = os.environ.get("CORRIDA_CACHE") or os.path.join(os.path.expanduser("~"), ".cache",
+                                                                   "corrida_estatistica")
+# Muda quando o formato do arquivo ou as regras do motor mudam, invalidando o cache
+FORMATO = 1
+
+
+class PoliticaIA:
+    """Tabela de decisão do computador contra um poder de oponente.
+
+    ``usar[ub, a, b]``: usar o poder agora, com o computador na casa ``a``, o
+    oponente na casa ``b`` e ``ub`` indicando se o poder do oponente está livre.
+    ``valor[vez, ua, ub, a, b]``: probabilidade de vitória do computador (vez 0
+    = computador, 1 = oponente).
+    """
+
+    def __init__(self, usar, valor):
+        self.usar = usar
+        self.valor = valor
+        for arr in (usar, valor):
+            arr.setflags(write=False)
+
+    def __call__(self, motor, jogador_id):
+        """Estratégia no formato de ``motor.estrategia_padrao``: usar o poder agora?"""
+        jogador = motor.jogadores[jogador_id]
+        if jogador.poder is None or jogador.poder_usado:
+            return False
+        oponente = motor.jogadores[motor.alvo_poder(jogador_id)]
+        livre = int(oponente.poder is not None and not oponente.poder_usado)
+        return bool(self.usar[livre, jogador.pos, oponente.pos])
+
+    def prob_vitoria(self, motor, jogador_id):
+        """Probabilidade de o computador (``jogador_id``) vencer a partir do estado atual"""
+        jogador = motor.jogadores[jogador_id]
+        oponente = motor.jogadores[motor.alvo_poder(jogador_id)]
+        ua = int(jogador.poder is not None and not jogador.poder_usado)
+        ub = int(oponente.poder is not None and not oponente.poder_usado)
+        vez = 0 if motor.turno_atual == jogador_id else 1
+        return float(self.valor[vez, ua, ub, jogador.pos, oponente.pos])
+
+
+def _destinos(meta, casas_especiais, pmf, fator=1):
+    """(destinos[s, c], probs[s]): casa final (limitada à meta) saindo de c com a s-ésima soma possível"""
+    somas = np.array([s for s, p in enumerate(pmf) if p > 0])
+    probs = np.array([pmf[s] for s in somas])
+    saltos = np.array(tabela_saltos(meta, casas_especiais, fator * int(somas.max())), dtype=np.intp)
+    saltos = np.minimum(saltos, meta - 1)
+    return saltos[np.arange(meta)[None, :] + fator * somas[:, None]], probs
+
+
+def _fixar_terminais(v):
+    # Oponente na meta: computador perdeu; computador na meta: venceu
+    v[:, -1] = 0.0
+    v[-1, :] = 1.0
+    return v
+
+
+def resolver_politica(meta, casas_especiais, poder_ia, poder_oponente, pmf=PMF_2D6, tolerancia=1e-10):
+    """Resolve o jogo para os poderes dados (índices em ``PODERES`` ou None); retorna ``PoliticaIA``"""
+    destinos, probs = _destinos(meta, casas_especiais, pmf)
+    destinos2, probs2 = _destinos(meta, casas_especiais, pmf, fator=2)
+    recuo = np.maximum(np.arange(meta) - 3, 0)
+
+    # Valor esperado depois do lance de quem joga; v[a, b] é a tabela da vez seguinte
+    def rolar_ia(v, d=destinos, p=probs):
+        return np.tensordot(p, v[d], axes=1)
+
+    def rolar_op(v, d=destinos, p=probs):
+        return np.tensordot(v[:, d], p, axes=([1], [0]))
+
+    def usar_ia(a_sem, h_sem):
+        """Valor de o computador usar o poder agora (tabelas da camada com o poder gasto)"""
+        if poder_ia == DOBRAR:
+            return rolar_ia(h_sem, destinos2, probs2)
+        if poder_ia == RETROCEDER:
+            return rolar_ia(h_sem)[:, recuo]
+        if poder_ia == TROCAR:
+            return rolar_ia(h_sem).T
+        return rolar_ia(a_sem)
+
+    def usar_op(a_sem, h_sem):
+        if poder_oponente == DOBRAR:
+            return rolar_op(a_sem, destinos2, probs2)
+        if poder_oponente == RETROCEDER:
+            return rolar_op(a_sem)[recuo, :]
+        if poder_oponente == TROCAR:
+            return rolar_op(a_sem).T
+        return rolar_op(h_sem)
+
+    valor = np.zeros((2, 2, 2, meta, meta))
+    usar = np.zeros((2, meta, meta), dtype=bool)
+    for ua in (0, 1):
+        for ub in (0, 1):
+            opcao_ia = usar_ia(*valor[:, 0, ub]) if ua and poder_ia is not None else None
+            opcao_op = usar_op(*valor[:, ua, 0]) if ub and poder_oponente is not None else None
+            a = _fixar_terminais(np.full((meta, meta), 0.5))
+            while True:
+                h = rolar_op(a)
+                if opcao_op is not None:
+                    np.minimum(h, opcao_op, out=h)
+                _fixar_terminais(h)
+                sem_poder = rolar_ia(h)
+                novo = sem_poder if opcao_ia is None else np.maximum(sem_poder, opcao_ia)
+                _fixar_terminais(novo)
+                delta = np.abs(novo - a).max()
+                a = novo
+                if delta < tolerancia:
+                    break
+            h = rolar_op(a)
+            if opcao_op is not None:
+                np.minimum(h, opcao_op, out=h)
+            valor[0, ua, ub], valor[1, ua, ub] = a, _fixar_terminais(h)
+            if opcao_ia is not None:
+                # Empate conta como guardar o poder
+                usar[ub] = opcao_ia > sem_poder + 1e-9
+    return PoliticaIA(usar, valor.astype(np.float16))
+
+
+def _chave(meta, casas_especiais, poder_ia, poder_oponente, pmf):
+    config = [FORMATO, meta, sorted([c, t, v] for c, (t, v, _) in casas_especiais.items()),
+              poder_ia, poder_oponente, [round(p, 15) for p in pmf]]
+    return hashlib.sha1(json.dumps(config).encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=32)
+def _carregar(meta, casas_itens, poder_ia, poder_oponente, pmf, diretorio):
+    casas = dict(casas_itens)
+    caminho = None
+    if diretorio is not None:
+        caminho = os.path.join(diretorio, f"politica-{_chave(meta, casas, poder_ia, poder_oponente, pmf)}.npz")
+        try:
+            with np.load(caminho) as arq:
+                usar = np.unpackbits(arq["usar"], count=2 * meta * meta).astype(bool).reshape(2, meta, meta)
+                return PoliticaIA(usar, arq["valor"])
+        except (OSError, KeyError, ValueError):
+            pass
+
+    politica = resolver_politica(meta, casas, poder_ia, poder_oponente, pmf)
+    if caminho is not None:
+        try:
+            os.makedirs(diretorio, exist_ok=True)
+            # Grava num temporário e renomeia, para outro processo nunca ler um arquivo pela metade
+            temporario = f"{caminho}.{os.getpid()}.tmp"
+            with open(temporario, "wb") as f:
+                np.savez_compressed(f, usar=np.packbits(politica.usar), valor=politica.valor)
+            os.replace(temporario, caminho)
+        except OSError:
+            pass
+    return politica
+
+
+def carregar_politica(meta, casas_especiais, poder_ia, poder_oponente, pmf=PMF_2D6, diretorio=DIRETORIO_CACHE):
+    """Política do tabuleiro e poderes dados: da memória, do cache em disco ou resolvida agora.
+
+    ``diretorio=None`` desliga o cache em disco.
+    """
+    if not 2 <= meta <= MAX_META_IA:
+        raise ValueError(f"o computador só joga em tabuleiros de até {MAX_META_IA} casas")
+    return _carregar(meta, tuple(sorted(casas_especiais.items())), poder_ia, poder_oponente, tuple(pmf), diretorio)
+
+
+def escolher_poder(meta, casas_especiais, poder_oponente, computador_comeca=False, pmf=PMF_2D6,
+                   diretorio=DIRETORIO_CACHE):
+    """Índice do poder com maior chance de vitória contra ``poder_oponente``"""
+    vez = 0 if computador_comeca else 1
+
+    def chance(poder):
+        politica = carregar_politica(meta, casas_especiais, poder, poder_oponente, pmf, diretorio)
+        return politica.valor[vez, 1, int(poder_oponente is not None), 0, 0]
+    return max(range(len(PODERES)), key=chance)
@@ -1,16 +1,60 @@
 import pygame
-import numpy as np
-import matplotlib.pyplot as plt
-import random
-import io
+import importlib.util
+import math
 import sys
-import os
+import threading
+import time
 
-# Configurar matplotlib para renderizar em memória (backend Agg)
-plt.switch_backend('Agg')
+from dados import DADOS_PADRAO, ConfigDados, interpretar_dados
+from motor import MAX_JOGADORES, META, PODERES, MotorJogo, nova_semente
+from perfil import Perfilador
+from renderizacao import AtlasDados, CacheTexto, IndiceEspacial
+from tabuleiro import COLUNAS_PADRAO
+
+# matplotlib e NumPy só são importados quando o primeiro gráfico é necessário
+# (ou pela thread de aquecimento). Sem matplotlib (ex.: quiosques), apenas o
+# renderizador pygame fica disponível.
+MATPLOTLIB_DISPONIVEL = importlib.util.find_spec("matplotlib") is not None
+
+# Modo turbo: lançamentos avulsos por segundo e intervalo mínimo entre gráficos
+TURBO_LANCES_POR_S = 25_000
+TURBO_INTERVALO_GRAFICO = 0.25
+# Linhas de jogador na tabela de estatísticas; o resto é resumido numa linha
+MAX_LINHAS_JOGADORES = 8
+# Tamanho mínimo de uma casa; tabuleiros maiores que a janela passam a rolar
+LARGURA_MIN_CASA = 60
+ALTURA_MIN_CASA = 80
+# Pausa antes de cada lance do computador, para dar tempo de acompanhar a jogada
+IA_ATRASO = 0.8
+# Dados percorridos pela tecla D durante a partida
+PREDEFINICOES_DADOS = [DADOS_PADRAO, ConfigDados(3, 6), ConfigDados(5, 10), ConfigDados(1, 6), ConfigDados(2, 20),
+                       ConfigDados(2, 6, (1, 1, 1, 1, 1, 3))]
+# Mais dados que isso no painel: só a soma é mostrada
+MAX_DADOS_DESENHADOS = 10
+# Quadros em que o último lance fica no painel; nos primeiros, os dados ainda rolam
+QUADROS_DADOS_VISIVEIS = 90
+QUADROS_ROLAGEM_DADOS = 16
+
+
+def gerar_cores_jogadores(n, primeiras):
+    """Uma cor por jogador: as ``primeiras`` e, depois, matizes espaçados pelo ângulo áureo"""
+    cores = {}
+    for jid in range(1, n + 1):
+        if jid <= len(primeiras):
+            cores[jid] = primeiras[jid - 1]
+        else:
+            cor = pygame.Color(0)
+            cor.hsva = ((jid * 137.508) % 360, 65, 100, 100)
+            cores[jid] = (cor.r, cor.g, cor.b)
+    return cores
+
+def _aquecer_graficos():
+    import graficos
+    graficos.aquecer()
 
 class CorridaEstatistica:
-    def __init__(self):
+    def __init__(self, modo_grafico=None, aquecer_graficos=True, semente=None, gravador=None, num_jogadores=2,
+                 tabuleiro=None, ia=False, config_dados=None, exportador=None):
         pygame.init()
         
         # --- CONFIGURAÇÕES DE TELA ---
@@ -38,76 +82,111 @@ class CorridaEstatistica:
         self.fonte_media = pygame.font.SysFont('Arial', 20)
         self.fonte_pequena = pygame.font.SysFont('Arial', 16, bold=True)
         self.fonte_mini = pygame.font.SysFont('Arial', 12)
+        self.cache_texto = CacheTexto()
+        self.atlas_dados = AtlasDados()
         
         # --- LÓGICA DO JOGO ---
-        self.meta = 30
-        self.jogadores = {
-            1: {'pos': 0, 'dados': [], 'cor': self.C_JOGADOR1, 'nome': 'Jogador 1', 'poder': None, 'poder_usado': False},
-            2: {'pos': 0, 'dados': [], 'cor': self.C_JOGADOR2, 'nome': 'Jogador 2', 'poder': None, 'poder_usado': False}
-        }
-        self.turno_atual = 1
-        self.vencedor = None
-        self.historico_medias = {1: [], 2: []}
-        self.historico_lancamentos = {1: [], 2: []}
+        # Cada partida tem sua semente; o gravador opcional guarda o log binário (ver registro.py)
+        self.gravador = gravador
+        # Exportação colunar opcional dos lançamentos, posições e poderes (ver exportacao.py)
+        self.exportador = exportador
+        # tabuleiro: configuração de tabuleiro.carregar_tabuleiro (None = clássico de 30 casas)
+        tabuleiro = tabuleiro or {}
+        self.colunas_tabuleiro = tabuleiro.get("colunas", COLUNAS_PADRAO)
+        self.motor = MotorJogo(tabuleiro.get("meta", META), tabuleiro.get("casas_especiais"),
+                               semente=nova_semente() if semente is None else semente, gravador=gravador,
+                               num_jogadores=num_jogadores, config_dados=config_dados, exportador=exportador)
+        self.cores_jogadores = gerar_cores_jogadores(num_jogadores, (self.C_JOGADOR1, self.C_JOGADOR2))
+        # Com ia, o Jogador 2 é o computador; a política (ver ia.py) é carregada quando ele escolhe o poder
+        self.jogador_ia = 2 if ia else None
+        self.politica_ia = None
+        self.ia_lance_em = None
+        # Políticas são resolvidas numa thread (ver _pensar_computador); o laço principal só consulta o resultado
+        self.tarefa_ia = None
+        self._nomear_computador()
         
         # Estados de exibição
         self.msg_evento = ""
         self.timer_evento = 0
-        self.ultimo_lancamento = (0, 0)
+        self.ultimo_lancamento = ()
         self.ultimo_resultado_soma = 0
         self.timer_dados_visiveis = 0
         
         # Cache da imagem do gráfico
         self.img_grafico_cache = None
         self.dados_para_grafico_atualizados = False
-        
-        # Sistema de poderes
-        self.poderes_disponiveis = [
-            {"nome": "Dobrar Dados", "descricao": "Próximo lançamento é dobrado", "cor": (255, 150, 50)},
-            {"nome": "Retroceder Oponente", "descricao": "Oponente volta 3 casas", "cor": (200, 80, 80)},
-            {"nome": "Trocar Posições", "descricao": "Troca de lugar com oponente", "cor": (150, 100, 200)},
-            {"nome": "Jogar Novamente", "descricao": "Joga os dados novamente", "cor": (80, 180, 120)}
-        ]
+        # Gráficos matplotlib são produzidos em segundo plano; o anterior fica na tela até o novo chegar
+        self.trabalhador_grafico = None
+        self.grafico_pendente = False
+        self.EVENTO_GRAFICO_PRONTO = pygame.event.custom_type()
+        self.EVENTO_IA_PRONTA = pygame.event.custom_type()
+        # "persistente": figura reaproveitada + buffer RGBA; "png": figura nova a cada lançamento;
+        # "pygame": desenho nativo, sem matplotlib
+        self.renderizadores_grafico = {}
+        self.modos_grafico = ["persistente", "pygame", "png"] if MATPLOTLIB_DISPONIVEL else ["pygame"]
+        self.modo_grafico = modo_grafico or self.modos_grafico[0]
+        # Aquecer a pilha de gráficos enquanto o menu e a seleção de poder estão na tela
+        if aquecer_graficos:
+            threading.Thread(target=_aquecer_graficos, daemon=True).start()
         
         # Estados do jogo
         self.estado = "menu"
-        self.jogador_selecionando_poder = 1
-
-        # Casas Especiais
-        self.casas_especiais = {
-            3: ("SORTE", 2, "Atalho! +2"), 8: ("SORTE", 3, "Vento! +3"),
-            12: ("SORTE", 1, "Passo! +1"), 18: ("SORTE", 2, "Escada! +2"),
-            22: ("SORTE", 4, "Jato! +4"), 28: ("SORTE", 1, "Quase! +1"),
-            4: ("AZAR", 2, "Queda! -2"), 7: ("AZAR", 3, "Buraco! -3"),
-            11: ("AZAR", 1, "Ops! -1"), 14: ("AZAR", 2, "Volta! -2"),
-            17: ("AZAR", 4, "Crise! -4"), 21: ("AZAR", 2, "Recuo! -2"),
-            26: ("AZAR", 3, "Monstro! -3")
-        }
-
-        # Gerar Tabuleiro
-        self.rects_casas = []
+        # Botões com efeito de hover desenhados no último quadro
+        self.rects_hover = []
+        self.hover_atual = ()
+        # Modo turbo (T): lançamentos em lote só para as estatísticas
+        self.turbo = False
+        self.turbo_ultimo_passo = 0.0
+        self.turbo_credito = 0.0
+        self.turbo_ultimo_grafico = 0.0
+        self.turbo_inicio_lances = 0
+        self.turbo_inicio = 0.0
+        self.duracao_ultimo_grafico = 0.0
+        # HUD de desempenho (F3); os métodos só são medidos enquanto ele está ligado
+        self.perfil = Perfilador()
+        self.rect_perfil = None
+
+        # Gerar Tabuleiro; a câmera segue o último jogador a se mover até o usuário rolar a vista
+        self.rects_casas = {}
+        self.camada_degrade = None
+        self.camera_y = None
+        self.seguir_jogador = True
+        self.jogador_seguido = 1
         self._gerar_layout_tabuleiro()
+        self._gerar_camadas_estaticas()
 
     def _gerar_layout_tabuleiro(self):
-        """Gera o layout Zig-Zag ajustado"""
-        self.rects_casas = []
-        
+        """Gera o layout Zig-Zag em coordenadas do tabuleiro e o índice espacial das casas.
+
+        As casas não encolhem abaixo de LARGURA_MIN_CASA x ALTURA_MIN_CASA; se o
+        tabuleiro não couber na janela, ele rola na vertical (ver ``camera_y``).
+        """
         painel_w = 380
         margem_esquerda_extra = 120 
         area_x_offset = painel_w + margem_esquerda_extra
         area_y_offset = 50
         
+        # Região redesenhada a cada quadro (painel + gráfico), à esquerda do tabuleiro
+        self.area_painel = pygame.Rect(0, 0, area_x_offset, self.altura_tela)
+        self.area_tabuleiro = pygame.Rect(area_x_offset, 0, self.largura_tela - area_x_offset, self.altura_tela)
+        
         area_w = self.largura_tela - area_x_offset - 30
         area_h = self.altura_tela - area_y_offset - 30
+        self.area_casas = pygame.Rect(area_x_offset, area_y_offset, area_w, area_h)
         
-        cols = 6
-        linhas = 5
+        meta = self.motor.meta
+        cols = max(1, min(self.colunas_tabuleiro, meta, area_w // LARGURA_MIN_CASA))
+        linhas = math.ceil(meta / cols)
         
         largura_celula = area_w / cols
-        altura_celula = area_h / linhas
+        altura_celula = max(area_h / linhas, ALTURA_MIN_CASA)
         margem = 6
+        self.altura_celula = altura_celula
+        self.altura_mundo = linhas * altura_celula
+        self.tamanho_casa = (largura_celula - 2 * margem, altura_celula - 2 * margem)
         
-        for i in range(self.meta):
+        self.indice_casas = IndiceEspacial(max(largura_celula, altura_celula))
+        for i in range(meta):
             linha = i // cols
             coluna = i % cols
             
@@ -116,239 +195,355 @@ class CorridaEstatistica:
             
             linha_visual = (linhas - 1) - linha
             
-            x = area_x_offset + (coluna * largura_celula) + margem
-            y = area_y_offset + (linha_visual * altura_celula) + margem
+            x = (coluna * largura_celula) + margem
+            y = (linha_visual * altura_celula) + margem
             w = largura_celula - (margem * 2)
             h = altura_celula - (margem * 2)
             
-            r = pygame.Rect(x, y, w, h)
-            self.rects_casas.append({'rect': r, 'id': i, 'center': r.center})
+            self.indice_casas.inserir(i, pygame.Rect(x, y, w, h))
+        
+        if self.camera_y is None or self.seguir_jogador:
+            self.camera_y = self._camera_para(self._casa_seguida())
+        self._posicionar_camera(self.camera_y)
+
+    def _casa_seguida(self):
+        jogador = self.motor.jogadores.get(self.motor.vencedor or self.jogador_seguido)
+        return min(jogador.pos, self.motor.meta - 1) if jogador else 0
+
+    def _camera_para(self, casa):
+        """camera_y que centraliza a casa na vista"""
+        rect = self.indice_casas.rects[casa]
+        return rect.centery - self.area_casas.height / 2
+
+    def _posicionar_camera(self, camera_y):
+        """Limita a câmera ao tabuleiro e dispõe na tela só as casas visíveis"""
+        maximo = max(0, self.altura_mundo - self.area_casas.height)
+        self.camera_y = int(min(max(camera_y, 0), maximo))
+        dy = self.area_casas.top - self.camera_y
+        dx = self.area_casas.left
+        # Região do tabuleiro visível na tela, em coordenadas do tabuleiro
+        visivel = pygame.Rect(0, -dy, self.area_tabuleiro.width, self.altura_tela)
+        self.rects_casas = {i: self.indice_casas.rects[i].move(dx, dy) for i in self.indice_casas.consultar(visivel)}
+
+    def mover_camera(self, camera_y=None, seguir=False):
+        """Rola a vista (ou volta a seguir o jogador) e refaz a camada estática se algo mudou"""
+        self.seguir_jogador = seguir
+        if seguir:
+            camera_y = self._camera_para(self._casa_seguida())
+        anterior = self.camera_y
+        self._posicionar_camera(camera_y)
+        if self.camera_y != anterior:
+            self._gerar_camadas_estaticas()
+
+    def _enquadrar_jogador(self):
+        """Com a câmera seguindo, rola só se o peão seguido saiu da vista"""
+        if not self.seguir_jogador:
+            return
+        casa = self._casa_seguida()
+        rect = self.rects_casas.get(casa)
+        if rect is None or not self.area_casas.contains(rect):
+            self.mover_camera(seguir=True)
+
+    def _nomear_computador(self):
+        if self.jogador_ia is not None:
+            self.motor.jogadores[self.jogador_ia].nome = "Computador"
 
     def reiniciar(self):
-        self.jogadores[1]['pos'] = 0
-        self.jogadores[1]['dados'] = []
-        self.jogadores[1]['poder'] = None
-        self.jogadores[1]['poder_usado'] = False
-        self.jogadores[2]['pos'] = 0
-        self.jogadores[2]['dados'] = []
-        self.jogadores[2]['poder'] = None
-        self.jogadores[2]['poder_usado'] = False
-        self.turno_atual = 1
-        self.vencedor = None
-        self.historico_medias = {1: [], 2: []}
-        self.historico_lancamentos = {1: [], 2: []}
+        self.motor.reiniciar(nova_semente())
+        self._nomear_computador()
+        self.ia_lance_em = None
+        self.tarefa_ia = None
         self.msg_evento = ""
-        self.ultimo_lancamento = (0, 0)
+        self.ultimo_lancamento = ()
         self.img_grafico_cache = None
+        self._descartar_grafico_pendente()
+        self.turbo = False
+        self.jogador_seguido = 1
+        self.mover_camera(seguir=True)
         self.estado = "menu"
-        self.jogador_selecionando_poder = 1
 
     def selecionar_poder(self, jogador_id, poder_index):
         """Atribui um poder ao jogador"""
-        if 0 <= poder_index < len(self.poderes_disponiveis):
-            self.jogadores[jogador_id]['poder'] = self.poderes_disponiveis[poder_index]
-            self.jogadores[jogador_id]['poder_usado'] = False
-            
-            if jogador_id == 1:
-                self.jogador_selecionando_poder = 2
-            else:
-                self.estado = "jogando"
+        if self.motor.selecionar_poder(jogador_id, poder_index):
+            self.estado = "jogando"
+        elif self.motor.jogador_selecionando_poder == self.jogador_ia:
+            self._preparar_computador(poder_index)
+
+    def _preparar_computador(self, poder_oponente):
+        """O computador escolhe o melhor poder contra o do oponente e carrega sua política (em segundo plano)"""
+        from ia import carregar_politica, escolher_poder
+        meta, casas, pmf = self.motor.meta, self.motor.casas_especiais, self.motor.config_dados.pmf
+
+        def calcular():
+            poder = escolher_poder(meta, casas, poder_oponente, pmf=pmf)
+            return poder, carregar_politica(meta, casas, poder, poder_oponente, pmf)
+
+        def aplicar(resultado):
+            poder, self.politica_ia = resultado
+            self.selecionar_poder(self.jogador_ia, poder)
+        self._pensar_computador(calcular, aplicar)
+
+    def _pensar_computador(self, calcular, aplicar):
+        """Roda ``calcular()`` numa thread; ``aplicar(resultado)`` fica para o laço principal (ver _coletar_computador).
+
+        Resolver uma política leva até ~1 s por poder em tabuleiros grandes;
+        na thread principal, a janela congelaria. Uma tarefa nova substitui
+        a anterior, cujo resultado é então ignorado.
+        """
+        tarefa = {"aplicar": aplicar}
+
+        def trabalhar():
+            try:
+                tarefa["resultado"] = calcular()
+            except Exception as erro:
+                tarefa["erro"] = erro
+            pygame.event.post(pygame.event.Event(self.EVENTO_IA_PRONTA))
+        self.tarefa_ia = tarefa
+        threading.Thread(target=trabalhar, daemon=True).start()
+
+    def _coletar_computador(self):
+        """Aplica o resultado da tarefa do computador, se já estiver pronto; retorna True se aplicou"""
+        tarefa = self.tarefa_ia
+        if tarefa is None or not ("resultado" in tarefa or "erro" in tarefa):
+            return False
+        self.tarefa_ia = None
+        if "erro" in tarefa:
+            raise tarefa["erro"]
+        tarefa["aplicar"](tarefa["resultado"])
+        return True
+
+    def trocar_dados(self, config_dados=None):
+        """Troca os dados (padrão: a próxima predefinição); as estatísticas recomeçam"""
+        if config_dados is None:
+            atual = self.motor.config_dados
+            i = PREDEFINICOES_DADOS.index(atual) + 1 if atual in PREDEFINICOES_DADOS else 0
+            config_dados = PREDEFINICOES_DADOS[i % len(PREDEFINICOES_DADOS)]
+        self.motor.trocar_dados(config_dados)
+        motor = self.motor
+        if self.jogador_ia is not None and motor.jogadores[self.jogador_ia].poder is not None:
+            # A política depende da distribuição das somas: o computador espera a dos novos dados
+            from ia import carregar_politica
+            poderes = [PODERES.index(motor.jogadores[jid].poder) for jid in (self.jogador_ia, motor.alvo_poder(self.jogador_ia))]
+            meta, casas = motor.meta, motor.casas_especiais
+            self.politica_ia = None
+            self._pensar_computador(lambda: carregar_politica(meta, casas, *poderes, config_dados.pmf),
+                                    lambda politica: setattr(self, "politica_ia", politica))
+        self.msg_evento = self.motor.msg_evento
+        self.timer_evento = 120
+        self.ultimo_lancamento = ()
+        self.timer_dados_visiveis = 0
+        self.img_grafico_cache = None
+        self._descartar_grafico_pendente()
+        self.dados_para_grafico_atualizados = True
+
+    def _vez_do_computador(self):
+        return (self.estado == "jogando" and not self.turbo and not self.motor.vencedor
+                and self.motor.turno_atual == self.jogador_ia)
+
+    def _passo_ia(self):
+        """Joga o turno do computador depois de uma pausa: a política decide o poder e os dados são lançados"""
+        if self.tarefa_ia is not None:
+            return
+        agora = time.perf_counter()
+        if self.ia_lance_em is None:
+            self.ia_lance_em = agora + IA_ATRASO
+            return
+        if agora < self.ia_lance_em:
+            return
+        self.ia_lance_em = None
+        if self.politica_ia(self.motor, self.jogador_ia):
+            self.usar_poder(self.jogador_ia)
+        self.jogar_dados()
 
     def usar_poder(self, jogador_id):
         """Ativa o poder do jogador atual"""
-        jogador = self.jogadores[jogador_id]
-        oponente_id = 3 - jogador_id
-        
-        if jogador['poder'] is None or jogador['poder_usado']:
+        if not self.motor.usar_poder(jogador_id):
             return False
-            
-        poder_nome = jogador['poder']['nome']
-        jogador['poder_usado'] = True
-        
-        if poder_nome == "Dobrar Dados":
-            self.msg_evento = f"{jogador['nome']} usou {poder_nome}!"
-            self.poder_dobrar_ativa = True
-            
-        elif poder_nome == "Retroceder Oponente":
-            self.jogadores[oponente_id]['pos'] = max(0, self.jogadores[oponente_id]['pos'] - 3)
-            self.msg_evento = f"{jogador['nome']} usou {poder_nome}!"
-            
-        elif poder_nome == "Trocar Posições":
-            pos_temp = jogador['pos']
-            jogador['pos'] = self.jogadores[oponente_id]['pos']
-            self.jogadores[oponente_id]['pos'] = pos_temp
-            self.msg_evento = f"{jogador['nome']} usou {poder_nome}!"
-            
-        elif poder_nome == "Jogar Novamente":
-            self.msg_evento = f"{jogador['nome']} usou {poder_nome}!"
-            self.turno_extra = True
-            
+        self._enquadrar_jogador()
+        self.msg_evento = self.motor.msg_evento
         self.timer_evento = 120
         return True
 
     def jogar_dados(self):
-        if self.vencedor or self.estado != "jogando": 
+        if self.estado != "jogando":
             return
 
-        jog = self.jogadores[self.turno_atual]
-        
-        d1 = random.randint(1, 6)
-        d2 = random.randint(1, 6)
-        soma = d1 + d2
-        
-        # Aplicar poder de dobrar dados se estiver ativo
-        if hasattr(self, 'poder_dobrar_ativa') and self.poder_dobrar_ativa:
-            soma = soma * 2
-            self.poder_dobrar_ativa = False
-            self.msg_evento = f"Dados dobrados! Movimento: {soma} casas"
-        else:
-            self.msg_evento = f"Movimento: {soma} casas"
-            
-        self.timer_evento = 90
-            
-        self.ultimo_lancamento = (d1, d2)
+        movendo = self.motor.turno_atual
+        resultado = self.motor.jogar_dados()
+        if resultado is None:
+            return
+        faces, soma = resultado
+        self.jogador_seguido = movendo
+        self._enquadrar_jogador()
+
+        self.msg_evento = self.motor.msg_evento
+        self.timer_evento = 90 if self.motor.casa_especial_atingida is None else 120
+        self.ultimo_lancamento = faces
         self.ultimo_resultado_soma = soma
-        self.timer_dados_visiveis = 90
-        
-        # Armazenar dados para estatísticas
-        jog['dados'].append(soma)
-        self.historico_lancamentos[self.turno_atual].append((d1, d2))
-        self.historico_medias[self.turno_atual].append(np.mean(jog['dados']))
+        self.timer_dados_visiveis = QUADROS_DADOS_VISIVEIS
         self.dados_para_grafico_atualizados = True
-        
-        # MOVIMENTO CORRETO: usar o valor real da soma
-        movimento = soma
-        pos_antiga = jog['pos']
-        jog['pos'] += movimento
-        
-        # Verificar casas especiais apenas na posição final (evita recursão)
-        self._verificar_consequencias_final(jog['pos'])
-        
-        # Verificar vitória
-        if jog['pos'] >= self.meta - 1:
-            jog['pos'] = self.meta - 1
-            self.vencedor = self.turno_atual
-            self.msg_evento = f"{jog['nome']} VENCEU!"
+
+        if self.motor.vencedor:
             self.estado = "fim"
-        
-        # Mudar turno (a menos que haja turno extra)
-        if not self.vencedor and not hasattr(self, 'turno_extra'):
-            self.turno_atual = 3 - self.turno_atual
-        elif hasattr(self, 'turno_extra'):
-            del self.turno_extra
 
-    def _verificar_consequencias_final(self, posicao):
-        """Verifica consequências apenas na posição final (evita recursão infinita)"""
-        if posicao >= self.meta:
+    def alternar_turbo(self):
+        """Liga/desliga o modo turbo; o tabuleiro vira uma tela só de estatísticas"""
+        if self.estado not in ("jogando", "fim"):
             return
-            
-        if posicao in self.casas_especiais:
-            tipo, valor, texto = self.casas_especiais[posicao]
-            jog = self.jogadores[self.turno_atual]
-            
-            self.msg_evento = f"{texto} na casa {posicao + 1}"
-            self.timer_evento = 120
-            
-            if tipo == "SORTE":
-                jog['pos'] += valor
-                self.msg_evento += f" (+{valor})"
-            elif tipo == "AZAR":
-                jog['pos'] = max(0, jog['pos'] - valor)
-                self.msg_evento += f" (-{valor})"
+        self.turbo = not self.turbo
+        agora = time.perf_counter()
+        self.turbo_ultimo_passo = self.turbo_inicio = agora
+        self.turbo_credito = 0.0
+        self.turbo_inicio_lances = self.motor.lances_avulsos
+        self.dados_para_grafico_atualizados = True
+        self.quadro_completo = True
+
+    def _passo_turbo(self):
+        """Sorteia os lançamentos devidos desde o último quadro e agenda o gráfico"""
+        agora = time.perf_counter()
+        # Limite de 0,1 s por passo para não acumular um lote enorme após uma pausa
+        self.turbo_credito += min(agora - self.turbo_ultimo_passo, 0.1) * TURBO_LANCES_POR_S
+        self.turbo_ultimo_passo = agora
+        n = int(self.turbo_credito)
+        if n:
+            self.turbo_credito -= n
+            faces = self.motor.lancar_lote(n)
+            self.ultimo_lancamento = faces
+            self.ultimo_resultado_soma = sum(faces)
+            self.timer_dados_visiveis = 1
+        # Gráfico com vazão limitada; modos lentos (png) esperam mais entre atualizações
+        intervalo = max(TURBO_INTERVALO_GRAFICO, 4 * self.duracao_ultimo_grafico)
+        if agora - self.turbo_ultimo_grafico >= intervalo and not self.grafico_pendente:
+            self.dados_para_grafico_atualizados = True
+            self.turbo_ultimo_grafico = agora
 
     def _calcular_stats_texto(self, jogador_id):
-        dados = self.jogadores[jogador_id]['dados']
-        if not dados:
-            return "-", "-", "-"
-        media = np.mean(dados)
-        mediana = np.median(dados)
-        valores, contagens = np.unique(dados, return_counts=True)
-        indice_moda = np.argmax(contagens)
-        moda = valores[indice_moda]
-        return f"{media:.2f}", f"{mediana:.1f}", f"{moda}"
-
-    def _desenhar_dado_pontos(self, x, y, tamanho, valor):
-        rect = pygame.Rect(x, y, tamanho, tamanho)
-        pygame.draw.rect(self.tela, (10, 10, 10), (x+2, y+2, tamanho, tamanho), border_radius=8)
-        pygame.draw.rect(self.tela, (245, 245, 245), rect, border_radius=8)
-        pygame.draw.rect(self.tela, (20, 20, 20), rect, 2, border_radius=8)
-        
-        raio = tamanho // 9
-        cor_ponto = (0, 0, 0)
-        
-        cx, cy = x + tamanho//2, y + tamanho//2
-        tl_x, tl_y = x + tamanho//4, y + tamanho//4
-        tr_x, tr_y = x + 3*tamanho//4, y + tamanho//4
-        bl_x, bl_y = x + tamanho//4, y + 3*tamanho//4
-        br_x, br_y = x + 3*tamanho//4, y + 3*tamanho//4
-        ml_x, ml_y = x + tamanho//4, y + tamanho//2
-        mr_x, mr_y = x + 3*tamanho//4, y + tamanho//2
-        
-        pontos = []
-        if valor == 1: pontos = [(cx, cy)]
-        elif valor == 2: pontos = [(tl_x, tl_y), (br_x, br_y)]
-        elif valor == 3: pontos = [(tl_x, tl_y), (cx, cy), (br_x, br_y)]
-        elif valor == 4: pontos = [(tl_x, tl_y), (tr_x, tr_y), (bl_x, bl_y), (br_x, br_y)]
-        elif valor == 5: pontos = [(tl_x, tl_y), (tr_x, tr_y), (cx, cy), (bl_x, bl_y), (br_x, br_y)]
-        elif valor == 6: pontos = [(tl_x, tl_y), (tr_x, tr_y), (ml_x, ml_y), (mr_x, mr_y), (bl_x, bl_y), (br_x, br_y)]
-            
-        for px, py in pontos:
-            pygame.draw.circle(self.tela, cor_ponto, (int(px), int(py)), raio)
+        stats = self.motor.estatisticas[jogador_id]
+        if not stats.n:
+            return "-", "-", "-", "-"
+        return f"{stats.media:.2f}", f"{stats.mediana:.1f}", f"{stats.moda}", f"{math.sqrt(stats.variancia):.2f}"
 
-    def _desenhar_tabuleiro(self):
-        if len(self.rects_casas) > 1:
-            pontos = [c['center'] for c in self.rects_casas]
-            pygame.draw.lines(self.tela, (80, 80, 100), False, pontos, 8)
-            
-        for casa in self.rects_casas:
-            rect = casa['rect']
-            idx = casa['id']
+    def _texto_aderencia(self, jogador_id):
+        """(p-valor, cor, detalhe): teste qui-quadrado e intervalo de 95% da média, já acumulados no motor"""
+        stats = self.motor.estatisticas[jogador_id]
+        teste = stats.aderencia
+        if not teste.n:
+            return "-", (255, 255, 255), ""
+        intervalo = stats.intervalo_media()
+        detalhe = f"IC95 {intervalo[0]:.2f}–{intervalo[1]:.2f}" if intervalo else ""
+        if not teste.confiavel:
+            return "n peq.", (150, 150, 150), detalhe
+        p = teste.p_valor
+        # Vermelho: as somas dificilmente viriam destes dados (p < 1%)
+        cor = (255, 110, 110) if p < 0.01 else (255, 255, 255)
+        texto = f"{p:.3f}" if p >= 0.001 else "<0.001"
+        return texto, cor, f"{detalhe}  χ² {teste.qui_quadrado:.1f} ({teste.graus_liberdade} gl)"
+
+    def _gerar_camadas_estaticas(self):
+        """Pré-renderiza o fundo fixo (degradê do painel, caminho e casas visíveis).
+
+        Refeito ao redimensionar ou rolar o tabuleiro; o degradê só muda com o tamanho.
+        """
+        tamanho = (self.largura_tela, self.altura_tela)
+        if self.camada_degrade is None or self.camada_degrade.get_size() != tamanho:
+            self.camada_degrade = pygame.Surface(tamanho)
+            self.camada_degrade.fill(self.C_FUNDO)
+            w_painel = 380
+            for i in range(w_painel):
+                alpha = i / w_painel
+                cor = (
+                    int(self.C_PAINEL[0] * (1 - alpha) + self.C_FUNDO[0] * alpha),
+                    int(self.C_PAINEL[1] * (1 - alpha) + self.C_FUNDO[1] * alpha),
+                    int(self.C_PAINEL[2] * (1 - alpha) + self.C_FUNDO[2] * alpha)
+                )
+                pygame.draw.line(self.camada_degrade, cor, (i, 0), (i, self.altura_tela))
+            self.camada_fundo = pygame.Surface(tamanho)
+        
+        self.camada_fundo.blit(self.camada_degrade, (0, 0))
+        self._desenhar_tabuleiro(self.camada_fundo)
+        self.rects_peoes = []
+        self.quadro_completo = True
+
+    def _desenhar_tabuleiro(self, superficie):
+        """Desenha só as casas visíveis (``rects_casas``), recortadas à área do tabuleiro"""
+        if not self.rects_casas:
+            return
+        superficie.set_clip(self.area_tabuleiro)
+        visiveis = sorted(self.rects_casas)
+        # O caminho inclui as vizinhas fora da vista, para a linha seguir até a borda
+        dx, dy = self.area_casas.left, self.area_casas.top - self.camera_y
+        ids = range(max(0, visiveis[0] - 1), min(self.motor.meta, visiveis[-1] + 2))
+        if len(ids) > 1:
+            pontos = [self.indice_casas.rects[i].move(dx, dy).center for i in ids]
+            pygame.draw.lines(superficie, (80, 80, 100), False, pontos, 8)
+        
+        tipos = self.motor.tipos_casas
+        meta = self.motor.meta
+        for idx in visiveis:
+            rect = self.rects_casas[idx]
             cor = self.C_CASA_PADRAO
             borda = self.C_BORDA
             largura_borda = 2
             
             shadow_rect = pygame.Rect(rect.x + 2, rect.y + 2, rect.width, rect.height)
-            pygame.draw.rect(self.tela, (10, 10, 10), shadow_rect, border_radius=8)
+            pygame.draw.rect(superficie, (10, 10, 10), shadow_rect, border_radius=8)
             
-            if idx in self.casas_especiais:
-                tipo = self.casas_especiais[idx][0]
-                cor = self.C_CASA_SORTE if tipo == "SORTE" else self.C_CASA_AZAR
-            if idx == self.meta - 1:
+            if tipos[idx]:
+                cor = self.C_CASA_SORTE if tipos[idx] > 0 else self.C_CASA_AZAR
+            if idx == meta - 1:
                 cor = self.C_DESTAQUE
                 borda = (255, 255, 200)
                 largura_borda = 4
                 
-            pygame.draw.rect(self.tela, cor, rect, border_radius=8)
-            pygame.draw.rect(self.tela, borda, rect, largura_borda, border_radius=8)
+            pygame.draw.rect(superficie, cor, rect, border_radius=8)
+            pygame.draw.rect(superficie, borda, rect, largura_borda, border_radius=8)
             
-            txt = self.fonte_pequena.render(str(idx + 1), True, (50, 50, 50))
-            self.tela.blit(txt, (rect.x + 5, rect.y + 5))
+            txt = self.cache_texto.render(self.fonte_pequena, str(idx + 1), True, (50, 50, 50))
+            superficie.blit(txt, (rect.x + 5, rect.y + 5))
             
-            if idx in self.casas_especiais:
-                label = self.casas_especiais[idx][2].split('!')[0]
-                txt_evt = self.fonte_mini.render(label, True, (0, 0, 0))
-                self.tela.blit(txt_evt, (rect.centerx - txt_evt.get_width()//2, rect.centery))
+            if tipos[idx]:
+                label = self.motor.casas_especiais[idx][2].split('!')[0]
+                txt_evt = self.cache_texto.render(self.fonte_mini, label, True, (0, 0, 0))
+                superficie.blit(txt_evt, (rect.centerx - txt_evt.get_width()//2, rect.centery))
                 
-            if idx == self.meta - 1:
-                txt_meta = self.fonte_grande.render("META", True, (0,0,0))
-                self.tela.blit(txt_meta, (rect.centerx - txt_meta.get_width()//2, rect.centery - 10))
+            if idx == meta - 1:
+                fonte_meta = self.fonte_grande if rect.width >= 90 else self.fonte_pequena
+                txt_meta = self.cache_texto.render(fonte_meta, "META", True, (0,0,0))
+                superficie.blit(txt_meta, (rect.centerx - txt_meta.get_width()//2, rect.centery - 10))
+        superficie.set_clip(None)
 
     def _desenhar_peoes(self):
-        for pid, dados in self.jogadores.items():
-            pos_idx = min(dados['pos'], len(self.rects_casas) - 1)
-            rect = self.rects_casas[pos_idx]['rect']
-            cx, cy = rect.center
-            cx += -12 if pid == 1 else 12
-            cy += 8
+        """Desenha os peões e retorna os retângulos ocupados"""
+        # Cada jogador tem um lugar fixo numa grade dentro da casa
+        n = self.motor.num_jogadores
+        cols = math.ceil(math.sqrt(n))
+        linhas = math.ceil(n / cols)
+        largura_casa, altura_casa = self.tamanho_casa
+        passo = min(24, (largura_casa - 10) / cols, (altura_casa - 26) / linhas)
+        raio = max(3, int(passo / 2))
+        rects = []
+        self.tela.set_clip(self.area_tabuleiro)
+        for pid, jogador in self.motor.jogadores.items():
+            # Peões em casas fora da vista não são desenhados
+            rect = self.rects_casas.get(min(jogador.pos, self.motor.meta - 1))
+            if rect is None:
+                continue
+            lin, col = divmod(pid - 1, cols)
+            cx = round(rect.centerx + (col - (cols - 1) / 2) * passo)
+            cy = round(rect.centery + 8 + (lin - (linhas - 1) / 2) * passo)
             
-            pygame.draw.circle(self.tela, (0,0,0), (cx+2, cy+2), 14)
-            pygame.draw.circle(self.tela, dados['cor'], (cx, cy), 12)
-            pygame.draw.circle(self.tela, (255,255,255), (cx, cy), 12, 2)
+            pygame.draw.circle(self.tela, (0,0,0), (cx+2, cy+2), raio + 2)
+            pygame.draw.circle(self.tela, self.cores_jogadores[pid], (cx, cy), raio)
+            pygame.draw.circle(self.tela, (255,255,255), (cx, cy), raio, 2)
             
-            if pid == self.turno_atual and not self.vencedor and self.estado == "jogando":
-                pygame.draw.circle(self.tela, self.C_DESTAQUE, (cx, cy), 16, 3)
+            if pid == self.motor.turno_atual and not self.motor.vencedor and self.estado == "jogando":
+                pygame.draw.circle(self.tela, self.C_DESTAQUE, (cx, cy), raio + 4, 3)
+            rects.append(pygame.Rect(cx - raio - 4, cy - raio - 4, 2 * raio + 11, 2 * raio + 11).clip(self.area_tabuleiro))
+        self.tela.set_clip(None)
+        return rects
 
     def _desenhar_botao(self, rect, texto, cor_normal, cor_hover, fonte):
+        self.rects_hover.append(rect)
         mouse = pygame.mouse.get_pos()
         cor = cor_hover if rect.collidepoint(mouse) else cor_normal
         
@@ -358,7 +553,7 @@ class CorridaEstatistica:
         pygame.draw.rect(self.tela, cor, rect, border_radius=8)
         pygame.draw.rect(self.tela, (240, 240, 240), rect, 2, border_radius=8)
         
-        txt = fonte.render(texto, True, (255, 255, 255))
+        txt = self.cache_texto.render(fonte, texto, True, (255, 255, 255))
         self.tela.blit(txt, (rect.centerx - txt.get_width()//2, rect.centery - txt.get_height()//2))
         
         return rect.collidepoint(mouse) and pygame.mouse.get_pressed()[0]
@@ -367,8 +562,8 @@ class CorridaEstatistica:
         self.tela.fill(self.C_FUNDO)
         
         # Título - CENTRALIZADO DINAMICAMENTE
-        titulo = self.fonte_grande.render("CORRIDA ESTATÍSTICA", True, self.C_DESTAQUE)
-        subtitulo = self.fonte_media.render("Análise de Probabilidade em Tempo Real", True, self.C_TEXTO)
+        titulo = self.cache_texto.render(self.fonte_grande, "CORRIDA ESTATÍSTICA", True, self.C_DESTAQUE)
+        subtitulo = self.cache_texto.render(self.fonte_media, "Análise de Probabilidade em Tempo Real", True, self.C_TEXTO)
         
         # Centralizar verticalmente
         titulo_y = self.altura_tela * 0.2
@@ -387,14 +582,13 @@ class CorridaEstatistica:
         btn_iniciar = pygame.Rect(btn_x, btn_iniciar_y, btn_largura, btn_altura)
         if self._desenhar_botao(btn_iniciar, "INICIAR JOGO", self.C_BOTAO, self.C_BOTAO_HOVER, self.fonte_media):
             self.estado = "selecao_poder"
-            self.jogador_selecionando_poder = 1
+            self.motor.jogador_selecionando_poder = 1
             pygame.time.delay(300)
         
         # Botão Sair
         btn_sair = pygame.Rect(btn_x, btn_sair_y, btn_largura, btn_altura)
         if self._desenhar_botao(btn_sair, "SAIR", (160, 60, 60), (180, 80, 80), self.fonte_media):
-            pygame.quit()
-            sys.exit()
+            self.encerrar()
         
         # Instruções - CENTRALIZADAS DINAMICAMENTE
         instrucoes = [
@@ -408,7 +602,7 @@ class CorridaEstatistica:
         
         instrucoes_y = btn_sair_y + 100
         for i, texto in enumerate(instrucoes):
-            linha = self.fonte_pequena.render(texto, True, self.C_TEXTO)
+            linha = self.cache_texto.render(self.fonte_pequena, texto, True, self.C_TEXTO)
             self.tela.blit(linha, (self.largura_tela//2 - linha.get_width()//2, instrucoes_y + i * 30))
 
     def _desenhar_selecao_poder(self):
@@ -416,14 +610,15 @@ class CorridaEstatistica:
         
         # Título - CENTRALIZADO DINAMICAMENTE
         titulo_y = self.altura_tela * 0.08
-        titulo = self.fonte_grande.render(f"{self.jogadores[self.jogador_selecionando_poder]['nome']} - Escolha seu Poder", 
-                                         True, self.jogadores[self.jogador_selecionando_poder]['cor'])
+        titulo = self.cache_texto.render(self.fonte_grande, f"{self.motor.jogadores[self.motor.jogador_selecionando_poder].nome} - Escolha seu Poder", 
+                                         True, self.cores_jogadores[self.motor.jogador_selecionando_poder])
         self.tela.blit(titulo, (self.largura_tela//2 - titulo.get_width()//2, titulo_y))
         
         # Instrução - CENTRALIZADA DINAMICAMENTE
         instrucao_y = titulo_y + 50
-        instrucao = self.fonte_media.render("Cada jogador pode usar seu poder UMA VEZ durante o jogo", 
-                                           True, self.C_DESTAQUE)
+        pensando = self.tarefa_ia is not None
+        texto = "Computador pensando..." if pensando else "Cada jogador pode usar seu poder UMA VEZ durante o jogo"
+        instrucao = self.cache_texto.render(self.fonte_media, texto, True, self.C_DESTAQUE)
         self.tela.blit(instrucao, (self.largura_tela//2 - instrucao.get_width()//2, instrucao_y))
         
         # Desenhar opções de poderes - CENTRALIZADAS DINAMICAMENTE
@@ -434,7 +629,7 @@ class CorridaEstatistica:
         start_x = (self.largura_tela - total_largura) // 2
         start_y = self.altura_tela * 0.3  # Posição vertical centralizada
         
-        for i, poder in enumerate(self.poderes_disponiveis):
+        for i, poder in enumerate(self.motor.poderes_disponiveis):
             linha = i // 2
             coluna = i % 2
             
@@ -452,40 +647,30 @@ class CorridaEstatistica:
             pygame.draw.rect(self.tela, (240, 240, 240), rect, 2, border_radius=12)
             
             # Nome do poder
-            nome_texto = self.fonte_media.render(poder['nome'], True, (255, 255, 255))
+            nome_texto = self.cache_texto.render(self.fonte_media, poder['nome'], True, (255, 255, 255))
             self.tela.blit(nome_texto, (rect.centerx - nome_texto.get_width()//2, y + 15))
             
             # Descrição
-            desc_texto = self.fonte_pequena.render(poder['descricao'], True, (240, 240, 240))
+            desc_texto = self.cache_texto.render(self.fonte_pequena, poder['descricao'], True, (240, 240, 240))
             self.tela.blit(desc_texto, (rect.centerx - desc_texto.get_width()//2, y + 55))
             
             # Verificar clique
             mouse_pos = pygame.mouse.get_pos()
-            if rect.collidepoint(mouse_pos) and pygame.mouse.get_pressed()[0]:
-                self.selecionar_poder(self.jogador_selecionando_poder, i)
+            if not pensando and rect.collidepoint(mouse_pos) and pygame.mouse.get_pressed()[0]:
+                self.selecionar_poder(self.motor.jogador_selecionando_poder, i)
                 pygame.time.delay(300)
 
     def _desenhar_painel_esquerdo(self):
-        w_painel = 380
-        for i in range(w_painel):
-            alpha = i / w_painel
-            cor = (
-                int(self.C_PAINEL[0] * (1 - alpha) + self.C_FUNDO[0] * alpha),
-                int(self.C_PAINEL[1] * (1 - alpha) + self.C_FUNDO[1] * alpha),
-                int(self.C_PAINEL[2] * (1 - alpha) + self.C_FUNDO[2] * alpha)
-            )
-            pygame.draw.line(self.tela, cor, (i, 0), (i, self.altura_tela))
-        
         y_cursor = 15
         
-        titulo = self.fonte_grande.render("ANÁLISE ESTATÍSTICA", True, self.C_DESTAQUE)
+        titulo = self.cache_texto.render(self.fonte_grande, "ANÁLISE ESTATÍSTICA", True, self.C_DESTAQUE)
         self.tela.blit(titulo, (20, y_cursor))
         y_cursor += 50
         
         btn_jogar = pygame.Rect(20, y_cursor, 160, 45)
         if self._desenhar_botao(btn_jogar, "JOGAR (Espaço)", 
                                self.C_BOTAO, self.C_BOTAO_HOVER, self.fonte_media):
-            if not self.vencedor and self.estado == "jogando":
+            if not self.motor.vencedor and self.estado == "jogando" and not self._vez_do_computador():
                 pygame.time.wait(150)
                 self.jogar_dados()
 
@@ -494,66 +679,112 @@ class CorridaEstatistica:
                                (160, 60, 60), (180, 80, 80), self.fonte_media):
             self.reiniciar()
 
+        btn_turbo = pygame.Rect(360, y_cursor, 110, 45)
+        cor_turbo = (200, 140, 40) if self.turbo else (110, 90, 50)
+        if self._desenhar_botao(btn_turbo, "TURBO (T)", cor_turbo, (220, 160, 60), self.fonte_pequena):
+            self.alternar_turbo()
+
         y_cursor += 60
         
-        if self.estado == "jogando" and not self.vencedor:
-            nome = self.jogadores[self.turno_atual]['nome']
-            cor = self.jogadores[self.turno_atual]['cor']
-            txt_vez = self.fonte_media.render(f"Vez de: {nome}", True, cor)
+        if self.estado == "jogando" and not self.motor.vencedor:
+            nome = self.motor.jogadores[self.motor.turno_atual].nome
+            cor = self.cores_jogadores[self.motor.turno_atual]
+            txt_vez = self.cache_texto.render(self.fonte_media, f"Vez de: {nome}", True, cor)
             self.tela.blit(txt_vez, (20, y_cursor))
+            if self.politica_ia is not None:
+                chance = self.politica_ia.prob_vitoria(self.motor, self.jogador_ia)
+                txt_chance = self.cache_texto.render(self.fonte_pequena, f"Computador vence: {chance:.0%}",
+                                                     True, (180, 180, 180))
+                self.tela.blit(txt_chance, (240, y_cursor + 3))
+            elif self.tarefa_ia is not None:
+                txt_chance = self.cache_texto.render(self.fonte_pequena, "Computador pensando...", True, (180, 180, 180))
+                self.tela.blit(txt_chance, (240, y_cursor + 3))
         elif self.estado == "fim":
-            txt_venc = self.fonte_grande.render("JOGO ENCERRADO", True, self.C_DESTAQUE)
+            txt_venc = self.cache_texto.render(self.fonte_grande, "JOGO ENCERRADO", True, self.C_DESTAQUE)
             self.tela.blit(txt_venc, (20, y_cursor))
 
         y_cursor += 40
         if self.timer_dados_visiveis > 0:
-            d1, d2 = self.ultimo_lancamento
+            faces = self.ultimo_lancamento
             soma = self.ultimo_resultado_soma
-            tamanho_dado = 50
-            self._desenhar_dado_pontos(20, y_cursor, tamanho_dado, d1)
-            self._desenhar_dado_pontos(80, y_cursor, tamanho_dado, d2)
-            txt_soma = self.fonte_grande.render(f"= {soma}", True, (255,255,255))
-            self.tela.blit(txt_soma, (140, y_cursor + 10))
+            x = 20
+            quadro = QUADROS_DADOS_VISIVEIS - self.timer_dados_visiveis
+            rolando = False
+            if len(faces) <= MAX_DADOS_DESENHADOS:
+                # Até 4 dados no tamanho normal; mais que isso, encolhem para caber em ~300 px
+                tamanho_dado = 50 if len(faces) <= 4 else 300 // len(faces) - 6
+                y_dado = y_cursor + (50 - tamanho_dado) // 2
+                fonte = self.fonte_pequena if tamanho_dado < 40 else self.fonte_media
+                rolando = quadro < QUADROS_ROLAGEM_DADOS
+                for i, face in enumerate(faces):
+                    if rolando:
+                        # Quadros desencontrados entre os dados, para não girarem em sincronia
+                        self.atlas_dados.desenhar_rolagem(self.tela, x, y_dado, tamanho_dado, quadro // 2 + 3 * i)
+                    else:
+                        self.atlas_dados.desenhar(self.tela, x, y_dado, tamanho_dado, face, fonte)
+                    x += tamanho_dado + 10
+            # A soma só aparece quando os dados param
+            if not rolando:
+                txt_soma = self.cache_texto.render(self.fonte_grande, f"= {soma}", True, (255,255,255))
+                self.tela.blit(txt_soma, (x, y_cursor + 10))
             self.timer_dados_visiveis -= 1
 
         y_cursor += 60
         
-        if self.estado == "jogando" and not self.vencedor:
-            jogador = self.jogadores[self.turno_atual]
-            if jogador['poder'] and not jogador['poder_usado']:
+        if self.estado == "jogando" and not self.motor.vencedor and not self._vez_do_computador():
+            jogador = self.motor.jogadores[self.motor.turno_atual]
+            if jogador.poder and not jogador.poder_usado:
                 btn_poder = pygame.Rect(20, y_cursor, 330, 40)
-                if self._desenhar_botao(btn_poder, f"USAR PODER: {jogador['poder']['nome']}", 
+                if self._desenhar_botao(btn_poder, f"USAR PODER: {jogador.poder['nome']}", 
                                        self.C_PODER, (200, 120, 240), self.fonte_pequena):
-                    self.usar_poder(self.turno_atual)
+                    self.usar_poder(self.motor.turno_atual)
                 y_cursor += 50
 
         y_cursor += 20
         pygame.draw.line(self.tela, (100,100,100), (20, y_cursor), (360, y_cursor), 1)
         y_cursor += 10
         
-        col_x = [20, 100, 180, 260]
-        titulos = ["", "Média", "Mediana", "Moda"]
+        col_x = [20, 90, 160, 230, 285, 345]
+        titulos = [f"{self.motor.config_dados.rotulo} (D)", "Média", "Mediana", "Moda", "DP", "p (χ²)"]
         for i, t in enumerate(titulos):
-            surf = self.fonte_pequena.render(t, True, (180,180,180))
+            surf = self.cache_texto.render(self.fonte_mini if i == 0 else self.fonte_pequena, t, True, (180,180,180))
             self.tela.blit(surf, (col_x[i], y_cursor))
         
         y_cursor += 25
-        for pid in [1, 2]:
-            media, mediana, moda = self._calcular_stats_texto(pid)
-            cor = self.jogadores[pid]['cor']
-            t_nome = self.fonte_pequena.render(f"Jog {pid}", True, cor)
+        # Com muitos jogadores as linhas ficam compactas e o poder vira só uma marca colorida
+        compacto = self.motor.num_jogadores > 4
+        ids = list(self.motor.jogadores)
+        for pid in ids[:MAX_LINHAS_JOGADORES]:
+            jogador = self.motor.jogadores[pid]
+            valores = self._calcular_stats_texto(pid)
+            p_valor, cor_p, detalhe = self._texto_aderencia(pid)
+            cor = self.cores_jogadores[pid]
+            t_nome = self.cache_texto.render(self.fonte_pequena, f"Jog {pid}", True, cor)
             self.tela.blit(t_nome, (col_x[0], y_cursor))
-            for i, val in enumerate([media, mediana, moda]):
-                t_val = self.fonte_pequena.render(val, True, (255,255,255))
+            for i, val in enumerate(valores):
+                t_val = self.cache_texto.render(self.fonte_pequena, val, True, (255,255,255))
                 self.tela.blit(t_val, (col_x[i+1], y_cursor))
+            t_p = self.cache_texto.render(self.fonte_pequena, p_valor, True, cor_p)
+            self.tela.blit(t_p, (col_x[5], y_cursor))
+            if detalhe and not compacto:
+                t_detalhe = self.cache_texto.render(self.fonte_mini, detalhe, True, (180, 180, 180))
+                self.tela.blit(t_detalhe, (col_x[2], y_cursor + 15))
             
-            if self.jogadores[pid]['poder']:
-                status = "✓" if self.jogadores[pid]['poder_usado'] else "●"
-                cor_status = (150,150,150) if self.jogadores[pid]['poder_usado'] else self.jogadores[pid]['poder']['cor']
-                txt_poder = self.fonte_mini.render(f"{status} {self.jogadores[pid]['poder']['nome']}", True, cor_status)
-                self.tela.blit(txt_poder, (20, y_cursor + 15))
+            if jogador.poder:
+                status = "✓" if jogador.poder_usado else "●"
+                cor_status = (150,150,150) if jogador.poder_usado else jogador.poder['cor']
+                if compacto:
+                    pygame.draw.circle(self.tela, cor_status, (col_x[0] + 62, y_cursor + 9), 4)
+                else:
+                    txt_poder = self.cache_texto.render(self.fonte_mini, f"{status} {jogador.poder['nome']}", True, cor_status)
+                    self.tela.blit(txt_poder, (20, y_cursor + 15))
             
-            y_cursor += 35
+            y_cursor += 20 if compacto else 35
+        if len(ids) > MAX_LINHAS_JOGADORES:
+            resto = self.cache_texto.render(self.fonte_mini, f"+ {len(ids) - MAX_LINHAS_JOGADORES} jogadores (ver gráficos)",
+                                            True, (180, 180, 180))
+            self.tela.blit(resto, (col_x[0], y_cursor))
+            y_cursor += 20
 
         y_cursor += 10
         
@@ -563,9 +794,9 @@ class CorridaEstatistica:
             pygame.draw.rect(self.tela, (255, 255, 100), r_msg, 1, border_radius=5)
             
             if len(self.msg_evento) > 25:
-                t_msg = self.fonte_pequena.render(self.msg_evento, True, (255, 255, 100))
+                t_msg = self.cache_texto.render(self.fonte_pequena, self.msg_evento, True, (255, 255, 100))
             else:
-                t_msg = self.fonte_media.render(self.msg_evento, True, (255, 255, 100))
+                t_msg = self.cache_texto.render(self.fonte_media, self.msg_evento, True, (255, 255, 100))
                 
             text_rect = t_msg.get_rect(center=r_msg.center)
             self.tela.blit(t_msg, text_rect)
@@ -575,161 +806,419 @@ class CorridaEstatistica:
 
         y_grafico = y_cursor + 20
         altura_disp = self.altura_tela - y_grafico - 10
-        if self.dados_para_grafico_atualizados or self.img_grafico_cache is None:
-            self._gerar_grafico_matplotlib(3.8, altura_disp / 80)
+        if self.dados_para_grafico_atualizados or (self.img_grafico_cache is None and not self.grafico_pendente):
+            self._gerar_grafico(480, altura_disp)
             self.dados_para_grafico_atualizados = False
+        if self.grafico_pendente:
+            try:
+                nova = self.trabalhador_grafico.coletar()
+            except Exception:
+                nova = None
+                self._abandonar_modo_grafico()
+            if nova is not None:
+                self.img_grafico_cache = nova
+                self.duracao_ultimo_grafico = self.trabalhador_grafico.duracao
+            self.grafico_pendente = self.trabalhador_grafico.pendente
         if self.img_grafico_cache:
             self.tela.blit(self.img_grafico_cache, (10, y_grafico))
 
-    def _gerar_grafico_matplotlib(self, w_inch, h_inch):
-        """Gera gráficos estatísticos precisos em tempo real com eixo X dinâmico"""
-        todos_dados = []
-        for pid in [1, 2]:
-            todos_dados.extend(self.jogadores[pid]['dados'])
-        
-        if len(todos_dados) < 1:
+    def _gerar_grafico(self, largura, altura):
+        """Atualiza img_grafico_cache usando o modo de gráfico selecionado"""
+        if not any(self.motor.estatisticas[pid].n for pid in self.motor.jogadores) or altura < 100:
             return
-            
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(w_inch + 1, h_inch))
-        fig.patch.set_facecolor('#141923')
-        
-        # Gráfico 1: Distribuição de frequência CORRETA com eixo X dinâmico
-        if todos_dados:
-            # Determinar o intervalo dinâmico do eixo X
-            min_valor = min(todos_dados)
-            max_valor = max(todos_dados)
-            
-            # Garantir que o mínimo seja pelo menos 2 e o máximo pelo menos 12
-            min_valor = min(2, min_valor)
-            max_valor = max(12, max_valor)
-            
-            # Expandir um pouco o intervalo para melhor visualização
-            min_valor = max(2, min_valor - 1)
-            max_valor = max_valor + 1
-            
-            valores_possiveis = list(range(min_valor, max_valor))
-            
-            # Plot para cada jogador
-            for pid in [1, 2]:
-                dados_jogador = self.jogadores[pid]['dados']
-                if len(dados_jogador) > 0:
-                    freq_jogador = []
-                    for valor in valores_possiveis:
-                        freq = dados_jogador.count(valor) / len(dados_jogador)
-                        freq_jogador.append(freq)
-                    
-                    cor = np.array(self.jogadores[pid]['cor']) / 255
-                    # Ajustar a posição das barras para dois jogadores
-                    offset = (pid - 1.5) * 0.4
-                    valores_plot = [v + offset for v in valores_possiveis]
-                    ax1.bar(valores_plot, freq_jogador, 
-                           width=0.35, color=cor, alpha=0.7, label=f"J{pid}")
-
-            # Distribuição teórica CORRETA para dois dados (apenas para 2-12)
-            prob_teo = []
-            for valor in valores_possiveis:
-                if 2 <= valor <= 12:
-                    # Cálculo da probabilidade teórica para dois dados
-                    if valor <= 7:
-                        prob = (valor - 1) / 36
-                    else:
-                        prob = (13 - valor) / 36
-                else:
-                    prob = 0
-                prob_teo.append(prob)
-            
-            # Plot da distribuição teórica
-            ax1.plot(valores_possiveis, prob_teo, 'w-', linewidth=2, alpha=0.8, label="Teórico")
-            ax1.fill_between(valores_possiveis, prob_teo, alpha=0.2, color='white')
-            
-            ax1.set_title("Distribuição de Probabilidade", color='white', fontsize=10, pad=10)
-            ax1.set_xlabel('Soma dos Dados', color='white', fontsize=9)
-            ax1.set_ylabel('Frequência Relativa', color='white', fontsize=9)
-            ax1.legend(fontsize=7, facecolor='#232337', loc='upper right')
-            
-            # Configurar ticks do eixo X
-            if max_valor - min_valor <= 20:  # Mostrar todos os valores se não for muito grande
-                ax1.set_xticks(valores_possiveis)
-            else:  # Caso contrário, mostrar a cada 2 valores
-                ax1.set_xticks([x for x in valores_possiveis if x % 2 == 0])
-            
-            ax1.grid(True, alpha=0.3, color='gray')
-            ax1.tick_params(colors='white', labelsize=8)
-            ax1.set_facecolor('#232337')
-
-        # Gráfico 2: Convergência da média CORRETA
-        ax2.clear()
-        for pid in [1, 2]:
-            medias = self.historico_medias[pid]
-            if len(medias) > 0:
-                cor = np.array(self.jogadores[pid]['cor']) / 255
-                ax2.plot(range(1, len(medias)+1), medias, 
-                        color=cor, linewidth=2, label=f"J{pid}")
-        
-        # Linha da média teórica
-        ax2.axhline(7, color='white', linestyle='--', linewidth=2, alpha=0.7, 
-                   label="Média Teórica = 7.0")
-        
-        ax2.set_title("Lei dos Grandes Números", color='white', fontsize=10, pad=10)
-        ax2.set_xlabel('Número de Lançamentos', color='white', fontsize=9)
-        ax2.set_ylabel('Média Acumulada', color='white', fontsize=9)
-        ax2.legend(fontsize=7, facecolor='#232337')
-        ax2.grid(True, alpha=0.3, color='gray')
-        
-        ax2.tick_params(colors='white', labelsize=8)
-        ax2.set_facecolor('#232337')
-
-        # Estilização consistente
-        for ax in [ax1, ax2]:
-            for spine in ax.spines.values():
-                spine.set_color('white')
-            
-        plt.tight_layout(pad=2.0)
+        import graficos
+        if self.modo_grafico not in self.renderizadores_grafico:
+            classe = {"persistente": graficos.GraficoMatplotlib, "png": graficos.GraficoPng,
+                      "pygame": graficos.GraficoPygame}[self.modo_grafico]
+            self.renderizadores_grafico[self.modo_grafico] = classe(self.cache_texto)
+        dados = graficos.dados_grafico(self.motor, self.cores_jogadores)
+        renderizador = self.renderizadores_grafico[self.modo_grafico]
+        if self.modo_grafico == "pygame":
+            # Barato o bastante para o próprio quadro
+            self.img_grafico_cache = renderizador.renderizar(dados, (largura, int(altura)))
+            return
+
+        # Modos matplotlib (persistente e png): em segundo plano, fora do quadro
+        if self.trabalhador_grafico is None:
+            self.trabalhador_grafico = graficos.TrabalhadorGrafico(renderizador, self.EVENTO_GRAFICO_PRONTO)
+        self.trabalhador_grafico.pedir(dados, (largura, int(altura)), renderizador)
+        self.grafico_pendente = True
+
+    def _descartar_grafico_pendente(self):
+        if self.trabalhador_grafico is not None:
+            self.trabalhador_grafico.descartar()
+        self.grafico_pendente = False
+
+    def _abandonar_modo_grafico(self):
+        """O modo atual falhou ao renderizar (na thread): sai do rodízio e cai para o gráfico em pygame"""
+        self.msg_evento = f"Gráfico {self.modo_grafico} falhou; usando pygame"
+        self.timer_evento = 120
+        self.modos_grafico.remove(self.modo_grafico)
+        self.renderizadores_grafico.pop(self.modo_grafico, None)
+        self.modo_grafico = "pygame"
+        self.dados_para_grafico_atualizados = True
+
+    def alternar_modo_grafico(self):
+        modos = self.modos_grafico
+        self.modo_grafico = modos[(modos.index(self.modo_grafico) + 1) % len(modos)]
+        self._descartar_grafico_pendente()
+        self.dados_para_grafico_atualizados = True
+
+    # Método -> seção do HUD de desempenho
+    SECOES_PERFIL = {
+        "_processar_eventos": "eventos",
+        "_restaurar_fundo": "fundo",
+        "_desenhar_tabuleiro": "tabuleiro",
+        "_desenhar_painel_esquerdo": "painel",
+        "_desenhar_peoes": "peões",
+        "_gerar_grafico": "gráfico",
+        "atualizar_tela": "display",
+    }
+
+    def alternar_perfil(self):
+        """Liga/desliga o HUD envolvendo os métodos medidos na própria instância.
+
+        Desligado, os atributos da instância são removidos e as chamadas voltam
+        direto aos métodos da classe, sem custo de medição.
+        """
+        perfil = self.perfil
+        if perfil.ativo:
+            for metodo in list(self.SECOES_PERFIL) + ["desenhar_quadro"]:
+                self.__dict__.pop(metodo, None)
+            perfil.ativo = False
+            self.rect_perfil = None
+        else:
+            perfil.limpar()
+            for metodo, secao in self.SECOES_PERFIL.items():
+                setattr(self, metodo, perfil.envolver(secao, getattr(self, metodo)))
+            atualizar_tela = self.atualizar_tela
+
+            def atualizar_e_fechar_quadro(rects):
+                atualizar_tela(rects)
+                perfil.fim_quadro()
+            self.atualizar_tela = atualizar_e_fechar_quadro
+            self.desenhar_quadro = self._desenhar_quadro_com_perfil
+            perfil.ativo = True
+        self.quadro_completo = True
+
+    def _desenhar_quadro_com_perfil(self):
+        rects = type(self).desenhar_quadro(self)
+        # O HUD é translúcido: limpa o anterior antes de desenhar o novo
+        if self.rect_perfil is not None and self.estado not in ("menu", "selecao_poder"):
+            self.tela.blit(self.camada_fundo, self.rect_perfil, self.rect_perfil)
+        extras = [f"texto em cache {self.cache_texto.taxa_acerto:.0%}", f"gráfico: {self.modo_grafico}"]
+        if self.modo_grafico != "pygame":
+            # Nos modos matplotlib, a seção "gráfico" só mede o pedido; o desenho roda na thread
+            duracao = self.duracao_ultimo_grafico
+            extras.append(f"  render na thread {duracao * 1000:.1f} ms" if duracao else "  render na thread -")
+        rect = self.perfil.desenhar(self.tela, self.fonte_mini, extras)
+        if rects is not None:
+            rects.append(rect.union(self.rect_perfil) if self.rect_perfil else rect)
+        self.rect_perfil = rect
+        return rects
+
+    def desenhar_quadro(self):
+        """Desenha o estado atual na tela (sem flip).
         
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png', facecolor='#141923', dpi=100, 
-                   bbox_inches='tight', pad_inches=0.1)
-        buf.seek(0)
-        plt.close(fig)
+        Retorna os retângulos alterados, ou None quando a tela inteira mudou.
+        """
+        self.rects_hover = []
+        if self.estado in ("menu", "selecao_poder"):
+            self.tela.fill(self.C_FUNDO)
+            if self.estado == "menu":
+                self._desenhar_menu()
+            else:
+                self._desenhar_selecao_poder()
+            self.quadro_completo = True
+            return None
+        
+        # Em jogo: restaura do fundo em cache só o painel e os peões do quadro anterior
+        completo = self.quadro_completo
+        self._restaurar_fundo(completo)
         
-        self.img_grafico_cache = pygame.image.load(buf)
-        buf.close()
+        self._desenhar_painel_esquerdo()
+        if self.turbo:
+            self._desenhar_estatisticas_turbo()
+            self.rects_peoes = []
+            self.quadro_completo = False
+            return None if completo else [self.area_painel, self.area_tabuleiro]
+        rects_anteriores = self.rects_peoes
+        self.rects_peoes = self._desenhar_peoes()
+        self.quadro_completo = False
+        if completo:
+            return None
+        return [self.area_painel] + rects_anteriores + self.rects_peoes
+
+    def _desenhar_estatisticas_turbo(self):
+        """No lugar do tabuleiro: totais do modo turbo e frequências observadas x teóricas"""
+        area = self.area_tabuleiro
+        self.tela.fill(self.C_FUNDO, area)
+        x, y = area.left + 20, 20
+        lances = self.motor.lances_avulsos - self.turbo_inicio_lances
+        decorrido = max(time.perf_counter() - self.turbo_inicio, 1e-9)
+        linhas = [
+            (self.fonte_grande, "MODO TURBO", self.C_DESTAQUE),
+            (self.fonte_media, f"{self.motor.lances_avulsos:,} lançamentos avulsos".replace(",", "."), self.C_TEXTO),
+            (self.fonte_pequena, f"{lances / decorrido:,.0f} lançamentos/s  (T volta ao tabuleiro)".replace(",", "."),
+             (180, 180, 180)),
+        ]
+        # Números mudam a cada quadro: renderizados direto, sem passar pelo cache de texto
+        for fonte, texto, cor in linhas:
+            superficie = fonte.render(texto, True, cor)
+            self.tela.blit(superficie, (x, y))
+            y += superficie.get_height() + 8
+        y += 10
+
+        config = self.motor.config_dados
+        for pid in list(self.motor.jogadores)[:MAX_LINHAS_JOGADORES]:
+            stats = self.motor.estatisticas[pid]
+            teste = stats.aderencia
+            texto = (f"Jog {pid}: n = {stats.n:,}   média = {stats.media:.4f}   "
+                     f"|média - {config.media:g}| = {abs(stats.media - config.media):.4f}   "
+                     f"χ² = {teste.qui_quadrado:.1f} ({teste.graus_liberdade} gl)   p = {teste.p_valor:.3f}")
+            superficie = self.fonte_pequena.render(texto.replace(",", "."), True, self.cores_jogadores[pid])
+            self.tela.blit(superficie, (x, y))
+            y += 26
+        y += 10
+
+        # Tabela de frequências: soma, teórico e cada jogador (ou todos juntos), com barras
+        if self.motor.num_jogadores <= 4:
+            colunas = [(f"Jog {pid}", [self.motor.estatisticas[pid]]) for pid in self.motor.jogadores]
+        else:
+            colunas = [("Todos", list(self.motor.estatisticas.values()))]
+        cabecalho = ["Soma", "Teórico"] + [rotulo for rotulo, _ in colunas]
+        col_w = 90
+        for i, t in enumerate(cabecalho):
+            self.tela.blit(self.cache_texto.render(self.fonte_pequena, t, True, (180, 180, 180)), (x + i * col_w, y))
+        y += 24
+        # Somas possíveis dos dados em uso; se não couberem todas, as mais prováveis (em torno da média)
+        pmf = config.pmf
+        somas = range(config.soma_minima, config.soma_maxima + 1)
+        cabem = max(1, (area.bottom - y - 20) // 14)
+        if len(somas) > cabem:
+            inicio = min(max(config.soma_minima, round(config.media) - cabem // 2), config.soma_maxima + 1 - cabem)
+            somas = range(inicio, inicio + cabem)
+        linha_h = max(14, min(26, (area.bottom - y - 20) // len(somas)))
+        maior = max(pmf)
+        for soma in somas:
+            teorico = pmf[soma]
+            valores = [str(soma), f"{teorico:.2%}"]
+            for _, grupo in colunas:
+                n = sum(stats.n for stats in grupo)
+                valores.append(f"{sum(stats.contagens[soma] for stats in grupo) / n:.2%}" if n else "-")
+            for i, v in enumerate(valores):
+                self.tela.blit(self.fonte_mini.render(v, True, self.C_TEXTO), (x + i * col_w, y))
+            largura_barra = int(teorico / maior * (area.right - x - len(valores) * col_w - 20))
+            pygame.draw.rect(self.tela, (90, 90, 110), (x + len(valores) * col_w, y + 2, largura_barra, linha_h - 6))
+            y += linha_h
+
+    def _restaurar_fundo(self, completo):
+        if completo:
+            self.tela.blit(self.camada_fundo, (0, 0))
+        else:
+            self.tela.blit(self.camada_fundo, self.area_painel, self.area_painel)
+            for r in self.rects_peoes:
+                self.tela.blit(self.camada_fundo, r, r)
+
+    def atualizar_tela(self, rects):
+        """Envia ao display apenas os retângulos alterados (ou tudo, se None)"""
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    def _animando(self):
+        """Há algo mudando na tela sem depender de entrada do usuário?"""
+        return (self.turbo or self.timer_evento > 0 or self.timer_dados_visiveis > 0
+                or self.dados_para_grafico_atualizados or self._vez_do_computador())
+
+    def _hover_mudou(self, pos):
+        hover = tuple(i for i, r in enumerate(self.rects_hover) if r.collidepoint(pos))
+        if hover == self.hover_atual:
+            return False
+        self.hover_atual = hover
+        return True
+
+    # Rolagem do tabuleiro: fração da altura da vista por tecla (±inf = extremos)
+    TECLAS_ROLAGEM = {pygame.K_UP: -0.25, pygame.K_DOWN: 0.25, pygame.K_PAGEUP: -0.9, pygame.K_PAGEDOWN: 0.9,
+                      pygame.K_HOME: math.inf, pygame.K_END: -math.inf}
+
+    def _rolar_por_tecla(self, tecla):
+        # Home vai à largada (embaixo) e End à meta (em cima)
+        fracao = self.TECLAS_ROLAGEM[tecla]
+        if math.isinf(fracao):
+            self.mover_camera(self.altura_mundo if fracao > 0 else 0)
+        else:
+            self.mover_camera(self.camera_y + fracao * self.area_casas.height)
+
+    def _processar_eventos(self, eventos, redesenhar):
+        """Trata os eventos do quadro; retorna (rodando, redesenhar)"""
+        rodando = True
+        for event in eventos:
+            # Movimento do mouse só redesenha se mudar o botão sob o cursor
+            if event.type == pygame.MOUSEMOTION:
+                redesenhar |= self._hover_mudou(event.pos)
+                continue
+            redesenhar = True
+            if event.type == pygame.QUIT: 
+                rodando = False
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE and self.estado == "jogando" and not self._vez_do_computador():
+                    self.jogar_dados()
+                if event.key == pygame.K_r: 
+                    self.reiniciar()
+                if event.key == pygame.K_g:
+                    self.alternar_modo_grafico()
+                if event.key == pygame.K_t:
+                    self.alternar_turbo()
+                if event.key == pygame.K_d and self.estado in ("jogando", "fim"):
+                    self.trocar_dados()
+                if event.key == pygame.K_F3:
+                    self.alternar_perfil()
+                if event.key in self.TECLAS_ROLAGEM:
+                    self._rolar_por_tecla(event.key)
+                if event.key == pygame.K_f:
+                    self.mover_camera(seguir=True)
+                if event.key == pygame.K_ESCAPE: 
+                    rodando = False
+            if event.type == pygame.MOUSEWHEEL:
+                self.mover_camera(self.camera_y - event.y * self.altura_celula / 2)
+            # Capturar redimensionamento de tela
+            if event.type == pygame.VIDEORESIZE:
+                self.largura_tela, self.altura_tela = event.size
+                self.tela = pygame.display.set_mode((self.largura_tela, self.altura_tela), pygame.RESIZABLE)
+                self.cache_texto.limpar()
+                self._gerar_layout_tabuleiro()
+                self._gerar_camadas_estaticas()
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.quadro_completo = True
+        return rodando, redesenhar
 
     def rodar(self):
         clock = pygame.time.Clock()
         rodando = True
+        redesenhar = True
         while rodando:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: 
-                    rodando = False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE and self.estado == "jogando": 
-                        self.jogar_dados()
-                    if event.key == pygame.K_r: 
-                        self.reiniciar()
-                    if event.key == pygame.K_ESCAPE: 
-                        rodando = False
-                # Capturar redimensionamento de tela
-                if event.type == pygame.VIDEORESIZE:
-                    self.largura_tela, self.altura_tela = event.size
-                    self.tela = pygame.display.set_mode((self.largura_tela, self.altura_tela), pygame.RESIZABLE)
-                    self._gerar_layout_tabuleiro()
-
-            self.tela.fill(self.C_FUNDO)
-            
-            if self.estado == "menu":
-                self._desenhar_menu()
-            elif self.estado == "selecao_poder":
-                self._desenhar_selecao_poder()
+            animando = self._animando()
+            if redesenhar or animando:
+                eventos = pygame.event.get()
             else:
-                self._desenhar_painel_esquerdo()
-                self._desenhar_tabuleiro()
-                self._desenhar_peoes()
-            
-            pygame.display.flip()
-            clock.tick(60)
+                # Nada mudando: bloqueia na fila de eventos em vez de girar a 60 FPS
+                eventos = [pygame.event.wait()] + pygame.event.get()
+
+            rodando, redesenhar = self._processar_eventos(eventos, redesenhar)
+            if not rodando:
+                break
+            # A thread do computador posta EVENTO_IA_PRONTA ao terminar, o que já acorda o laço
+            if self.tarefa_ia is not None:
+                redesenhar |= self._coletar_computador()
+            if redesenhar or animando:
+                if self.turbo:
+                    self._passo_turbo()
+                elif self._vez_do_computador():
+                    self._passo_ia()
+                self.atualizar_tela(self.desenhar_quadro())
+                clock.tick(60)
+            # Um quadro extra depois da animação para apagar o que os timers mostravam
+            redesenhar = animando
+        self.encerrar()
+
+    def encerrar(self):
+        if self.gravador is not None:
+            self.gravador.descarregar()
+        if self.exportador is not None:
+            self.exportador.fechar()
         pygame.quit()
         sys.exit()
 
+    def reproduzir(self, palavras, limites, passos_por_quadro=1):
+        """Reproduz partidas de um log binário o mais rápido possível, desenhando cada passo"""
+        from registro import reproduzir
+        
+        passos = [0]
+        def ao_passo(motor):
+            passos[0] += 1
+            if passos[0] % passos_por_quadro:
+                return
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    self.encerrar()
+            self.msg_evento = motor.msg_evento
+            self.timer_evento = 1
+            self.dados_para_grafico_atualizados = True
+            # Na reprodução, a câmera acompanha quem está na frente
+            self.jogador_seguido = max(motor.jogadores, key=lambda jid: motor.jogadores[jid].pos)
+            self._enquadrar_jogador()
+            self.atualizar_tela(self.desenhar_quadro())
+        
+        self.estado = "jogando"
+        for inicio, fim in limites:
+            self._descartar_grafico_pendente()
+            reproduzir(palavras, self.motor, inicio, fim, ao_passo)
+        self.estado = "fim" if self.motor.vencedor else "jogando"
+        self.msg_evento = self.motor.msg_evento
+        self.timer_evento = 120
+        self.dados_para_grafico_atualizados = True
+        self.rodar()
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Corrida Estatística (subcomandos: torneio, replay, servidor, exportacao)")
+    parser.add_argument("--semente", type=int, default=None, help="semente da primeira partida")
+    parser.add_argument("--registro", default=None, help="anexa o log binário das partidas a este arquivo")
+    parser.add_argument("--exportar", default=None, metavar="RAIZ",
+                        help="exporta lançamentos, posições e poderes em colunas .npy numa sessão nova em RAIZ")
+    parser.add_argument("--modo-grafico", choices=["persistente", "pygame", "png"], default=None)
+    parser.add_argument("--jogadores", type=int, default=2, help="número de jogadores (padrão 2)")
+    parser.add_argument("--tabuleiro", default=None, help="arquivo JSON de tabuleiro (ver tabuleiro.py)")
+    parser.add_argument("--ia", action="store_true", help="o Jogador 2 é o computador (só com 2 jogadores)")
+    parser.add_argument("--dados", default="2d6", help="dados no formato KdF, ex.: 3d6, 5d10 (D troca durante o jogo)")
+    parser.add_argument("--pesos", default=None, help="pesos das faces para dados viciados, ex.: 1,1,1,1,1,3")
+    args = parser.parse_args(argv)
+    try:
+        config_dados = interpretar_dados(args.dados, args.pesos)
+    except ValueError as e:
+        parser.error(str(e))
+    if not 2 <= args.jogadores <= MAX_JOGADORES:
+        parser.error(f"--jogadores deve estar entre 2 e {MAX_JOGADORES}")
+    if args.ia and args.jogadores != 2:
+        parser.error("--ia só vale para partidas de 2 jogadores")
+    
+    gravador = None
+    if args.registro:
+        from registro import GravadorPartidas
+        gravador = GravadorPartidas(args.registro)
+    exportador = None
+    if args.exportar:
+        from exportacao import ExportadorColunar, nova_sessao
+        exportador = ExportadorColunar(nova_sessao(args.exportar))
+    tabuleiro = None
+    if args.tabuleiro:
+        from tabuleiro import ErroTabuleiro, carregar_tabuleiro
+        try:
+            tabuleiro = carregar_tabuleiro(args.tabuleiro)
+        except (OSError, ErroTabuleiro) as e:
+            parser.error(str(e))
+    if args.ia:
+        from ia import MAX_META_IA
+        if tabuleiro and tabuleiro["meta"] > MAX_META_IA:
+            parser.error(f"--ia só vale para tabuleiros de até {MAX_META_IA} casas")
+    CorridaEstatistica(args.modo_grafico, semente=args.semente, gravador=gravador,
+                       num_jogadores=args.jogadores, tabuleiro=tabuleiro, ia=args.ia, config_dados=config_dados,
+                       exportador=exportador).rodar()
+
 if __name__ == "__main__":
-    CorridaEstatistica().rodar()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "torneio":
+        from torneio import main as main_torneio
+        main_torneio(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "replay":
+        from registro import main as main_replay
+        main_replay(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "exportacao":
+        from exportacao import main as main_exportacao
+        main_exportacao(sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == "servidor":
+        from servidor import main as main_servidor
+        main_servidor(sys.argv[2:])
+    else:
+        main()
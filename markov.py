@@ -0,0 +1,88 @@
+"""Solução exata do tabuleiro como cadeia de Markov absorvente.
+
+Sem poderes, cada jogador percorre o tabuleiro de forma independente: o estado
+é a casa atual, o movimento é a soma dos dados e as casas especiais são saltos
+únicos. A última casa (``meta - 1``) é absorvente. Os resultados são cacheados
+pela configuração do tabuleiro.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from dados import DADOS_PADRAO
+from motor import META, CASAS_ESPECIAIS, destino_casa_especial
+
+PMF_2D6 = DADOS_PADRAO.pmf
+
+
+class SolucaoMarkov:
+    """Respostas exatas para um tabuleiro (meta, casas especiais, dados)"""
+
+    def __init__(self, matriz_transicao, turnos_esperados, distribuicao_turnos):
+        self.matriz_transicao = matriz_transicao
+        # turnos_esperados[c] = número esperado de lançamentos para terminar saindo da casa c
+        self.turnos_esperados = turnos_esperados
+        # distribuicao_turnos[n] = P(terminar exatamente no n-ésimo lançamento), saindo da casa 0
+        self.distribuicao_turnos = distribuicao_turnos
+        for arr in (matriz_transicao, turnos_esperados, distribuicao_turnos):
+            arr.setflags(write=False)
+
+    @property
+    def turnos_esperados_inicio(self):
+        return float(self.turnos_esperados[0])
+
+    @property
+    def prob_vitoria_primeiro(self):
+        """P(Jogador 1 vence) com turnos alternados e o Jogador 1 começando.
+
+        O Jogador 1 vence no seu n-ésimo lançamento se o Jogador 2 ainda não
+        terminou nos seus n - 1 lançamentos anteriores.
+        """
+        f = self.distribuicao_turnos
+        sobrevive = 1.0 - np.concatenate(([0.0], np.cumsum(f)[:-1]))
+        return float(np.dot(f, sobrevive))
+
+    def prob_terminar_ate(self, n):
+        """P(terminar em até n lançamentos)"""
+        return float(self.distribuicao_turnos[:n + 1].sum())
+
+
+def matriz_transicao(meta=META, casas_especiais=None, pmf=PMF_2D6):
+    """Matriz meta x meta; a linha c traz a distribuição da próxima casa saindo de c"""
+    casas = CASAS_ESPECIAIS if casas_especiais is None else casas_especiais
+    final = meta - 1
+    P = np.zeros((meta, meta))
+    for casa in range(final):
+        for soma, p in enumerate(pmf):
+            if p == 0.0:
+                continue
+            destino = min(destino_casa_especial(casa + soma, casas, meta), final)
+            P[casa, destino] += p
+    P[final, final] = 1.0
+    return P
+
+
+@lru_cache(maxsize=64)
+def _resolver(meta, casas_itens, pmf, tolerancia):
+    P = matriz_transicao(meta, dict(casas_itens), pmf)
+    Q = P[:-1, :-1]
+
+    # Tempo esperado até a absorção: (I - Q) t = 1
+    t = np.linalg.solve(np.eye(meta - 1) - Q, np.ones(meta - 1))
+    turnos_esperados = np.append(t, 0.0)
+
+    # Distribuição exata do número de lançamentos até terminar, saindo da casa 0
+    v = np.zeros(meta - 1)
+    v[0] = 1.0
+    absorcao = P[:-1, -1]
+    distribuicao = [0.0]
+    while v.sum() > tolerancia and len(distribuicao) < 100_000:
+        distribuicao.append(float(v @ absorcao))
+        v = v @ Q
+    return SolucaoMarkov(P, turnos_esperados, np.array(distribuicao))
+
+
+def resolver_tabuleiro(meta=META, casas_especiais=None, pmf=PMF_2D6, tolerancia=1e-15):
+    """Resolve (com cache) o tabuleiro dado; ver ``SolucaoMarkov``"""
+    casas = CASAS_ESPECIAIS if casas_especiais is None else casas_especiais
+    return _resolver(meta, tuple(sorted(casas.items())), tuple(pmf), tolerancia)
@@ -0,0 +1,378 @@
+"""Motor de regras da Corrida Estatística, sem pygame, janela ou fontes.
+
+O motor guarda todo o estado da partida (posições, poderes, turno, histórico)
+e pode ser usado diretamente para simulações em massa, com um gerador de
+números aleatórios injetável.
+"""
+import random
+from array import array
+from collections import deque
+
+from dados import DADOS_PADRAO
+from estatisticas import EstatisticasIncrementais, SerieReduzida
+
+META = 30
+# Lançamentos recentes guardados por jogador; o histórico completo fica nos histogramas
+LANCES_RECENTES = 1000
+# O log binário guarda o id do jogador em 8 bits (ver registro.py)
+MAX_JOGADORES = 64
+
+PODERES = [
+    {"nome": "Dobrar Dados", "descricao": "Próximo lançamento é dobrado", "cor": (255, 150, 50)},
+    {"nome": "Retroceder Oponente", "descricao": "Oponente volta 3 casas", "cor": (200, 80, 80)},
+    {"nome": "Trocar Posições", "descricao": "Troca de lugar com oponente", "cor": (150, 100, 200)},
+    {"nome": "Jogar Novamente", "descricao": "Joga os dados novamente", "cor": (80, 180, 120)}
+]
+
+CASAS_ESPECIAIS = {
+    3: ("SORTE", 2, "Atalho! +2"), 8: ("SORTE", 3, "Vento! +3"),
+    12: ("SORTE", 1, "Passo! +1"), 18: ("SORTE", 2, "Escada! +2"),
+    22: ("SORTE", 4, "Jato! +4"), 28: ("SORTE", 1, "Quase! +1"),
+    4: ("AZAR", 2, "Queda! -2"), 7: ("AZAR", 3, "Buraco! -3"),
+    11: ("AZAR", 1, "Ops! -1"), 14: ("AZAR", 2, "Volta! -2"),
+    17: ("AZAR", 4, "Crise! -4"), 21: ("AZAR", 2, "Recuo! -2"),
+    26: ("AZAR", 3, "Monstro! -3")
+}
+
+
+def destino_casa_especial(posicao, casas_especiais, meta):
+    """Posição final depois de aplicar a casa especial (um único salto)"""
+    if posicao >= meta or posicao not in casas_especiais:
+        return posicao
+    tipo, valor, _ = casas_especiais[posicao]
+    if tipo == "SORTE":
+        return posicao + valor
+    return max(0, posicao - valor)
+
+
+def tabela_saltos(meta, casas_especiais, movimento_max=DADOS_PADRAO.soma_maxima_dobrada):
+    """Destino de cada posição alcançável após aplicar as casas especiais"""
+    return [destino_casa_especial(p, casas_especiais, meta) for p in range(meta + movimento_max)]
+
+
+def nova_semente():
+    """Semente aleatória de 64 bits para uma nova partida"""
+    return random.SystemRandom().getrandbits(64)
+
+
+def estrategia_padrao(motor, jogador_id):
+    """Heurística simples para decidir se o poder deve ser usado agora"""
+    jogador = motor.jogadores[jogador_id]
+    poder = jogador.poder
+    if poder is None or jogador.poder_usado:
+        return False
+    nome = poder['nome']
+    oponente = motor.jogadores[motor.alvo_poder(jogador_id)]
+    if nome == "Retroceder Oponente":
+        return oponente.pos >= 3
+    if nome == "Trocar Posições":
+        return oponente.pos > jogador.pos
+    return True
+
+
+class Jogador:
+    """Estado de um jogador na partida; sem ``registrar``, ``dados`` fica None"""
+    __slots__ = ("id", "nome", "pos", "poder", "poder_usado", "dados")
+
+    def __init__(self, jogador_id, registrar=True):
+        self.id = jogador_id
+        self.nome = f"Jogador {jogador_id}"
+        self.pos = 0
+        self.poder = None
+        self.poder_usado = False
+        self.dados = deque(maxlen=LANCES_RECENTES) if registrar else None
+
+
+class MotorJogo:
+    """Regras da partida para 2 a ``MAX_JOGADORES`` jogadores, com ids 1..N em ordem de turno.
+
+    Poderes que afetam um oponente (Retroceder, Trocar) miram o oponente mais
+    adiantado; no empate, o primeiro a jogar depois de quem usou o poder
+    (ver ``alvo_poder``). Com dois jogadores, é sempre o outro.
+
+    Os dados vêm de ``config_dados`` (``dados.ConfigDados``, padrão 2d6) e
+    podem ser trocados no meio da partida com ``trocar_dados``.
+    """
+
+    def __init__(self, meta=META, casas_especiais=None, rng=None, registrar=True, semente=None, gravador=None,
+                 num_jogadores=2, config_dados=None, exportador=None):
+        if not 2 <= num_jogadores <= MAX_JOGADORES:
+            raise ValueError(f"número de jogadores deve estar entre 2 e {MAX_JOGADORES}")
+        self.num_jogadores = num_jogadores
+        self.meta = meta
+        self.casas_especiais = dict(CASAS_ESPECIAIS if casas_especiais is None else casas_especiais)
+        self.poderes_disponiveis = PODERES
+        self.rng = rng if rng is not None else random.Random()
+        # Sem registro, o motor não guarda histórico nem mensagens (simulação em massa)
+        self.registrar = registrar
+        # Log binário opcional (registro.GravadorPartidas)
+        self.gravador = gravador
+        # Exportação colunar opcional (exportacao.ExportadorColunar)
+        self.exportador = exportador
+        self.config_dados = config_dados or DADOS_PADRAO
+        self._dados_padrao = self.config_dados == DADOS_PADRAO
+        self._gerar_tabela_saltos()
+        self.reiniciar(semente)
+
+    def _gerar_tabela_saltos(self):
+        """Pré-calcula o destino de cada casa e o tipo de cada casa (1 sorte, -1 azar, 0 comum)"""
+        self._saltos = tabela_saltos(self.meta, self.casas_especiais, self.config_dados.soma_maxima_dobrada)
+        self.tipos_casas = array('b', bytes(self.meta))
+        for casa, (tipo, _, _) in self.casas_especiais.items():
+            self.tipos_casas[casa] = 1 if tipo == "SORTE" else -1
+
+    def reiniciar(self, semente=None):
+        """Nova partida; com semente, o gerador é semeado para torná-la reproduzível"""
+        if semente is not None:
+            self.rng.seed(semente)
+        self.semente = semente
+        if self.gravador is not None:
+            self.gravador.iniciar_partida(semente, self.meta, self.num_jogadores, self.config_dados)
+        if self.exportador is not None:
+            self.exportador.iniciar_partida(semente, self.meta, self.num_jogadores)
+        self.jogadores = {jid: Jogador(jid, self.registrar) for jid in range(1, self.num_jogadores + 1)}
+        self.turno_atual = 1
+        self.vencedor = None
+        self._zerar_estatisticas()
+        self.msg_evento = ""
+        self.casa_especial_atingida = None
+        self.poder_dobrar_ativa = False
+        self.turno_extra = False
+        self.jogador_selecionando_poder = 1
+        self.lances_avulsos = 0
+        self._gerador_lote = None
+        self.lancamentos = 0
+
+    def _zerar_estatisticas(self):
+        if not self.registrar:
+            # Simulação em massa: ninguém lê as estatísticas, e alocá-las a cada partida custava caro
+            self.historico_medias, self.historico_lancamentos, self.estatisticas = {}, {}, {}
+            return
+        ids = list(self.jogadores)
+        # Memória limitada: média acumulada reduzida a baldes, lances só os recentes
+        self.historico_medias = {jid: SerieReduzida() for jid in ids}
+        self.historico_lancamentos = {jid: deque(maxlen=LANCES_RECENTES) for jid in ids}
+        self.estatisticas = {jid: EstatisticasIncrementais(self.config_dados.soma_maxima_dobrada, self.config_dados)
+                             for jid in ids}
+
+    def trocar_dados(self, config_dados):
+        """Troca os dados no meio da partida; as estatísticas recomeçam com os novos dados"""
+        self.config_dados = config_dados
+        self._dados_padrao = config_dados == DADOS_PADRAO
+        self._gerar_tabela_saltos()
+        self._zerar_estatisticas()
+        if self.registrar:
+            for jogador in self.jogadores.values():
+                jogador.dados.clear()
+        self.lances_avulsos = 0
+        if self.gravador is not None:
+            self.gravador.trocar_dados(config_dados)
+        if self.registrar:
+            self.msg_evento = f"Dados trocados: {config_dados.rotulo}"
+
+    def selecionar_poder(self, jogador_id, poder_index):
+        """Atribui um poder ao jogador; retorna True quando todos já escolheram"""
+        if 0 <= poder_index < len(self.poderes_disponiveis):
+            self.jogadores[jogador_id].poder = self.poderes_disponiveis[poder_index]
+            self.jogadores[jogador_id].poder_usado = False
+            if self.gravador is not None:
+                self.gravador.escolha(jogador_id, poder_index)
+
+            if jogador_id < self.num_jogadores:
+                self.jogador_selecionando_poder = jogador_id + 1
+            else:
+                return True
+        return False
+
+    def alvo_poder(self, jogador_id):
+        """Oponente afetado por um poder: o mais adiantado, desempatando pela ordem de turno"""
+        if self.num_jogadores == 2:
+            return 3 - jogador_id
+        jogadores = self.jogadores
+        alvo = None
+        jid = jogador_id
+        for _ in range(self.num_jogadores - 1):
+            jid = jid % self.num_jogadores + 1
+            if alvo is None or jogadores[jid].pos > jogadores[alvo].pos:
+                alvo = jid
+        return alvo
+
+    def usar_poder(self, jogador_id):
+        """Ativa o poder do jogador"""
+        jogador = self.jogadores[jogador_id]
+
+        if jogador.poder is None or jogador.poder_usado or self.vencedor:
+            return False
+
+        poder_nome = jogador.poder['nome']
+        jogador.poder_usado = True
+        if self.gravador is not None:
+            self.gravador.uso_poder(jogador_id)
+        if self.exportador is not None:
+            self.exportador.uso_poder(jogador_id, self.poderes_disponiveis.index(jogador.poder))
+
+        if poder_nome == "Dobrar Dados":
+            self.poder_dobrar_ativa = True
+
+        elif poder_nome == "Retroceder Oponente":
+            oponente = self.jogadores[self.alvo_poder(jogador_id)]
+            oponente.pos = max(0, oponente.pos - 3)
+
+        elif poder_nome == "Trocar Posições":
+            oponente = self.jogadores[self.alvo_poder(jogador_id)]
+            jogador.pos, oponente.pos = oponente.pos, jogador.pos
+
+        elif poder_nome == "Jogar Novamente":
+            self.turno_extra = True
+
+        if self.registrar:
+            self.msg_evento = f"{jogador.nome} usou {poder_nome}!"
+        return True
+
+    def jogar_dados(self, dados=None):
+        """Lança os dados para o jogador da vez; retorna (faces, soma) ou None.
+
+        ``dados`` força as faces (usado na reprodução de um log).
+        """
+        if self.vencedor:
+            return None
+
+        jog = self.jogadores[self.turno_atual]
+
+        if dados is None and self._dados_padrao:
+            # 2d6 honestos sem passar por ConfigDados.sortear; mesma sequência do gerador
+            aleatorio = self.rng.random
+            d1 = int(aleatorio() * 6) + 1
+            d2 = int(aleatorio() * 6) + 1
+            faces, soma = (d1, d2), d1 + d2
+        else:
+            faces = self.config_dados.sortear(self.rng) if dados is None else tuple(dados)
+            soma = sum(faces)
+        if self.gravador is not None:
+            self.gravador.lance(faces)
+
+        # Aplicar poder de dobrar dados se estiver ativo
+        dobrado = self.poder_dobrar_ativa
+        if dobrado:
+            soma = soma * 2
+            self.poder_dobrar_ativa = False
+        self.lancamentos += 1
+
+        if self.registrar:
+            self.msg_evento = f"Dados dobrados! Movimento: {soma} casas" if dobrado else f"Movimento: {soma} casas"
+            # Armazenar dados para estatísticas
+            jog.dados.append(soma)
+            stats = self.estatisticas[self.turno_atual]
+            stats.adicionar(soma, dobrado)
+            self.historico_lancamentos[self.turno_atual].append(faces)
+            self.historico_medias[self.turno_atual].adicionar(stats.media)
+
+        pos = jog.pos + soma
+        self._verificar_consequencias_final(jog, pos)
+
+        # Verificar vitória
+        if jog.pos >= self.meta - 1:
+            jog.pos = self.meta - 1
+            self.vencedor = self.turno_atual
+            if self.registrar:
+                self.msg_evento = f"{jog.nome} VENCEU!"
+            if self.gravador is not None:
+                self.gravador.fim(self.vencedor)
+
+        if self.exportador is not None:
+            self.exportador.lance(self.turno_atual, self.config_dados, faces, soma, dobrado, pos - soma, jog.pos,
+                                  self.casa_especial_atingida)
+            if self.vencedor:
+                self.exportador.fim(self.vencedor)
+
+        # Mudar turno (a menos que haja turno extra)
+        if self.turno_extra:
+            self.turno_extra = False
+        elif not self.vencedor:
+            self.turno_atual = self.turno_atual % self.num_jogadores + 1
+
+        return faces, soma
+
+    def _verificar_consequencias_final(self, jog, posicao):
+        """Aplica a casa especial apenas na posição final (evita recursão infinita)"""
+        destino = self._saltos[posicao]
+        jog.pos = destino
+        if destino == posicao:
+            self.casa_especial_atingida = None
+            return
+
+        self.casa_especial_atingida = posicao
+        if self.gravador is not None:
+            self.gravador.casa_especial(posicao)
+        if self.registrar:
+            tipo, valor, texto = self.casas_especiais[posicao]
+            sinal = "+" if tipo == "SORTE" else "-"
+            self.msg_evento = f"{texto} na casa {posicao + 1} ({sinal}{valor})"
+
+    def lancar_lote(self, n):
+        """n lançamentos avulsos sorteados de uma vez com NumPy (modo turbo).
+
+        Alimentam só as estatísticas (nada, sem ``registrar``), alternando
+        entre os jogadores; não movem os peões nem entram no log da partida.
+        Retorna os dados do último lançamento.
+        """
+        import numpy as np
+        if self._gerador_lote is None:
+            # Derivado do gerador da partida, para continuar reproduzível com semente
+            self._gerador_lote = np.random.default_rng(self.rng.getrandbits(64))
+        dados = self.config_dados.sortear_lote(self._gerador_lote, n)
+        somas = dados.sum(axis=1)
+
+        ids = list(self.jogadores)
+        for k, pid in enumerate(ids if self.registrar else ()):
+            fatia = slice((k - self.lances_avulsos) % len(ids), None, len(ids))
+            parte = somas[fatia]
+            if not len(parte):
+                continue
+            stats = self.estatisticas[pid]
+            medias = (stats.total + np.cumsum(parte)) / (stats.n + np.arange(1, len(parte) + 1))
+            stats.adicionar_lote(parte)
+            self.historico_medias[pid].estender(medias.tolist())
+            self.jogadores[pid].dados.extend(parte[-LANCES_RECENTES:].tolist())
+            self.historico_lancamentos[pid].extend(map(tuple, dados[fatia][-LANCES_RECENTES:].tolist()))
+        if self.exportador is not None:
+            # A linha i é do jogador ids[(i + lances_avulsos) % len(ids)], como nas fatias acima
+            quem = (np.arange(n) + self.lances_avulsos) % len(ids)
+            posicoes = np.array([self.jogadores[pid].pos for pid in ids])
+            self.exportador.lote(np.array(ids)[quem], self.config_dados, dados, somas, posicoes[quem])
+        self.lances_avulsos += n
+        return tuple(dados[-1].tolist())
+
+    def jogar_turno(self, estrategia=estrategia_padrao):
+        """Um turno completo: decide o uso do poder e lança os dados"""
+        if estrategia is not None and estrategia(self, self.turno_atual):
+            self.usar_poder(self.turno_atual)
+        return self.jogar_dados()
+
+    def jogar_partida(self, estrategia=estrategia_padrao):
+        """Joga até haver vencedor; retorna (vencedor, número de lançamentos)"""
+        while not self.vencedor:
+            self.jogar_turno(estrategia)
+        return self.vencedor, self.lancamentos
+
+
+def simular_partidas(n, poderes=(None, None), estrategia=estrategia_padrao, rng=None, meta=META, casas_especiais=None,
+                     config_dados=None, exportador=None):
+    """Simula n partidas sem interface; retorna vitórias por jogador e total de lançamentos.
+
+    O número de jogadores é ``len(poderes)``. Roda na casa de 100 mil partidas/s
+    num núcleo; para volumes maiores use ``simulacao.simular_lote`` (NumPy).
+    """
+    motor = MotorJogo(meta, casas_especiais, rng, registrar=False, num_jogadores=len(poderes),
+                      config_dados=config_dados, exportador=exportador)
+    vitorias = dict.fromkeys(motor.jogadores, 0)
+    total_lancamentos = 0
+    for _ in range(n):
+        motor.reiniciar()
+        for jid, poder_index in enumerate(poderes, 1):
+            if poder_index is not None:
+                motor.selecionar_poder(jid, poder_index)
+        vencedor, lancamentos = motor.jogar_partida(estrategia)
+        vitorias[vencedor] += 1
+        total_lancamentos += lancamentos
+    return vitorias, total_lancamentos
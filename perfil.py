@@ -0,0 +1,110 @@
+"""Perfilador leve para o HUD de desempenho (F3).
+
+Os tempos vêm de métodos envolvidos por ``envolver`` apenas enquanto o HUD
+está ativo; desligado, os métodos originais voltam a ser chamados direto e
+não há custo algum.
+"""
+import time
+from collections import deque
+
+import pygame
+
+COR_FUNDO_HUD = (0, 0, 0, 190)
+COR_TEXTO_HUD = (220, 255, 220)
+COR_ALERTA_HUD = (255, 120, 100)
+
+
+class Perfilador:
+    """Tempos por seção e por quadro numa janela deslizante"""
+
+    def __init__(self, janela=120, orcamento=1 / 60):
+        self.ativo = False
+        self.janela = janela
+        self.orcamento = orcamento
+        self.limpar()
+
+    def limpar(self):
+        self.quadros = deque(maxlen=self.janela)
+        self.secoes = {}
+        self.fim_quadros = deque(maxlen=self.janela)
+        self.perdidos = 0
+        self._atual = {}
+        self._inicio = None
+
+    def envolver(self, nome, funcao):
+        """Versão de ``funcao`` que soma seu tempo à seção ``nome`` do quadro atual"""
+        atual = self._atual
+        relogio = time.perf_counter
+
+        def medida(*args, **kwargs):
+            inicio = relogio()
+            if self._inicio is None:
+                self._inicio = inicio
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                atual[nome] = atual.get(nome, 0.0) + relogio() - inicio
+        return medida
+
+    def fim_quadro(self):
+        agora = time.perf_counter()
+        duracao = agora - (self._inicio if self._inicio is not None else agora)
+        self.quadros.append(duracao)
+        self.fim_quadros.append(agora)
+        if duracao > self.orcamento:
+            self.perdidos += 1
+        for nome in set(self.secoes) | set(self._atual):
+            historico = self.secoes.setdefault(nome, deque(maxlen=self.janela))
+            historico.append(self._atual.get(nome, 0.0))
+        self._atual.clear()
+        self._inicio = None
+
+    @property
+    def fps(self):
+        """Quadros desenhados no último segundo"""
+        if not self.fim_quadros:
+            return 0
+        limite = self.fim_quadros[-1] - 1.0
+        return sum(1 for t in self.fim_quadros if t >= limite)
+
+    def desenhar(self, superficie, fonte, extras=()):
+        """Desenha o HUD no canto superior direito; retorna o retângulo ocupado"""
+        largura, linha_h = 260, 15
+        medias = {nome: sum(h) / len(h) for nome, h in self.secoes.items() if h}
+        altura = linha_h * (3 + len(medias) + len(extras)) + 60
+        rect = pygame.Rect(superficie.get_width() - largura - 10, 10, largura, altura)
+
+        fundo = pygame.Surface(rect.size, pygame.SRCALPHA)
+        fundo.fill(COR_FUNDO_HUD)
+        superficie.blit(fundo, rect)
+
+        ultimo = self.quadros[-1] * 1000 if self.quadros else 0.0
+        media = sum(self.quadros) / len(self.quadros) * 1000 if self.quadros else 0.0
+        linhas = [
+            (f"quadro {ultimo:5.2f} ms (média {media:5.2f})", COR_TEXTO_HUD),
+            (f"FPS {self.fps:3d}   perdidos {self.perdidos}",
+             COR_ALERTA_HUD if self.perdidos else COR_TEXTO_HUD),
+            ("seção            média ms", COR_TEXTO_HUD),
+        ]
+        for nome, valor in sorted(medias.items(), key=lambda item: -item[1]):
+            linhas.append((f"  {nome:<14} {valor * 1000:7.3f}", COR_TEXTO_HUD))
+        linhas += [(texto, COR_TEXTO_HUD) for texto in extras]
+
+        # Os números mudam a cada quadro: renderizar direto em vez de poluir o cache de texto
+        y = rect.top + 5
+        for texto, cor in linhas:
+            superficie.blit(fonte.render(texto, True, cor), (rect.left + 8, y))
+            y += linha_h
+
+        # Gráfico do tempo de quadro, com a linha do orçamento (60 FPS)
+        graf = pygame.Rect(rect.left + 8, y + 5, largura - 16, 45)
+        escala = graf.height / (2 * self.orcamento)
+        y_orcamento = graf.bottom - self.orcamento * escala
+        pygame.draw.line(superficie, (120, 120, 120), (graf.left, y_orcamento), (graf.right, y_orcamento))
+        passo = graf.width / self.janela
+        for i, duracao in enumerate(self.quadros):
+            x = graf.left + i * passo
+            h = min(graf.height, duracao * escala)
+            cor = COR_ALERTA_HUD if duracao > self.orcamento else COR_TEXTO_HUD
+            pygame.draw.line(superficie, cor, (x, graf.bottom), (x, graf.bottom - h))
+        return rect
@@ -0,0 +1,264 @@
+"""Log binário compacto de partidas e reprodução em velocidade máxima.
+
+O log é uma sequência append-only de palavras de 16 bits (little-endian):
+os 4 bits altos dão o tipo do registro e os 12 bits baixos o valor. Um
+arquivo pode conter milhões de partidas, uma após a outra.
+
+    INICIO   valor = versão; seguido de 4 palavras com a semente (64 bits), 1 com a
+             meta, 1 com o número de jogadores e 1 com os dados, como em TROCA_DADOS
+    ESCOLHA  valor = jogador << 4 | índice do poder
+    USO      valor = jogador que usou o poder
+    DADO     valor = face de um dado (um registro por dado lançado)
+    CASA     valor = casa especial atingida
+    FIM      valor = vencedor
+    TROCA_DADOS  valor = quantidade de dados << 7 | faces (troca no meio da partida)
+
+Os pesos de dados viciados não são gravados: a reprodução usa as faces do log.
+
+Uso:
+    python jogo.py replay ARQUIVO [--partida I] [--sem-tela] [--tabuleiro TAB.json] [--exportar RAIZ]
+"""
+import argparse
+import sys
+import time
+from array import array
+
+from dados import DADOS_PADRAO, ConfigDados
+
+INICIO, ESCOLHA, USO, DADO, CASA, FIM, TROCA_DADOS = range(1, 8)
+VERSAO = 1
+_MASCARA = 0x0FFF
+# Palavras do cabeçalho de INICIO, incluindo a própria
+_TAMANHO_CABECALHO = 8
+
+
+class ErroReproducao(ValueError):
+    """O log não corresponde ao que o motor reproduziu"""
+
+
+def _palavra(tipo, valor):
+    return (tipo << 12) | (valor & _MASCARA)
+
+
+def _codificar_dados(config_dados):
+    return config_dados.quantidade << 7 | config_dados.faces
+
+
+def _decodificar_dados(valor):
+    return ConfigDados(valor >> 7, valor & 0x7F)
+
+
+class GravadorPartidas:
+    """Acumula os registros em memória e os anexa a um arquivo em lotes.
+
+    Sem ``caminho``, os registros só se acumulam em ``palavras`` (que pode
+    ser um array já existente, para continuar um log).
+
+    O INICIO de uma partida só é escrito junto com o primeiro registro dela:
+    uma partida reiniciada antes de qualquer escolha ou lance (como a que o
+    motor abre ao ser construído) não deixa rastro no log.
+    """
+
+    def __init__(self, caminho=None, limite_buffer=1 << 16, palavras=None):
+        self.caminho = caminho
+        self.limite_buffer = limite_buffer
+        self.palavras = array('H') if palavras is None else palavras
+        self._inicio = None
+
+    def iniciar_partida(self, semente, meta, num_jogadores=2, config_dados=DADOS_PADRAO):
+        semente = semente or 0
+        self._inicio = [_palavra(INICIO, VERSAO),
+                        semente & 0xFFFF, (semente >> 16) & 0xFFFF,
+                        (semente >> 32) & 0xFFFF, (semente >> 48) & 0xFFFF,
+                        meta, num_jogadores, _codificar_dados(config_dados)]
+
+    def _abrir_partida(self):
+        self.palavras.extend(self._inicio)
+        self._inicio = None
+
+    def trocar_dados(self, config_dados):
+        if self._inicio is not None:
+            # Partida ainda sem registros: basta começá-la com os novos dados
+            self._inicio[-1] = _codificar_dados(config_dados)
+            return
+        self.palavras.append(_palavra(TROCA_DADOS, _codificar_dados(config_dados)))
+
+    def escolha(self, jogador_id, poder_index):
+        if self._inicio is not None:
+            self._abrir_partida()
+        self.palavras.append(_palavra(ESCOLHA, (jogador_id << 4) | poder_index))
+
+    def uso_poder(self, jogador_id):
+        if self._inicio is not None:
+            self._abrir_partida()
+        self.palavras.append(_palavra(USO, jogador_id))
+
+    def lance(self, dados):
+        if self._inicio is not None:
+            self._abrir_partida()
+        self.palavras.extend([_palavra(DADO, d) for d in dados])
+
+    def casa_especial(self, casa):
+        self.palavras.append(_palavra(CASA, casa))
+
+    def fim(self, vencedor):
+        self.palavras.append(_palavra(FIM, vencedor))
+        if len(self.palavras) >= self.limite_buffer:
+            self.descarregar()
+
+    def descarregar(self):
+        """Anexa o buffer ao arquivo (se houver) e o esvazia"""
+        if self.caminho is None or not self.palavras:
+            return
+        if sys.byteorder != 'little':
+            self.palavras.byteswap()
+        with open(self.caminho, 'ab') as f:
+            self.palavras.tofile(f)
+        del self.palavras[:]
+
+
+def carregar(caminho):
+    palavras = array('H')
+    with open(caminho, 'rb') as f:
+        palavras.frombytes(f.read())
+    if sys.byteorder != 'little':
+        palavras.byteswap()
+    return palavras
+
+
+def cabecalho(palavras, inicio=0):
+    """(semente, meta, número de jogadores, dados, tamanho do cabeçalho) da partida em ``inicio``"""
+    if palavras[inicio] >> 12 != INICIO:
+        raise ErroReproducao(f"registro inesperado na posição {inicio}")
+    versao = palavras[inicio] & _MASCARA
+    if versao != VERSAO:
+        raise ErroReproducao(f"versão de log desconhecida: {versao}")
+    semente = (palavras[inicio + 1] | palavras[inicio + 2] << 16
+               | palavras[inicio + 3] << 32 | palavras[inicio + 4] << 48)
+    return (semente, palavras[inicio + 5], palavras[inicio + 6], _decodificar_dados(palavras[inicio + 7]),
+            _TAMANHO_CABECALHO)
+
+
+def dividir_partidas(palavras):
+    """Índices (início, fim) de cada partida no log"""
+    # As palavras cruas do cabeçalho são puladas, então nunca são lidas como tipo
+    limites = []
+    i = 0
+    n = len(palavras)
+    while i < n:
+        j = i + cabecalho(palavras, i)[-1]
+        while j < n and palavras[j] >> 12 != INICIO:
+            j += 1
+        limites.append((i, j))
+        i = j
+    return limites
+
+
+def reproduzir(palavras, motor, inicio=0, fim=None, ao_passo=None):
+    """Reconstrói no motor a partida registrada em palavras[inicio:fim].
+
+    Os dados vêm do log, não do gerador, e a configuração dos dados do motor
+    passa a ser a do log. ``ao_passo(motor)`` é chamado após cada registro
+    aplicado, para quem quiser desenhar a reprodução.
+    """
+    fim = len(palavras) if fim is None else fim
+    semente, meta, num_jogadores, config_dados, tamanho = cabecalho(palavras, inicio)
+    if meta != motor.meta:
+        raise ErroReproducao(f"log com meta {meta}, motor com meta {motor.meta}")
+    if num_jogadores != motor.num_jogadores:
+        raise ErroReproducao(f"log com {num_jogadores} jogadores, motor com {motor.num_jogadores}")
+    gravador, motor.gravador = motor.gravador, None
+    try:
+        if config_dados != motor.config_dados:
+            motor.trocar_dados(config_dados)
+        motor.reiniciar(semente)
+        dados = []
+        por_lance = config_dados.quantidade
+        for i in range(inicio + tamanho, fim):
+            tipo, valor = palavras[i] >> 12, palavras[i] & _MASCARA
+            if tipo == DADO:
+                dados.append(valor)
+                if len(dados) < por_lance:
+                    continue
+                motor.jogar_dados(dados)
+                dados = []
+            elif tipo == ESCOLHA:
+                motor.selecionar_poder(valor >> 4, valor & 0xF)
+            elif tipo == USO:
+                motor.usar_poder(valor)
+            elif tipo == TROCA_DADOS:
+                motor.trocar_dados(_decodificar_dados(valor))
+                por_lance = motor.config_dados.quantidade
+            elif tipo == CASA:
+                if motor.casa_especial_atingida != valor:
+                    raise ErroReproducao(f"casa especial {valor} esperada na posição {i}")
+                continue
+            elif tipo == FIM:
+                if motor.vencedor != valor:
+                    raise ErroReproducao(f"vencedor {valor} esperado, motor chegou a {motor.vencedor}")
+                continue
+            else:
+                raise ErroReproducao(f"tipo de registro desconhecido {tipo} na posição {i}")
+            if ao_passo is not None:
+                ao_passo(motor)
+    finally:
+        motor.gravador = gravador
+    return motor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="jogo.py replay", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("arquivo")
+    parser.add_argument("--partida", type=int, default=None, help="índice da partida (padrão: todas)")
+    parser.add_argument("--sem-tela", action="store_true", help="reproduz sem desenhar")
+    parser.add_argument("--passos-por-quadro", type=int, default=1)
+    parser.add_argument("--tabuleiro", default=None, help="arquivo JSON do tabuleiro em que as partidas foram jogadas")
+    parser.add_argument("--exportar", default=None, metavar="RAIZ",
+                        help="converte o log em colunas .npy numa sessão nova em RAIZ (implica --sem-tela)")
+    args = parser.parse_args(argv)
+    tabuleiro = {}
+    if args.tabuleiro:
+        from tabuleiro import carregar_tabuleiro
+        tabuleiro = carregar_tabuleiro(args.tabuleiro)
+
+    palavras = carregar(args.arquivo)
+    limites = dividir_partidas(palavras)
+    if args.partida is not None:
+        limites = [limites[args.partida]]
+
+    if not args.sem_tela and not args.exportar:
+        from jogo import CorridaEstatistica
+        num_jogadores = cabecalho(palavras, limites[0][0])[2]
+        jogo = CorridaEstatistica(num_jogadores=num_jogadores, tabuleiro=tabuleiro)
+        jogo.reproduzir(palavras, limites, args.passos_por_quadro)
+        return
+
+    from motor import META, MotorJogo
+    exportador = None
+    if args.exportar:
+        from exportacao import ExportadorColunar, nova_sessao
+        exportador = ExportadorColunar(nova_sessao(args.exportar))
+    motores = {}
+    t = time.perf_counter()
+    for inicio, fim in limites:
+        num_jogadores = cabecalho(palavras, inicio)[2]
+        if num_jogadores not in motores:
+            motores[num_jogadores] = MotorJogo(tabuleiro.get("meta", META), tabuleiro.get("casas_especiais"),
+                                               registrar=False, num_jogadores=num_jogadores,
+                                               exportador=exportador)
+        motor = reproduzir(palavras, motores[num_jogadores], inicio, fim)
+        if len(limites) <= 20:
+            posicoes = {jid: j.pos for jid, j in motor.jogadores.items()}
+            print(f"semente {motor.semente}: vencedor {motor.vencedor}, posições {posicoes}, "
+                  f"{motor.lancamentos} lançamentos")
+    if exportador is not None:
+        exportador.fechar()
+        print(f"{exportador.lances} lançamentos exportados para {exportador.diretorio}")
+    duracao = time.perf_counter() - t
+    print(f"{len(limites)} partidas reproduzidas em {duracao:.3f} s "
+          f"({len(palavras) * 2} bytes de log)")
+
+
+if __name__ == "__main__":
+    main()
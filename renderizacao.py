@@ -0,0 +1,207 @@
+"""Utilitários de desenho: cache de superfícies pré-renderizadas e índice espacial."""
+from collections import OrderedDict, defaultdict
+
+import pygame
+
+
+class CacheTexto:
+    """Cache LRU limitado de textos renderizados, chaveado por (fonte, texto, antialias, cor)"""
+
+    def __init__(self, capacidade=512):
+        self.capacidade = capacidade
+        self._itens = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    def render(self, fonte, texto, antialias, cor):
+        """Mesmo contrato de ``pygame.font.Font.render``; a Surface retornada é compartilhada"""
+        chave = (fonte, texto, antialias, tuple(cor))
+        superficie = self._itens.get(chave)
+        if superficie is not None:
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return superficie
+
+        self.falhas += 1
+        superficie = fonte.render(texto, antialias, cor)
+        self._itens[chave] = superficie
+        if len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+        return superficie
+
+    def limpar(self):
+        self._itens.clear()
+
+    @property
+    def taxa_acerto(self):
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def resumo(self):
+        return (f"cache de texto: {len(self._itens)}/{self.capacidade} itens, "
+                f"{self.taxa_acerto:.1%} de acertos ({self.acertos} acertos, {self.falhas} falhas)")
+
+
+class IndiceEspacial:
+    """Grade uniforme de baldes sobre retângulos, para achar rápido quem cruza uma região.
+
+    Cada item entra em todos os baldes que seu retângulo toca; a consulta só
+    olha os baldes cobertos pela região pedida.
+    """
+
+    def __init__(self, tamanho_balde):
+        self.tamanho_balde = max(1, int(tamanho_balde))
+        self._baldes = defaultdict(list)
+        self.rects = {}
+
+    def _faixa(self, rect):
+        t = self.tamanho_balde
+        return range(rect.left // t, (rect.right - 1) // t + 1), range(rect.top // t, (rect.bottom - 1) // t + 1)
+
+    def inserir(self, item, rect):
+        self.rects[item] = rect
+        colunas, linhas = self._faixa(rect)
+        for bx in colunas:
+            for by in linhas:
+                self._baldes[bx, by].append(item)
+
+    def consultar(self, rect):
+        """Itens cujo retângulo cruza ``rect``, em ordem crescente"""
+        encontrados = set()
+        colunas, linhas = self._faixa(rect)
+        baldes = self._baldes
+        for bx in colunas:
+            for by in linhas:
+                balde = baldes.get((bx, by))
+                if balde:
+                    encontrados.update(balde)
+        rects = self.rects
+        return sorted(i for i in encontrados if rects[i].colliderect(rect))
+
+
+# Pontos de cada face, em quartos do lado do dado
+_PONTOS_FACES = {
+    1: [(2, 2)],
+    2: [(1, 1), (3, 3)],
+    3: [(1, 1), (2, 2), (3, 3)],
+    4: [(1, 1), (3, 1), (1, 3), (3, 3)],
+    5: [(1, 1), (3, 1), (2, 2), (1, 3), (3, 3)],
+    6: [(1, 1), (3, 1), (1, 2), (3, 2), (1, 3), (3, 3)],
+}
+# Faces mostradas pelos quadros da animação de rolagem, um ângulo diferente por quadro
+_SEQUENCIA_ROLAGEM = (3, 6, 2, 5, 1, 4, 6, 2)
+
+
+class AtlasDados:
+    """Folhas de sprites de dados: faces 0 (em branco) a 6 e quadros de rolagem, uma folha por tamanho.
+
+    As faces são desenhadas uma vez num dado mestre grande; a folha de cada
+    tamanho sai dele por ``smoothscale`` (o que suaviza as bordas dos pontos)
+    e os quadros de rolagem, por rotação das faces já reduzidas. Desenhar um
+    dado é um único ``blit`` de uma área da folha. Faces acima de 6 mostram o
+    número sobre a face em branco, composta na primeira vez e guardada.
+    """
+
+    LADO_MESTRE = 200
+
+    def __init__(self, capacidade=8, capacidade_numeros=256):
+        self.capacidade = capacidade
+        self.capacidade_numeros = capacidade_numeros
+        self._mestres = None
+        self._folhas = OrderedDict()
+        self._numeros = OrderedDict()
+
+    @property
+    def quadros_rolagem(self):
+        return len(_SEQUENCIA_ROLAGEM)
+
+    def _desenhar_mestres(self):
+        lado = self.LADO_MESTRE
+        # Proporções do dado de 50 px original: sombra de 2 px, cantos de 8 px, borda de 2 px
+        sombra, raio_canto, borda = lado // 25, lado * 4 // 25, lado // 25
+        raio_ponto = lado // 9
+        mestres = []
+        for valor in range(7):
+            face = pygame.Surface((lado + sombra, lado + sombra), pygame.SRCALPHA)
+            pygame.draw.rect(face, (10, 10, 10), (sombra, sombra, lado, lado), border_radius=raio_canto)
+            pygame.draw.rect(face, (245, 245, 245), (0, 0, lado, lado), border_radius=raio_canto)
+            pygame.draw.rect(face, (20, 20, 20), (0, 0, lado, lado), borda, border_radius=raio_canto)
+            for qx, qy in _PONTOS_FACES.get(valor, ()):
+                pygame.draw.circle(face, (0, 0, 0), (qx * lado // 4, qy * lado // 4), raio_ponto)
+            mestres.append(face)
+        self._mestres = mestres
+
+    def _montar_folha(self, tamanho):
+        """(folha, faces, quadros): cada item de faces/quadros é (área na folha, deslocamento do canto do dado)"""
+        if self._mestres is None:
+            self._desenhar_mestres()
+        escala = tamanho / self.LADO_MESTRE
+        faces = [pygame.transform.smoothscale(m, [max(1, round(d * escala)) for d in m.get_size()])
+                 for m in self._mestres]
+        quadros = [pygame.transform.rotozoom(faces[valor], 15 + 360 * i / len(_SEQUENCIA_ROLAGEM), 1.0)
+                   for i, valor in enumerate(_SEQUENCIA_ROLAGEM)]
+        # Uma linha de faces e, abaixo, uma de quadros de rolagem
+        altura_faces = max(f.get_height() for f in faces)
+        largura = max(sum(f.get_width() for f in faces), sum(q.get_width() for q in quadros))
+        folha = pygame.Surface((largura, altura_faces + max(q.get_height() for q in quadros)), pygame.SRCALPHA)
+        itens = ([], [])
+        for linha, (sprites, y) in enumerate(((faces, 0), (quadros, altura_faces))):
+            x = 0
+            for sprite in sprites:
+                w, h = sprite.get_size()
+                folha.blit(sprite, (x, y))
+                # Quadros girados crescem: centraliza-os no lugar do dado
+                deslocamento = (0, 0) if linha == 0 else ((tamanho - w) // 2, (tamanho - h) // 2)
+                itens[linha].append((pygame.Rect(x, y, w, h), deslocamento))
+                x += w
+        if pygame.display.get_surface() is not None:
+            folha = folha.convert_alpha()
+        return folha, itens[0], itens[1]
+
+    def _folha(self, tamanho):
+        folha = self._folhas.get(tamanho)
+        if folha is not None:
+            self._folhas.move_to_end(tamanho)
+            return folha
+        folha = self._folhas[tamanho] = self._montar_folha(tamanho)
+        if len(self._folhas) > self.capacidade:
+            self._folhas.popitem(last=False)
+        return folha
+
+    def _face_numero(self, tamanho, valor, fonte):
+        chave = (tamanho, valor, fonte)
+        face = self._numeros.get(chave)
+        if face is not None:
+            self._numeros.move_to_end(chave)
+            return face
+        folha, faces, _ = self._folha(tamanho)
+        area = faces[0][0]
+        face = pygame.Surface(area.size, pygame.SRCALPHA)
+        face.blit(folha, (0, 0), area)
+        txt = fonte.render(str(valor), True, (0, 0, 0))
+        face.blit(txt, txt.get_rect(center=(tamanho // 2, tamanho // 2)))
+        if pygame.display.get_surface() is not None:
+            face = face.convert_alpha()
+        self._numeros[chave] = face
+        if len(self._numeros) > self.capacidade_numeros:
+            self._numeros.popitem(last=False)
+        return face
+
+    def desenhar(self, destino, x, y, tamanho, valor, fonte=None):
+        """Dado de lado ``tamanho`` com a face ``valor`` em (x, y); ``fonte`` escreve faces acima de 6"""
+        if valor > 6 and fonte is not None:
+            destino.blit(self._face_numero(tamanho, valor, fonte), (x, y))
+            return
+        folha, faces, _ = self._folha(tamanho)
+        area, _ = faces[valor if valor <= 6 else 0]
+        destino.blit(folha, (x, y), area)
+
+    def desenhar_rolagem(self, destino, x, y, tamanho, quadro):
+        """Quadro ``quadro`` (cíclico) da animação de rolagem, no lugar de um dado em (x, y)"""
+        folha, _, quadros = self._folha(tamanho)
+        area, (dx, dy) = quadros[quadro % len(quadros)]
+        destino.blit(folha, (x + dx, y + dy), area)
+
+    def limpar(self):
+        self._folhas.clear()
+        self._numeros.clear()
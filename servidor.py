@@ -0,0 +1,569 @@
+"""Servidor asyncio com muitas partidas simultâneas num só processo.
+
+Uso:
+    python jogo.py servidor [servir] [--porta P | --unix CAMINHO] [--tabuleiro TAB.json] [--max-ativas N]
+    python jogo.py servidor cliente [--porta P | --unix CAMINHO] [--jogadores N] [--dados KdF]
+    python jogo.py servidor carga [--porta P | --unix CAMINHO] [--conexoes C] [--salas S] [--duracao SEG]
+
+Protocolo de linhas sobre TCP local ou socket Unix (UTF-8, uma requisição e
+uma resposta por linha):
+
+    nova [JOGADORES] [KdF]       -> ok SALA
+    escolher SALA JOGADOR PODER  -> ok             (uma vez por jogador, antes do primeiro lançamento)
+    rolar SALA                   -> ok JOGADOR FACES SOMA POSICAO VENCEDOR
+    poder SALA                   -> ok 1 | ok 0    (poder do jogador da vez)
+    dados SALA KdF               -> ok             (troca os dados; as estatísticas recomeçam)
+    estado SALA                  -> ok {JSON}
+    estatisticas SALA            -> ok {JSON}
+    reiniciar SALA               -> ok
+    fechar SALA                  -> ok
+    info                         -> ok {JSON}
+
+FACES vem separado por vírgulas (ex.: 3,5) e VENCEDOR é 0 enquanto ninguém
+venceu. Falhas voltam como ``erro MENSAGEM``, sem fechar a conexão.
+
+As regras são as do ``motor.MotorJogo``. Cada sala guarda sempre o log
+binário da partida (``registro``, 2 bytes por dado); só as ``--max-ativas``
+salas usadas mais recentemente mantêm um motor em memória. As demais ficam
+só com o log e são reconstruídas com ``registro.reproduzir`` no próximo
+comando, então milhares de salas ociosas cabem em poucos megabytes.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+
+from dados import interpretar_dados
+from motor import MAX_JOGADORES, META, PODERES, MotorJogo
+from registro import GravadorPartidas, cabecalho, reproduzir
+
+PORTA = 7878
+MAX_ATIVAS = 256
+# Nenhum comando válido chega perto disso; uma linha maior derruba a conexão
+MAX_LINHA = 256
+
+_USO = {
+    "nova": "nova [JOGADORES] [KdF]",
+    "escolher": "escolher SALA JOGADOR PODER",
+    "rolar": "rolar SALA",
+    "poder": "poder SALA",
+    "dados": "dados SALA KdF",
+    "estado": "estado SALA",
+    "estatisticas": "estatisticas SALA",
+    "reiniciar": "reiniciar SALA",
+    "fechar": "fechar SALA",
+    "info": "info",
+}
+# (mínimo, máximo) de argumentos de cada comando; os opcionais estão entre colchetes
+_ARIDADE = {verbo: (sum(1 for a in uso.split()[1:] if not a.startswith("[")), len(uso.split()) - 1)
+            for verbo, uso in _USO.items()}
+
+
+class ErroProtocolo(ValueError):
+    """Comando inválido ou recusado; vira uma resposta "erro ..." """
+
+
+def _json(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def _inteiro(texto, nome):
+    try:
+        return int(texto)
+    except ValueError:
+        raise ErroProtocolo(f"{nome} deve ser um inteiro, não {texto!r}") from None
+
+
+class Sala:
+    """Uma partida: o log sempre, o motor só enquanto está entre as ativas.
+
+    ``num_jogadores`` e ``config_dados`` (os dados atuais) permitem reiniciar
+    uma sala compactada sem reproduzir o log.
+    """
+    __slots__ = ("id", "palavras", "motor", "num_jogadores", "config_dados")
+
+    def __init__(self, sala_id, motor):
+        self.id = sala_id
+        self.motor = motor
+        self.palavras = motor.gravador.palavras
+        self.num_jogadores = motor.num_jogadores
+        self.config_dados = motor.config_dados
+
+
+class ServidorPartidas:
+    """Salas e comandos, sem rede: ``executar`` recebe uma linha e devolve a resposta"""
+
+    def __init__(self, tabuleiro=None, max_ativas=MAX_ATIVAS, rng=None):
+        tabuleiro = tabuleiro or {}
+        self.meta = tabuleiro.get("meta", META)
+        self.casas_especiais = tabuleiro.get("casas_especiais")
+        self.max_ativas = max(1, max_ativas)
+        # Sementes das partidas e dos motores reconstruídos
+        self.rng = rng if rng is not None else random.Random()
+        self.salas = {}
+        # Salas com motor em memória, da usada há mais tempo para a mais recente
+        self.ativas = OrderedDict()
+        self.proximo_id = 1
+        self.lancamentos = 0
+        self.reconstrucoes = 0
+        self._comandos = {
+            "nova": self._nova, "escolher": self._escolher, "rolar": self._rolar, "poder": self._poder,
+            "dados": self._dados, "estado": self._estado, "estatisticas": self._estatisticas,
+            "reiniciar": self._reiniciar, "fechar": self._fechar, "info": self._info,
+        }
+
+    # --- salas ---
+
+    def _reconstruir(self, palavras, motor=None):
+        """Motor no estado final do log; ``motor`` (de uma sala compactada) é reaproveitado se servir"""
+        _, _, num_jogadores, config_dados, _ = cabecalho(palavras)
+        if motor is None or motor.num_jogadores != num_jogadores:
+            motor = MotorJogo(self.meta, self.casas_especiais, num_jogadores=num_jogadores,
+                              config_dados=config_dados)
+        motor.gravador = None
+        reproduzir(palavras, motor)
+        # A reprodução deixa o gerador na semente do log: sem isso, os dados se repetiriam
+        motor.rng.seed(self.rng.getrandbits(64))
+        motor.gravador = GravadorPartidas(palavras=palavras)
+        self.reconstrucoes += 1
+        return motor
+
+    def _motor_vazio(self, sala, motor=None):
+        """Motor (com os jogadores e dados da sala) ainda por reiniciar, sem reproduzir o log"""
+        if motor is None or motor.num_jogadores != sala.num_jogadores:
+            motor = MotorJogo(self.meta, self.casas_especiais, num_jogadores=sala.num_jogadores,
+                              config_dados=sala.config_dados)
+        motor.gravador = None
+        if motor.config_dados != sala.config_dados:
+            motor.trocar_dados(sala.config_dados)
+        motor.gravador = GravadorPartidas(palavras=sala.palavras)
+        return motor
+
+    def _ativar(self, sala, reconstruir=True):
+        """Motor da sala, reconstruído do log se ela estava compactada (sem ``reconstruir``, vazio)"""
+        if sala.motor is None:
+            livre = None
+            if len(self.ativas) >= self.max_ativas:
+                # Compacta a usada há mais tempo (fica só o log) e reaproveita o motor dela
+                _, antiga = self.ativas.popitem(last=False)
+                livre, antiga.motor = antiga.motor, None
+            if reconstruir and sala.palavras:
+                sala.motor = self._reconstruir(sala.palavras, livre)
+            else:
+                # Log vazio (partida ainda sem registros) ou partida prestes a ser reiniciada
+                sala.motor = self._motor_vazio(sala, livre)
+                sala.motor.reiniciar(self.rng.getrandbits(64))
+        self.ativas[sala.id] = sala
+        self.ativas.move_to_end(sala.id)
+        while len(self.ativas) > self.max_ativas:
+            _, antiga = self.ativas.popitem(last=False)
+            antiga.motor = None
+        return sala.motor
+
+    def _sala(self, texto):
+        sala = self.salas.get(_inteiro(texto, "SALA"))
+        if sala is None:
+            raise ErroProtocolo(f"sala {texto} não existe")
+        return sala
+
+    def _motor(self, texto):
+        return self._ativar(self._sala(texto))
+
+    # --- comandos ---
+
+    def _nova(self, jogadores="2", dados="2d6"):
+        num_jogadores = _inteiro(jogadores, "JOGADORES")
+        if not 2 <= num_jogadores <= MAX_JOGADORES:
+            raise ErroProtocolo(f"JOGADORES deve estar entre 2 e {MAX_JOGADORES}")
+        try:
+            config_dados = interpretar_dados(dados)
+        except ValueError as e:
+            raise ErroProtocolo(str(e)) from None
+        motor = MotorJogo(self.meta, self.casas_especiais, num_jogadores=num_jogadores, config_dados=config_dados,
+                          gravador=GravadorPartidas(), semente=self.rng.getrandbits(64))
+        sala = Sala(self.proximo_id, motor)
+        self.proximo_id += 1
+        self.salas[sala.id] = sala
+        self._ativar(sala)
+        return str(sala.id)
+
+    def _escolher(self, sala, jogador, poder):
+        motor = self._motor(sala)
+        jogador_id = _inteiro(jogador, "JOGADOR")
+        poder_index = _inteiro(poder, "PODER")
+        if jogador_id not in motor.jogadores:
+            raise ErroProtocolo(f"JOGADOR deve estar entre 1 e {motor.num_jogadores}")
+        if not 0 <= poder_index < len(PODERES):
+            raise ErroProtocolo(f"PODER deve estar entre 0 e {len(PODERES) - 1}")
+        if motor.lancamentos or motor.vencedor:
+            raise ErroProtocolo("os poderes são escolhidos antes do primeiro lançamento")
+        # Escolher de novo zeraria poder_usado: o mesmo poder poderia ser usado duas vezes
+        if motor.jogadores[jogador_id].poder is not None:
+            raise ErroProtocolo(f"o jogador {jogador_id} já escolheu seu poder")
+        if any(j.poder_usado for j in motor.jogadores.values()):
+            raise ErroProtocolo("os poderes são escolhidos antes do primeiro uso")
+        motor.selecionar_poder(jogador_id, poder_index)
+        return ""
+
+    def _rolar(self, sala):
+        motor = self._motor(sala)
+        if motor.vencedor:
+            raise ErroProtocolo("partida encerrada (use reiniciar)")
+        jogador_id = motor.turno_atual
+        faces, soma = motor.jogar_dados()
+        self.lancamentos += 1
+        return (f"{jogador_id} {','.join(map(str, faces))} {soma} {motor.jogadores[jogador_id].pos} "
+                f"{motor.vencedor or 0}")
+
+    def _poder(self, sala):
+        motor = self._motor(sala)
+        return "1" if motor.usar_poder(motor.turno_atual) else "0"
+
+    def _dados(self, sala, dados):
+        motor = self._motor(sala)
+        try:
+            config_dados = interpretar_dados(dados)
+        except ValueError as e:
+            raise ErroProtocolo(str(e)) from None
+        if config_dados != motor.config_dados:
+            motor.trocar_dados(config_dados)
+            self._sala(sala).config_dados = config_dados
+        return ""
+
+    def _estado(self, sala):
+        motor = self._motor(sala)
+        jogadores = [[j.pos, PODERES.index(j.poder) if j.poder else None, j.poder_usado]
+                     for j in motor.jogadores.values()]
+        return _json({"sala": int(sala), "meta": motor.meta, "dados": motor.config_dados.rotulo,
+                      "turno": motor.turno_atual, "vencedor": motor.vencedor or 0,
+                      "lancamentos": motor.lancamentos, "jogadores": jogadores})
+
+    def _estatisticas(self, sala):
+        motor = self._motor(sala)
+        resultado = {}
+        for jid, stats in motor.estatisticas.items():
+            teste = stats.aderencia
+            resultado[jid] = {"n": stats.n, "media": round(stats.media, 6), "variancia": round(stats.variancia, 6),
+                              "ic95": stats.intervalo_media(), "qui_quadrado": round(teste.qui_quadrado, 6),
+                              "gl": teste.graus_liberdade, "p": round(teste.p_valor, 6),
+                              "confiavel": teste.confiavel}
+        return _json(resultado)
+
+    def _reiniciar(self, sala):
+        sala = self._sala(sala)
+        # A partida atual vai ser descartada: uma sala compactada não precisa ser reproduzida
+        motor = self._ativar(sala, reconstruir=False)
+        # Só a partida atual fica no log da sala
+        del sala.palavras[:]
+        motor.reiniciar(self.rng.getrandbits(64))
+        return ""
+
+    def _fechar(self, sala):
+        sala = self._sala(sala)
+        del self.salas[sala.id]
+        self.ativas.pop(sala.id, None)
+        return ""
+
+    def _info(self):
+        return _json({"salas": len(self.salas), "ativas": len(self.ativas), "lancamentos": self.lancamentos,
+                      "reconstrucoes": self.reconstrucoes})
+
+    def executar(self, linha):
+        """Executa uma linha do protocolo; retorna a resposta, sem a quebra de linha"""
+        partes = linha.split()
+        if not partes:
+            return "erro linha vazia"
+        verbo, argumentos = partes[0], partes[1:]
+        comando = self._comandos.get(verbo)
+        if comando is None:
+            return f"erro comando desconhecido: {verbo}"
+        minimo, maximo = _ARIDADE[verbo]
+        if not minimo <= len(argumentos) <= maximo:
+            return f"erro uso: {_USO[verbo]}"
+        try:
+            resposta = comando(*argumentos)
+        except ErroProtocolo as e:
+            return f"erro {e}"
+        return f"ok {resposta}" if resposta else "ok"
+
+    # --- rede ---
+
+    async def atender(self, leitor, escritor):
+        """Uma conexão: responde cada linha, na ordem.
+
+        Lê o que já chegou de uma vez e responde todas as linhas completas
+        numa só escrita: um cliente que envia vários comandos sem esperar
+        (pipeline) paga uma chamada de sistema por bloco, não por comando.
+        """
+        resto = b""
+        try:
+            while True:
+                bloco = await leitor.read(1 << 16)
+                if not bloco:
+                    break
+                *linhas, resto = (resto + bloco).split(b"\n")
+                if len(resto) > MAX_LINHA:
+                    break
+                if linhas:
+                    escritor.write(b"".join(self.executar(linha.decode("utf-8", "replace")).encode() + b"\n"
+                                            for linha in linhas))
+                    await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+
+async def servir(servidor, porta=PORTA, unix=None):
+    if unix:
+        rede = await asyncio.start_unix_server(servidor.atender, unix)
+    else:
+        rede = await asyncio.start_server(servidor.atender, "127.0.0.1", porta)
+    endereco = unix or f"127.0.0.1:{porta}"
+    print(f"servindo em {endereco} (até {servidor.max_ativas} salas ativas)", flush=True)
+    async with rede:
+        await rede.serve_forever()
+
+
+class ClientePartidas:
+    """Cliente do protocolo: um comando por vez, esperando a resposta"""
+
+    def __init__(self, leitor, escritor):
+        self.leitor = leitor
+        self.escritor = escritor
+
+    @classmethod
+    async def conectar(cls, porta=PORTA, unix=None):
+        if unix:
+            return cls(*await asyncio.open_unix_connection(unix))
+        return cls(*await asyncio.open_connection("127.0.0.1", porta))
+
+    async def _resposta(self):
+        resposta = (await self.leitor.readline()).decode().rstrip("\n")
+        if resposta == "ok" or resposta.startswith("ok "):
+            return resposta[3:]
+        if not resposta:
+            raise ConnectionError("o servidor fechou a conexão")
+        raise ErroProtocolo(resposta[5:] if resposta.startswith("erro ") else resposta)
+
+    async def comando(self, *partes):
+        """Envia um comando; retorna o que vem depois de "ok" ou levanta ``ErroProtocolo``"""
+        self.escritor.write(" ".join(map(str, partes)).encode() + b"\n")
+        return await self._resposta()
+
+    async def lote(self, comandos, ao_responder=None):
+        """Envia vários comandos de uma vez (pipeline); retorna as respostas na ordem.
+
+        Cada resposta é o texto depois de "ok" ou uma ``ErroProtocolo``.
+        ``ao_responder(i)`` é chamado assim que a i-ésima resposta chega.
+        """
+        self.escritor.write(b"".join(" ".join(map(str, partes)).encode() + b"\n" for partes in comandos))
+        respostas = []
+        for i in range(len(comandos)):
+            try:
+                respostas.append(await self._resposta())
+            except ErroProtocolo as e:
+                respostas.append(e)
+            if ao_responder is not None:
+                ao_responder(i)
+        return respostas
+
+    async def nova(self, jogadores=2, dados="2d6"):
+        return int(await self.comando("nova", jogadores, dados))
+
+    async def rolar(self, sala):
+        """(jogador, faces, soma, posição, vencedor ou 0)"""
+        jogador, faces, soma, pos, vencedor = (await self.comando("rolar", sala)).split()
+        return int(jogador), tuple(map(int, faces.split(","))), int(soma), int(pos), int(vencedor)
+
+    async def usar_poder(self, sala):
+        return await self.comando("poder", sala) == "1"
+
+    async def estado(self, sala):
+        return json.loads(await self.comando("estado", sala))
+
+    async def estatisticas(self, sala):
+        return json.loads(await self.comando("estatisticas", sala))
+
+    async def fechar(self):
+        self.escritor.close()
+        await self.escritor.wait_closed()
+
+
+async def jogar_partida(cliente, jogadores=2, dados="2d6", rng=None, mostrar=print):
+    """Partida completa pelo protocolo, com poderes sorteados e usados ao acaso (cliente de exemplo)"""
+    rng = rng or random.Random()
+    sala = await cliente.nova(jogadores, dados)
+    for jid in range(1, jogadores + 1):
+        poder = rng.randrange(len(PODERES))
+        await cliente.comando("escolher", sala, jid, poder)
+        mostrar(f"Jogador {jid} escolheu {PODERES[poder]['nome']}")
+    vencedor = 0
+    while not vencedor:
+        if rng.random() < 0.25 and await cliente.usar_poder(sala):
+            estado = await cliente.estado(sala)
+            mostrar(f"Jogador {estado['turno']} usou o poder")
+        jogador, faces, soma, pos, vencedor = await cliente.rolar(sala)
+        mostrar(f"Jogador {jogador}: {'+'.join(map(str, faces))} = {soma} -> casa {pos + 1}")
+    mostrar(f"Jogador {vencedor} venceu!")
+    for jid, stats in (await cliente.estatisticas(sala)).items():
+        mostrar(f"Jogador {jid}: {stats['n']} lançamentos, média {stats['media']:.2f}, p (χ²) = {stats['p']:.3f}")
+    await cliente.comando("fechar", sala)
+    return vencedor
+
+
+def _percentil(ordenados, q):
+    return ordenados[min(len(ordenados) - 1, int(q * len(ordenados)))]
+
+
+async def gerar_carga(porta=PORTA, unix=None, conexoes=50, salas=4, duracao=5.0, jogadores=2, pipeline=True):
+    """Cada conexão rola dados em ``salas`` partidas próprias, em rodízio, por ``duracao`` segundos.
+
+    Com ``pipeline``, cada rodada manda um "rolar" por sala de uma vez; a
+    latência de um lançamento vai do envio da rodada até a sua resposta.
+    Retorna (lançamentos, segundos, latências ordenadas em s, info do servidor).
+    """
+    latencias = []
+
+    async def trabalhar():
+        cliente = await ClientePartidas.conectar(porta, unix)
+        minhas = [await cliente.nova(jogadores) for _ in range(salas)]
+        fim = time.perf_counter() + duracao
+        proprias = []
+        encerradas = set()
+        while time.perf_counter() < fim:
+            if not pipeline:
+                for sala in minhas:
+                    inicio = time.perf_counter()
+                    if (await cliente.rolar(sala))[-1]:
+                        await cliente.comando("reiniciar", sala)
+                    proprias.append(time.perf_counter() - inicio)
+                continue
+            comandos = []
+            for sala in minhas:
+                if sala in encerradas:
+                    comandos.append(("reiniciar", sala))
+                comandos.append(("rolar", sala))
+            encerradas.clear()
+            inicio = time.perf_counter()
+            respostas = await cliente.lote(comandos, lambda i: proprias.append(time.perf_counter() - inicio)
+                                           if comandos[i][0] == "rolar" else None)
+            for (verbo, sala), resposta in zip(comandos, respostas):
+                if isinstance(resposta, ErroProtocolo):
+                    raise resposta
+                if verbo == "rolar" and not resposta.endswith(" 0"):
+                    encerradas.add(sala)
+        for sala in minhas:
+            await cliente.comando("fechar", sala)
+        await cliente.fechar()
+        latencias.extend(proprias)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabalhar() for _ in range(conexoes)))
+    segundos = time.perf_counter() - inicio
+    cliente = await ClientePartidas.conectar(porta, unix)
+    info = json.loads(await cliente.comando("info"))
+    await cliente.fechar()
+    latencias.sort()
+    return len(latencias), segundos, latencias, info
+
+
+async def _esperar_servidor(porta, unix, limite=10.0):
+    prazo = time.perf_counter() + limite
+    while True:
+        try:
+            cliente = await ClientePartidas.conectar(porta, unix)
+        except OSError:
+            if time.perf_counter() > prazo:
+                raise
+            await asyncio.sleep(0.05)
+            continue
+        await cliente.fechar()
+        return
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="jogo.py servidor", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modo", nargs="?", choices=["servir", "cliente", "carga"], default="servir")
+    parser.add_argument("--porta", type=int, default=PORTA, help=f"porta TCP em 127.0.0.1 (padrão {PORTA})")
+    parser.add_argument("--unix", default=None, help="caminho de um socket Unix (no lugar da porta TCP)")
+    parser.add_argument("--tabuleiro", default=None, help="servir: arquivo JSON do tabuleiro de todas as salas")
+    parser.add_argument("--max-ativas", type=int, default=MAX_ATIVAS,
+                        help=f"servir: salas mantidas com motor em memória (padrão {MAX_ATIVAS})")
+    parser.add_argument("--jogadores", type=int, default=2, help="cliente/carga: jogadores por partida")
+    parser.add_argument("--dados", default="2d6", help="cliente: dados no formato KdF")
+    parser.add_argument("--semente", type=int, default=None, help="cliente: semente das escolhas do cliente")
+    parser.add_argument("--conexoes", type=int, default=50, help="carga: conexões simultâneas")
+    parser.add_argument("--salas", type=int, default=4, help="carga: partidas por conexão")
+    parser.add_argument("--duracao", type=float, default=5.0, help="carga: segundos de medição")
+    parser.add_argument("--sem-pipeline", action="store_true",
+                        help="carga: espera cada resposta antes do próximo comando")
+    parser.add_argument("--iniciar-servidor", action="store_true",
+                        help="carga: sobe um servidor num processo separado enquanto mede")
+    args = parser.parse_args(argv)
+
+    if args.modo == "servir":
+        tabuleiro = None
+        if args.tabuleiro:
+            from tabuleiro import ErroTabuleiro, carregar_tabuleiro
+            try:
+                tabuleiro = carregar_tabuleiro(args.tabuleiro)
+            except (OSError, ErroTabuleiro) as e:
+                parser.error(str(e))
+        try:
+            asyncio.run(servir(ServidorPartidas(tabuleiro, args.max_ativas), args.porta, args.unix))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.modo == "cliente":
+        async def jogar():
+            cliente = await ClientePartidas.conectar(args.porta, args.unix)
+            try:
+                await jogar_partida(cliente, args.jogadores, args.dados, random.Random(args.semente))
+            finally:
+                await cliente.fechar()
+        try:
+            asyncio.run(jogar())
+        except ErroProtocolo as e:
+            sys.exit(f"erro do servidor: {e}")
+        return
+
+    async def medir(unix):
+        await _esperar_servidor(args.porta, unix)
+        return await gerar_carga(args.porta, unix, args.conexoes, args.salas, args.duracao, args.jogadores,
+                                 not args.sem_pipeline)
+
+    if not args.iniciar_servidor:
+        lancamentos, segundos, latencias, info = asyncio.run(medir(args.unix))
+    else:
+        with tempfile.TemporaryDirectory(prefix="corrida-") as diretorio:
+            unix = args.unix or os.path.join(diretorio, "servidor.sock")
+            comando = [sys.executable, os.path.abspath(__file__), "servir", "--unix", unix,
+                       "--max-ativas", str(args.max_ativas)]
+            if args.tabuleiro:
+                comando += ["--tabuleiro", args.tabuleiro]
+            processo = subprocess.Popen(comando, stdout=subprocess.DEVNULL)
+            try:
+                lancamentos, segundos, latencias, info = asyncio.run(medir(unix))
+            finally:
+                processo.terminate()
+                processo.wait()
+    if not latencias:
+        sys.exit("nenhum lançamento medido")
+    print(f"{lancamentos} lançamentos em {segundos:.2f} s: {lancamentos / segundos:,.0f} lançamentos/s "
+          f"({args.conexoes} conexões x {args.salas} salas)".replace(",", "."))
+    print(f"latência: mediana {_percentil(latencias, 0.5) * 1000:.2f} ms, "
+          f"p99 {_percentil(latencias, 0.99) * 1000:.2f} ms, máx {latencias[-1] * 1000:.2f} ms")
+    print(f"servidor: {info['lancamentos']} lançamentos no total, {info['reconstrucoes']} salas reconstruídas do log")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Simulador Monte Carlo vetorizado: muitas partidas avançando juntas com NumPy.
+
+Cada passo do laço joga um turno de todas as partidas ainda ativas: decide o
+uso dos poderes (mesma heurística de ``motor.estrategia_padrao``), sorteia as
+somas de todas as partidas numa única chamada (``ConfigDados.sortear_somas``) e resolve as casas especiais por uma tabela de
+saltos pré-calculada.
+"""
+import numpy as np
+
+from dados import DADOS_PADRAO
+from motor import META, CASAS_ESPECIAIS, PODERES, tabela_saltos
+
+DOBRAR, RETROCEDER, TROCAR, JOGAR_NOVAMENTE = range(len(PODERES))
+SEM_PODER = -1
+
+
+class ResultadoSimulacao:
+    """Resumo agregado de um lote de partidas simuladas"""
+
+    def __init__(self, vitorias, duracoes):
+        self.vitorias = vitorias
+        # duracoes[k] = número de partidas que terminaram com k lançamentos
+        self.duracoes = duracoes
+        self.n = int(vitorias.sum())
+
+    @property
+    def taxa_vitoria(self):
+        return self.vitorias / self.n
+
+    @property
+    def vantagem_primeiro(self):
+        """Diferença entre a taxa de vitória do Jogador 1 e 50%"""
+        return self.taxa_vitoria[0] - 0.5
+
+    @property
+    def duracao_media(self):
+        return float(np.dot(np.arange(len(self.duracoes)), self.duracoes) / self.n)
+
+    def quantil_duracao(self, q):
+        acumulado = np.cumsum(self.duracoes) / self.n
+        return int(np.searchsorted(acumulado, q))
+
+    def resumo(self):
+        p1, p2 = self.taxa_vitoria
+        return (f"{self.n} partidas | J1 {p1:.4f} | J2 {p2:.4f} | "
+                f"vantagem do 1º {self.vantagem_primeiro:+.4f} | "
+                f"lançamentos: média {self.duracao_media:.2f}, "
+                f"mediana {self.quantil_duracao(0.5)}, p99 {self.quantil_duracao(0.99)}")
+
+
+def _indice_poder(poder):
+    return SEM_PODER if poder is None else poder
+
+
+def _somar_contagens(a, b):
+    """Soma dois histogramas de tamanhos possivelmente diferentes"""
+    if len(a) < len(b):
+        a, b = b, a
+    a = a.copy()
+    a[:len(b)] += b
+    return a
+
+
+def _simular_bloco(n, poderes, saltos, meta, rng, config_dados):
+    """Simula n partidas; retorna (vitórias por jogador, histograma de durações)"""
+    vitorias = np.zeros(2, dtype=np.int64)
+    duracoes = np.zeros(1, dtype=np.int64)
+
+    poder = np.array([_indice_poder(p) for p in poderes], dtype=np.int8)
+
+    # Estado apenas das partidas ativas, no referencial de quem joga agora
+    # (a = jogador da vez, b = oponente); as partidas que terminam são removidas
+    vez = np.zeros(n, dtype=np.int8)
+    pos_a = np.zeros(n, dtype=np.int16)
+    pos_b = np.zeros(n, dtype=np.int16)
+    livre_a = np.full(n, poder[0] >= 0)
+    livre_b = np.full(n, poder[1] >= 0)
+    dobrar = np.zeros(n, dtype=bool)
+    lancamentos = np.zeros(n, dtype=np.int32)
+
+    while n:
+        # Decisão de poder (mesma heurística do motor)
+        meu_poder = poder[vez]
+        usa = livre_a & (
+            (meu_poder == DOBRAR) | (meu_poder == JOGAR_NOVAMENTE)
+            | ((meu_poder == RETROCEDER) & (pos_b >= 3))
+            | ((meu_poder == TROCAR) & (pos_b > pos_a))
+        )
+        extra = np.zeros(n, dtype=bool)
+        if usa.any():
+            livre_a &= ~usa
+            dobrar |= usa & (meu_poder == DOBRAR)
+            extra = usa & (meu_poder == JOGAR_NOVAMENTE)
+            retro = usa & (meu_poder == RETROCEDER)
+            pos_b = np.where(retro, np.maximum(pos_b - 3, 0), pos_b)
+            troca = usa & (meu_poder == TROCAR)
+            pos_a, pos_b = np.where(troca, pos_b, pos_a), np.where(troca, pos_a, pos_b)
+
+        # Todas as somas do turno numa única chamada
+        soma = config_dados.sortear_somas(rng, n)
+        soma <<= dobrar
+        dobrar[:] = False
+        lancamentos += 1
+
+        pos_a = saltos[pos_a + soma]
+        venceu = pos_a >= meta - 1
+
+        if venceu.any():
+            vitorias += np.bincount(vez[venceu], minlength=2)
+            duracoes = _somar_contagens(duracoes, np.bincount(lancamentos[venceu]))
+            fica = ~venceu
+            vez, pos_a, pos_b, livre_a, livre_b = vez[fica], pos_a[fica], pos_b[fica], livre_a[fica], livre_b[fica]
+            dobrar, extra, lancamentos = dobrar[fica], extra[fica], lancamentos[fica]
+            n = len(vez)
+
+        # Passa a vez, exceto para quem usou "Jogar Novamente"
+        if extra.any():
+            passa = ~extra
+            vez = np.where(passa, 1 - vez, vez).astype(np.int8)
+            pos_a, pos_b = np.where(passa, pos_b, pos_a), np.where(passa, pos_a, pos_b)
+            livre_a, livre_b = np.where(passa, livre_b, livre_a), np.where(passa, livre_a, livre_b)
+        else:
+            vez = 1 - vez
+            pos_a, pos_b = pos_b, pos_a
+            livre_a, livre_b = livre_b, livre_a
+
+    return vitorias, duracoes
+
+
+def simular_lote(n, poderes=(None, None), rng=None, meta=META, casas_especiais=None, tamanho_bloco=1_000_000,
+                 config_dados=DADOS_PADRAO):
+    """Simula n partidas independentes em lockstep.
+
+    ``poderes`` traz o índice em ``PODERES`` escolhido por cada jogador (ou None).
+    ``rng`` pode ser uma semente ou um ``np.random.Generator``.
+    """
+    rng = np.random.default_rng(rng)
+    casas = CASAS_ESPECIAIS if casas_especiais is None else casas_especiais
+    saltos = np.array(tabela_saltos(meta, casas, config_dados.soma_maxima_dobrada), dtype=np.int16)
+
+    vitorias = np.zeros(2, dtype=np.int64)
+    duracoes = np.zeros(1, dtype=np.int64)
+    restantes = n
+    while restantes > 0:
+        bloco = min(restantes, tamanho_bloco)
+        v, d = _simular_bloco(bloco, poderes, saltos, meta, rng, config_dados)
+        vitorias += v
+        duracoes = _somar_contagens(duracoes, d)
+        restantes -= bloco
+    return ResultadoSimulacao(vitorias, duracoes)
@@ -0,0 +1,86 @@
+"""Tabuleiros configuráveis, carregados de arquivos JSON.
+
+Formato (todas as chaves são opcionais)::
+
+    {
+      "meta": 500,
+      "colunas": 10,
+      "casas_especiais": {"3": ["SORTE", 2, "Atalho! +2"], "7": ["AZAR", 3, "Buraco! -3"]},
+      "gerar": {"densidade": 0.3, "semente": 7}
+    }
+
+As casas (base 0) listadas em ``casas_especiais`` valem como escritas; com
+``gerar``, as demais casas recebem sorte/azar aleatórios na densidade pedida.
+Sem ``meta``, vale o tabuleiro clássico de 30 casas.
+"""
+import json
+import random
+
+from motor import CASAS_ESPECIAIS, META
+
+# O log binário guarda a casa especial atingida em 12 bits (ver registro.py)
+MAX_META = 4096
+COLUNAS_PADRAO = 6
+TIPOS = ("SORTE", "AZAR")
+_ROTULOS = {"SORTE": ("Atalho", "Vento", "Passo", "Escada", "Jato"),
+            "AZAR": ("Queda", "Buraco", "Ops", "Volta", "Crise", "Recuo")}
+
+
+class ErroTabuleiro(ValueError):
+    """Configuração de tabuleiro inválida"""
+
+
+def gerar_casas_especiais(meta, densidade=0.3, semente=None, valor_max=4):
+    """Sorte/azar aleatórios em cerca de ``densidade`` das casas (fora a primeira e a meta)"""
+    rng = random.Random(semente)
+    casas = {}
+    for casa in range(1, meta - 1):
+        if rng.random() >= densidade:
+            continue
+        tipo = rng.choice(TIPOS)
+        valor = rng.randint(1, valor_max)
+        sinal = "+" if tipo == "SORTE" else "-"
+        casas[casa] = (tipo, valor, f"{rng.choice(_ROTULOS[tipo])}! {sinal}{valor}")
+    return casas
+
+
+def validar(meta, casas_especiais, colunas):
+    if not 2 <= meta <= MAX_META:
+        raise ErroTabuleiro(f"meta deve estar entre 2 e {MAX_META}, não {meta}")
+    if colunas < 1:
+        raise ErroTabuleiro("colunas deve ser positivo")
+    for casa, especial in casas_especiais.items():
+        # A partida começa na casa 0 e termina ao alcançar meta - 1: nenhuma das duas pode ser especial
+        if not 0 < casa < meta - 1:
+            raise ErroTabuleiro(f"casa especial {casa} fora do tabuleiro (deve estar entre 1 e {meta - 2})")
+        if len(especial) != 3 or especial[0] not in TIPOS or especial[1] < 0:
+            raise ErroTabuleiro(f"casa especial {casa} inválida: {especial!r}")
+
+
+def tabuleiro_padrao():
+    return {"meta": META, "colunas": COLUNAS_PADRAO, "casas_especiais": dict(CASAS_ESPECIAIS)}
+
+
+def carregar_tabuleiro(caminho):
+    """Lê um arquivo JSON de tabuleiro; retorna {'meta', 'colunas', 'casas_especiais'}"""
+    with open(caminho, encoding="utf-8") as f:
+        try:
+            config = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ErroTabuleiro(f"{caminho}: JSON inválido ({e})") from None
+
+    meta = int(config.get("meta", META))
+    colunas = int(config.get("colunas", COLUNAS_PADRAO))
+    casas = {}
+    if "gerar" in config:
+        gerar = config["gerar"]
+        casas = gerar_casas_especiais(meta, float(gerar.get("densidade", 0.3)), gerar.get("semente"))
+    elif "meta" not in config:
+        casas = dict(CASAS_ESPECIAIS)
+    try:
+        for casa, (tipo, valor, texto) in config.get("casas_especiais", {}).items():
+            casas[int(casa)] = (tipo, int(valor), str(texto))
+    except (TypeError, ValueError):
+        raise ErroTabuleiro(f"{caminho}: casas_especiais deve mapear casa -> [tipo, valor, texto]") from None
+    validar(meta, casas, colunas)
+    return {"meta": meta, "colunas": colunas, "casas_especiais": casas}
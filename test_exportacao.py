@@ -0,0 +1,121 @@
+"""Ida e volta da exportação colunar: exportar partidas e relê-las com carregar_sessoes"""
+import random
+
+import numpy as np
+
+from dados import ConfigDados
+from exportacao import SEM_PARTIDA, ExportadorColunar, carregar_sessoes, concatenar, resumo
+from motor import MotorJogo
+
+VICIADO = ConfigDados(2, 6, (1, 1, 1, 1, 1, 3))
+
+
+class _Espiao:
+    """Repassa os eventos ao exportador e guarda uma cópia deles para comparar"""
+
+    def __init__(self, exportador):
+        self.exportador = exportador
+        self.lances = []
+        self.poderes = []
+        self.partidas = []
+
+    def iniciar_partida(self, semente, meta, num_jogadores):
+        self.exportador.iniciar_partida(semente, meta, num_jogadores)
+        self._aberta = (semente, meta, num_jogadores)
+
+    def fim(self, vencedor):
+        self.exportador.fim(vencedor)
+        self.partidas.append(self._aberta + (vencedor,))
+
+    def uso_poder(self, jogador_id, poder_index):
+        self.exportador.uso_poder(jogador_id, poder_index)
+        self.poderes.append((jogador_id, poder_index))
+
+    def lance(self, jogador_id, config_dados, faces, soma, dobrado, pos_antes, pos_depois, casa):
+        self.exportador.lance(jogador_id, config_dados, faces, soma, dobrado, pos_antes, pos_depois, casa)
+        self.lances.append((jogador_id, config_dados, tuple(faces), soma, dobrado, pos_antes, pos_depois,
+                            -1 if casa is None else casa))
+
+    def lote(self, jogadores, config_dados, faces, somas, posicoes):
+        self.exportador.lote(jogadores, config_dados, faces, somas, posicoes)
+        for jogador, f, soma, pos in zip(jogadores.tolist(), faces.tolist(), somas.tolist(), posicoes.tolist()):
+            self.lances.append((jogador, config_dados, tuple(f), soma, False, pos, pos, -1))
+
+
+def _jogar(motor, semente, trocas=()):
+    motor.reiniciar(semente)
+    motor.selecionar_poder(1, 0)
+    motor.selecionar_poder(2, 3)
+    while not motor.vencedor:
+        for lance, config in trocas:
+            if motor.lancamentos == lance:
+                motor.trocar_dados(config)
+        motor.jogar_turno()
+
+
+def _lances_exportados(sessao):
+    configs = sessao.configs()
+    lances = sessao["lances"]
+    faces = sessao["faces"]["face"]
+    inicio = sessao.inicio_faces()
+    linhas = []
+    for i in range(len(lances["soma"])):
+        linhas.append((int(lances["jogador"][i]), configs[lances["dados"][i]],
+                       tuple(faces[inicio[i]:inicio[i + 1]].tolist()), int(lances["soma"][i]),
+                       bool(lances["dobrado"][i]), int(lances["pos_antes"][i]), int(lances["pos_depois"][i]),
+                       int(lances["casa"][i])))
+    return linhas
+
+
+def test_sessao_relida_tem_os_mesmos_eventos(tmp_path):
+    espiao = _Espiao(ExportadorColunar(str(tmp_path / "s"), linhas_por_bloco=100))
+    motor = MotorJogo(exportador=espiao, rng=random.Random(1))
+    for semente in range(1, 21):
+        _jogar(motor, semente, [(3, VICIADO), (9, ConfigDados(3, 4))] if semente % 3 == 0 else ())
+    motor.lancar_lote(40)
+    espiao.exportador.fechar()
+
+    (sessao,) = carregar_sessoes(str(tmp_path))
+    assert _lances_exportados(sessao) == espiao.lances
+    assert VICIADO in sessao.configs()
+    poderes = sessao["poderes"]
+    assert list(zip(poderes["jogador"].tolist(), poderes["poder"].tolist())) == espiao.poderes
+    partidas = sessao["partidas"]
+    colunas = ("semente", "meta", "jogadores", "vencedor")
+    assert list(zip(*(partidas[c].tolist() for c in colunas))) == espiao.partidas
+    # Os avulsos do modo turbo ficam no fim, sem partida
+    avulso = sessao["lances"]["avulso"]
+    assert avulso.sum() == 40 and avulso[-40:].all()
+    assert (sessao["lances"]["partida"][avulso] == SEM_PARTIDA).all()
+    assert set(sessao["lances"]["partida"][~avulso].tolist()) == set(range(20))
+
+
+def test_sessao_continuada_reaproveita_a_tabela_de_dados(tmp_path):
+    diretorio = str(tmp_path / "s")
+    for semente in (1, 2):
+        exportador = ExportadorColunar(diretorio)
+        _jogar(MotorJogo(exportador=exportador, config_dados=VICIADO), semente, [(2, ConfigDados(2, 6))])
+        exportador.fechar()
+
+    (sessao,) = carregar_sessoes(diretorio)
+    assert sessao.configs() == [VICIADO, ConfigDados(2, 6)]
+    assert len(sessao["pesos"]["peso"]) == 6
+    assert len(sessao["partidas"]["vencedor"]) == 2
+    assert sessao.inicio_faces()[-1] == len(sessao["faces"]["face"])
+
+
+def test_resumo_separa_dados_viciados(tmp_path):
+    for nome, config in (("a", ConfigDados(2, 6)), ("b", VICIADO), ("c", ConfigDados(2, 6, (3, 1, 1, 1, 1, 1)))):
+        exportador = ExportadorColunar(str(tmp_path / nome))
+        motor = MotorJogo(exportador=exportador, config_dados=config, rng=random.Random(2))
+        for semente in range(50):
+            _jogar(motor, semente)
+        exportador.fechar()
+
+    sessoes = carregar_sessoes(str(tmp_path))
+    texto = resumo(sessoes)
+    assert "2d6 viciado (pesos 1 1 1 1 1 3)" in texto
+    assert "2d6 viciado (pesos 3 1 1 1 1 1)" in texto
+    # A soma média dos dados viciados bate com a teórica deles, não com a dos honestos
+    somas = concatenar(sessoes[1:2], "lances", "soma")[~concatenar(sessoes[1:2], "lances", "dobrado")]
+    assert abs(np.mean(somas) - VICIADO.media) < 0.3
@@ -0,0 +1,91 @@
+"""Ida e volta do log binário: gravar partidas, dividir o log e reproduzir cada uma"""
+import pytest
+
+from dados import ConfigDados
+from motor import MotorJogo
+from registro import GravadorPartidas, carregar, dividir_partidas, reproduzir
+
+
+def _estado(motor):
+    jogadores = [(j.pos, j.poder and j.poder["nome"], j.poder_usado) for j in motor.jogadores.values()]
+    estatisticas = {pid: (s.n, s.total) for pid, s in motor.estatisticas.items()}
+    return motor.vencedor, motor.lancamentos, motor.config_dados, jogadores, estatisticas
+
+
+def _jogar(motor, semente, poderes=(), troca=None, turbo=False):
+    """Joga uma partida até o fim; ``troca`` = (lance, ConfigDados) troca os dados no meio dela"""
+    motor.reiniciar(semente)
+    for jogador_id, poder in enumerate(poderes, 1):
+        motor.selecionar_poder(jogador_id, poder)
+    while not motor.vencedor:
+        if troca is not None and motor.lancamentos == troca[0]:
+            motor.trocar_dados(troca[1])
+        if turbo and motor.lancamentos == 3:
+            # Lançamentos avulsos não entram no log nem movem os peões
+            motor.lancar_lote(50)
+        motor.jogar_turno()
+    return _estado(motor)
+
+
+def _ida_e_volta(gravador, num_jogadores, esperados):
+    limites = dividir_partidas(gravador.palavras)
+    assert len(limites) == len(esperados)
+    motor = MotorJogo(num_jogadores=num_jogadores)
+    for (inicio, fim), esperado in zip(limites, esperados):
+        reproduzir(gravador.palavras, motor, inicio, fim)
+        assert _estado(motor) == esperado
+
+
+@pytest.mark.parametrize("num_jogadores", [2, 3, 8, 64])
+def test_partidas_reproduzidas_chegam_ao_mesmo_estado(num_jogadores):
+    gravador = GravadorPartidas()
+    motor = MotorJogo(num_jogadores=num_jogadores, gravador=gravador)
+    poderes = [i % 4 for i in range(num_jogadores)]
+    esperados = [_jogar(motor, semente, poderes if semente % 2 else ()) for semente in range(1, 9)]
+    _ida_e_volta(gravador, num_jogadores, esperados)
+
+
+def test_troca_de_dados_no_meio_da_partida():
+    gravador = GravadorPartidas()
+    motor = MotorJogo(gravador=gravador)
+    esperados = [
+        _jogar(motor, 11, (0, 1), troca=(4, ConfigDados(3, 4))),
+        _jogar(motor, 12, (2, 3), troca=(1, ConfigDados(1, 20))),
+        # Troca antes do primeiro lance: vai para o cabeçalho da partida
+        _jogar(motor, 13, troca=(0, ConfigDados(2, 6))),
+    ]
+    assert esperados[0][2] == ConfigDados(3, 4)
+    _ida_e_volta(gravador, 2, esperados)
+
+
+def test_lancamentos_avulsos_nao_atrapalham_a_reproducao():
+    gravador = GravadorPartidas()
+    motor = MotorJogo(num_jogadores=3, gravador=gravador)
+    esperado = _jogar(motor, 21, (0, 1, 3), turbo=True)
+    limites = dividir_partidas(gravador.palavras)
+    assert len(limites) == 1
+    reproduzida = reproduzir(gravador.palavras, MotorJogo(num_jogadores=3), *limites[0])
+    # As estatísticas do motor original incluem os 50 avulsos, que o log não guarda
+    assert _estado(reproduzida)[:4] == esperado[:4]
+
+
+def test_partida_reiniciada_sem_registros_nao_entra_no_log():
+    gravador = GravadorPartidas()
+    motor = MotorJogo(gravador=gravador)
+    motor.reiniciar(5)
+    motor.reiniciar(6)
+    assert len(gravador.palavras) == 0
+    esperado = _jogar(motor, 7, (1, 2))
+    _ida_e_volta(gravador, 2, [esperado])
+
+
+def test_log_em_arquivo(tmp_path):
+    caminho = tmp_path / "partidas.log"
+    gravador = GravadorPartidas(str(caminho), limite_buffer=64)
+    motor = MotorJogo(num_jogadores=4, gravador=gravador)
+    esperados = [_jogar(motor, semente, (0, 1, 2, 3)) for semente in range(30)]
+    gravador.descarregar()
+    assert len(gravador.palavras) == 0
+
+    gravador.palavras = carregar(str(caminho))
+    _ida_e_volta(gravador, 4, esperados)
@@ -0,0 +1,104 @@
+"""Torneio entre todos os pares de poderes, em paralelo.
+
+Uso:
+    python jogo.py torneio [--partidas N] [--processos P] [--semente S]
+
+Cada confronto (poder do Jogador 1 x poder do Jogador 2, nas duas ordens de
+assento) é dividido em blocos simulados por ``simulacao.simular_lote`` num
+pool de processos. Cada bloco recebe um fluxo aleatório próprio derivado de
+``SeedSequence(semente)``, então o resultado não depende do número de
+processos.
+"""
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from estatisticas import Z_95
+from motor import PODERES
+from simulacao import simular_lote
+
+
+def intervalo_wilson(vitorias, n, z=Z_95):
+    """Intervalo de confiança de Wilson para uma proporção"""
+    if n == 0:
+        return 0.0, 1.0
+    p = vitorias / n
+    denom = 1 + z * z / n
+    centro = (p + z * z / (2 * n)) / denom
+    meia = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return centro - meia, centro + meia
+
+
+def _rodar_bloco(tarefa):
+    p1, p2, n, semente = tarefa
+    resultado = simular_lote(n, (p1, p2), rng=np.random.default_rng(semente))
+    return p1, p2, int(resultado.vitorias[0]), n
+
+
+def rodar_torneio(partidas, processos=None, semente=0, tamanho_bloco=250_000):
+    """Retorna vitorias[p1, p2] (vitórias do Jogador 1) e jogos[p1, p2] para cada confronto"""
+    k = len(PODERES)
+    tarefas = []
+    for p1 in range(k):
+        for p2 in range(k):
+            restantes = partidas
+            while restantes > 0:
+                bloco = min(restantes, tamanho_bloco)
+                tarefas.append((p1, p2, bloco))
+                restantes -= bloco
+
+    sementes = np.random.SeedSequence(semente).spawn(len(tarefas))
+    tarefas = [t + (s,) for t, s in zip(tarefas, sementes)]
+
+    vitorias = np.zeros((k, k), dtype=np.int64)
+    jogos = np.zeros((k, k), dtype=np.int64)
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        for p1, p2, v, n in pool.map(_rodar_bloco, tarefas, chunksize=1):
+            vitorias[p1, p2] += v
+            jogos[p1, p2] += n
+    return vitorias, jogos
+
+
+def relatorio(vitorias, jogos):
+    nomes = [p["nome"] for p in PODERES]
+    linhas = ["Taxa de vitória do Jogador 1 (IC 95% de Wilson)", ""]
+    for p1, nome1 in enumerate(nomes):
+        for p2, nome2 in enumerate(nomes):
+            v, n = vitorias[p1, p2], jogos[p1, p2]
+            lo, hi = intervalo_wilson(v, n)
+            linhas.append(f"  J1 {nome1:<20} x J2 {nome2:<20} {v / n:.4f}  [{lo:.4f}, {hi:.4f}]")
+
+    # Combinando as duas ordens de assento: vitórias do poder a contra o poder b
+    linhas += ["", "Poder x poder, somando os dois assentos"]
+    for a, nome_a in enumerate(nomes):
+        for b, nome_b in enumerate(nomes):
+            if a == b:
+                continue
+            v = vitorias[a, b] + (jogos[b, a] - vitorias[b, a])
+            n = jogos[a, b] + jogos[b, a]
+            lo, hi = intervalo_wilson(v, n)
+            linhas.append(f"  {nome_a:<20} vence {nome_b:<20} {v / n:.4f}  [{lo:.4f}, {hi:.4f}]")
+    return "\n".join(linhas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="jogo.py torneio", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--partidas", type=int, default=1_000_000, help="partidas por confronto")
+    parser.add_argument("--processos", type=int, default=os.cpu_count())
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    vitorias, jogos = rodar_torneio(args.partidas, args.processos, args.semente)
+    duracao = time.perf_counter() - inicio
+    print(relatorio(vitorias, jogos))
+    print(f"\n{int(jogos.sum())} partidas em {duracao:.1f} s com {args.processos} processos")
+
+
+if __name__ == "__main__":
+    main()